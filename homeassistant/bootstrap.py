@@ -4,6 +4,7 @@ import logging
 import logging.handlers
 import os
 import sys
+import threading
 from collections import defaultdict
 
 from types import ModuleType
@@ -24,22 +25,80 @@ from homeassistant.util.yaml import clear_secret_cache
 from homeassistant.const import EVENT_COMPONENT_LOADED, PLATFORM_FORMAT
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import (
-    event_decorators, service, config_per_platform, extract_domain_configs)
+    event_decorators, service, config_per_platform, extract_domain_configs,
+    restore_state, startup_trace)
 
 _LOGGER = logging.getLogger(__name__)
 
 ATTR_COMPONENT = 'component'
 
 ERROR_LOG_FILENAME = 'home-assistant.log'
+REQUIREMENTS_MANIFEST = '.requirements_manifest.json'
+DATA_REQUIREMENTS_MANIFEST = 'requirements_manifest'
 _PERSISTENT_ERRORS = {}
 HA_COMPONENT_URL = '[{}](https://home-assistant.io/components/{}/)'
 
+# The setup task an executor thread runs a setup job for
+_SETUP_CALLER = threading.local()
+
 
 def setup_component(hass: core.HomeAssistant, domain: str,
                     config: Optional[Dict]=None) -> bool:
     """Setup a component and all its dependencies."""
+    return _run_setup_threadsafe(
+        hass, async_setup_component(hass, domain, config))
+
+
+def _run_setup_threadsafe(hass: core.HomeAssistant, coro):
+    """Run a setup coroutine from a thread and return its result.
+
+    If the thread runs a setup job, the task of the job is blocked until
+    the coroutine is done. This is recorded so that waiting for setups can
+    be checked for cycles.
+    """
+    caller = getattr(_SETUP_CALLER, 'task', None)
     return run_coroutine_threadsafe(
-        async_setup_component(hass, domain, config), loop=hass.loop).result()
+        _async_setup_for_caller(hass, caller, coro), loop=hass.loop).result()
+
+
+@asyncio.coroutine
+def _async_setup_for_caller(hass: core.HomeAssistant, caller, coro):
+    """Run a setup coroutine while caller is blocked on it.
+
+    This method is a coroutine.
+    """
+    if caller is None:
+        return (yield from coro)
+
+    waiting = _async_setup_waiting(hass)
+    waiting[caller] = asyncio.Task.current_task(loop=hass.loop)
+    try:
+        return (yield from coro)
+    finally:
+        waiting.pop(caller, None)
+
+
+@asyncio.coroutine
+def async_run_setup_job(hass: core.HomeAssistant, func, *args):
+    """Run a synchronous setup function in an executor.
+
+    Components set up from within func wait for setups in progress instead
+    of reporting a recursion, unless they are waited for by this task.
+
+    This method is a coroutine.
+    """
+    task = asyncio.Task.current_task(loop=hass.loop)
+
+    def run_job():
+        """Run func on behalf of the setup task."""
+        previous = getattr(_SETUP_CALLER, 'task', None)
+        _SETUP_CALLER.task = task
+        try:
+            return func(*args)
+        finally:
+            _SETUP_CALLER.task = previous
+
+    return (yield from hass.loop.run_in_executor(None, run_job))
 
 
 @asyncio.coroutine
@@ -85,16 +144,80 @@ def _handle_requirements(hass: core.HomeAssistant, component,
     if hass.config.skip_pip or not hasattr(component, 'REQUIREMENTS'):
         return True
 
-    for req in component.REQUIREMENTS:
-        if not pkg_util.install_package(req, target=hass.config.path('deps')):
-            _LOGGER.error('Not initializing %s because could not install '
-                          'dependency %s', name, req)
-            _async_persistent_notification(hass, name)
-            return False
+    manifest = _requirements_manifest(hass)
+
+    with startup_trace.get_tracer(hass).span('requirements', name):
+        for req in component.REQUIREMENTS:
+            if manifest.is_met(req):
+                continue
+
+            if not pkg_util.install_package(
+                    req, target=hass.config.path('deps')):
+                _LOGGER.error('Not initializing %s because could not install '
+                              'dependency %s', name, req)
+                _async_persistent_notification(hass, name)
+                return False
 
     return True
 
 
+def _requirements_manifest(hass: core.HomeAssistant):
+    """Return the manifest of requirements that are known to be met.
+
+    Async friendly.
+    """
+    manifest = hass.data.get(DATA_REQUIREMENTS_MANIFEST)
+    if manifest is None:
+        manifest = hass.data[DATA_REQUIREMENTS_MANIFEST] = \
+            pkg_util.RequirementsManifest(
+                hass.config.path(REQUIREMENTS_MANIFEST),
+                hass.config.path('deps'))
+    return manifest
+
+
+def _install_requirements(hass: core.HomeAssistant, domains, config) -> None:
+    """Install missing requirements of components and their platforms.
+
+    All requirements are checked in one pass and the missing ones are
+    installed with a single pip run. Requirements that still fail are
+    reported when their component or platform is set up.
+
+    This method needs to run in an executor.
+    """
+    requirements = []
+    for domain in domains:
+        names = [domain]
+        names.extend(PLATFORM_FORMAT.format(domain, p_name)
+                     for p_name, _ in config_per_platform(config, domain)
+                     if p_name is not None)
+
+        for name in names:
+            metadata = loader.get_component_metadata(name)
+            if metadata is None:
+                continue
+
+            for req in metadata['requirements']:
+                if req not in requirements:
+                    requirements.append(req)
+
+    manifest = _requirements_manifest(hass)
+
+    with startup_trace.get_tracer(hass).span('requirements', 'check all'):
+        missing = manifest.missing(requirements)
+
+    if missing:
+        _LOGGER.info('Installing %d missing requirements', len(missing))
+        with startup_trace.get_tracer(hass).span('requirements',
+                                                 'install missing'):
+            res = pkg_util.install_packages(
+                missing, target=hass.config.path('deps'))
+        if not res:
+            _LOGGER.warning('Unable to install all requirements at once, '
+                            'falling back to installing them one by one')
+
+    manifest.save()
+
+
 @asyncio.coroutine
 def _async_setup_component(hass: core.HomeAssistant,
                            domain: str, config) -> bool:
@@ -112,9 +235,21 @@ def _async_setup_component(hass: core.HomeAssistant,
 
     setup_progress = hass.data.get('setup_progress')
     if setup_progress is None:
-        setup_progress = hass.data['setup_progress'] = []
+        setup_progress = hass.data['setup_progress'] = {}
 
     if domain in setup_progress:
+        owner = setup_progress[domain]
+        if _async_can_wait_for_setup(hass, owner):
+            # Set up in parallel by another task, wait for it.
+            waiting = _async_setup_waiting(hass)
+            current = asyncio.Task.current_task(loop=hass.loop)
+            waiting[current] = owner
+            try:
+                yield from asyncio.wait([owner], loop=hass.loop)
+            finally:
+                waiting.pop(current)
+            return domain in hass.config.components
+
         _LOGGER.error('Attempt made to setup %s during setup of %s',
                       domain, domain)
         _async_persistent_notification(hass, domain, True)
@@ -128,7 +263,7 @@ def _async_setup_component(hass: core.HomeAssistant,
             yield from setup_lock.acquire()
             did_lock = True
 
-        setup_progress.append(domain)
+        setup_progress[domain] = asyncio.Task.current_task(loop=hass.loop)
         config = yield from async_prepare_setup_component(hass, config, domain)
 
         if config is None:
@@ -140,14 +275,19 @@ def _async_setup_component(hass: core.HomeAssistant,
             return False
 
         async_comp = hasattr(component, 'async_setup')
+        tracer = startup_trace.get_tracer(hass)
 
         try:
             _LOGGER.info("Setting up %s", domain)
-            if async_comp:
-                result = yield from component.async_setup(hass, config)
-            else:
-                result = yield from hass.loop.run_in_executor(
-                    None, component.setup, hass, config)
+            with tracer.span('setup', domain):
+                if async_comp:
+                    with tracer.profiled(domain):
+                        result = yield from component.async_setup(
+                            hass, config)
+                else:
+                    result = yield from async_run_setup_job(
+                        hass, tracer.run_profiled, domain, component.setup,
+                        hass, config)
         except Exception:  # pylint: disable=broad-except
             _LOGGER.exception('Error during setup of component %s', domain)
             _async_persistent_notification(hass, domain, True)
@@ -172,11 +312,148 @@ def _async_setup_component(hass: core.HomeAssistant,
 
         return True
     finally:
-        setup_progress.remove(domain)
+        setup_progress.pop(domain)
         if did_lock:
             setup_lock.release()
 
 
+def _async_can_wait_for_setup(hass: core.HomeAssistant, owner) -> bool:
+    """Return if the current task can wait for a setup done by owner.
+
+    Waiting is a setup recursion if owner is, directly or through the
+    tasks it waits for, waiting for the current task.
+
+    This method must be run in the event loop.
+    """
+    current = asyncio.Task.current_task(loop=hass.loop)
+
+    # Walk the chain of tasks owner is waiting for to detect cycles.
+    waiting = _async_setup_waiting(hass)
+    while owner is not None:
+        if owner is current:
+            return False
+        owner = waiting.get(owner)
+
+    return True
+
+
+def _async_setup_waiting(hass: core.HomeAssistant) -> dict:
+    """Return the setup task each blocked setup task is waiting for.
+
+    This method must be run in the event loop.
+    """
+    waiting = hass.data.get('setup_waiting')
+    if waiting is None:
+        waiting = hass.data['setup_waiting'] = {}
+    return waiting
+
+
+def _async_setup_dependencies(domains) -> Dict[str, set]:
+    """Return the components each component has to wait for on startup.
+
+    Components wait for their dependencies, for the components that have to
+    be loaded first and, if they depend on the group component, for all
+    components that do not. Dependencies that would cause a cycle are left
+    out, they are reported when the component is set up.
+
+    Async friendly.
+    """
+    deps = {domain: set() for domain in domains}
+
+    def reaches(domain, target):
+        """Return True if domain waits, directly or not, for target."""
+        seen = set()
+        stack = [domain]
+        while stack:
+            current = stack.pop()
+            if current == target:
+                return True
+            if current not in seen:
+                seen.add(current)
+                stack.extend(deps[current])
+        return False
+
+    def add(domain, dep):
+        """Let domain wait for dep unless that creates a cycle."""
+        if dep != domain and dep in deps and not reaches(dep, domain):
+            deps[domain].add(dep)
+
+    for domain in domains:
+        metadata = loader.get_component_metadata(domain) or {}
+        for dep in metadata.get('dependencies', []):
+            add(domain, dep)
+
+    for domain in domains:
+        for first in ('logger', 'recorder', 'introduction'):
+            add(domain, first)
+
+    group_users = [domain for domain in domains
+                   if 'group' in loader.load_order_component(domain)]
+    for domain in group_users:
+        for other in domains:
+            if other not in group_users:
+                add(domain, other)
+
+    return deps
+
+
+@asyncio.coroutine
+def _async_setup_components(hass: core.HomeAssistant, domains,
+                            config) -> None:
+    """Setup components in parallel, following their dependencies.
+
+    At most hass.config.setup_concurrency components are set up at a time.
+    The setup lock is held until all components are done so that discovered
+    platforms are only loaded afterwards.
+
+    This method is a coroutine.
+    """
+    deps = _async_setup_dependencies(domains)
+    # Profiles only make sense if a single component is set up at a time
+    concurrency = (1 if startup_trace.get_tracer(hass).profile
+                   else hass.config.setup_concurrency)
+    semaphore = asyncio.Semaphore(concurrency, loop=hass.loop)
+    setup_tasks = hass.data['setup_tasks'] = {}
+    timings = {}
+
+    @asyncio.coroutine
+    def async_setup_domain(domain):
+        """Setup a domain once the domains it depends on are done."""
+        if deps[domain]:
+            yield from asyncio.wait(
+                [setup_tasks[dep] for dep in deps[domain]], loop=hass.loop)
+
+        with (yield from semaphore):
+            start = hass.loop.time()
+            yield from _async_setup_component(hass, domain, config)
+            timings[domain] = hass.loop.time() - start
+
+    setup_lock = hass.data.get('setup_lock')
+    if setup_lock is None:
+        setup_lock = hass.data['setup_lock'] = asyncio.Lock(loop=hass.loop)
+
+    yield from setup_lock.acquire()
+    start = hass.loop.time()
+
+    try:
+        # All tasks have to exist before the first one starts waiting.
+        for domain in domains:
+            setup_tasks[domain] = hass.loop.create_task(
+                async_setup_domain(domain))
+
+        if setup_tasks:
+            yield from asyncio.wait(setup_tasks.values(), loop=hass.loop)
+    finally:
+        hass.data.pop('setup_tasks')
+        setup_lock.release()
+
+    _LOGGER.info('Setup of %d components took %.2f seconds: %s',
+                 len(timings), hass.loop.time() - start,
+                 ', '.join('{} {:.2f}s'.format(domain, duration)
+                           for domain, duration in sorted(
+                               timings.items(), key=lambda item: -item[1])))
+
+
 def prepare_setup_component(hass: core.HomeAssistant, config: dict,
                             domain: str):
     """Prepare setup of a component and return processed config."""
@@ -193,7 +470,8 @@ def async_prepare_setup_component(hass: core.HomeAssistant, config: dict,
     This method is a coroutine.
     """
     # pylint: disable=too-many-return-statements
-    component = loader.get_component(domain)
+    with startup_trace.get_tracer(hass).span('import', domain):
+        component = loader.get_component(domain)
     missing_deps = [dep for dep in getattr(component, 'DEPENDENCIES', [])
                     if dep not in hass.config.components]
 
@@ -263,10 +541,9 @@ def async_prepare_setup_component(hass: core.HomeAssistant, config: dict,
 def prepare_setup_platform(hass: core.HomeAssistant, config, domain: str,
                            platform_name: str) -> Optional[ModuleType]:
     """Load a platform and makes sure dependencies are setup."""
-    return run_coroutine_threadsafe(
-        async_prepare_setup_platform(hass, config, domain, platform_name),
-        loop=hass.loop
-    ).result()
+    return _run_setup_threadsafe(
+        hass, async_prepare_setup_platform(hass, config, domain,
+                                           platform_name))
 
 
 @asyncio.coroutine
@@ -282,7 +559,8 @@ def async_prepare_setup_platform(hass: core.HomeAssistant, config, domain: str,
 
     platform_path = PLATFORM_FORMAT.format(domain, platform_name)
 
-    platform = loader.get_platform(domain, platform_name)
+    with startup_trace.get_tracer(hass).span('import', platform_path):
+        platform = loader.get_platform(domain, platform_name)
 
     # Not found
     if platform is None:
@@ -373,6 +651,9 @@ def async_from_config_dict(config: Dict[str, Any],
         async_log_exception(ex, 'homeassistant', core_config, hass)
         return None
 
+    tracer = startup_trace.async_setup_tracer(hass)
+    tracer.profile = hass.config.profile_startup
+
     yield from hass.loop.run_in_executor(
         None, conf_util.process_ha_config_upgrade, hass)
 
@@ -413,9 +694,23 @@ def async_from_config_dict(config: Dict[str, Any],
     event_decorators.HASS = hass
     service.HASS = hass
 
+    # Entities set up from here on can restore the states of the last run
+    yield from restore_state.async_setup_restore_state(hass)
+
+    load_order = loader.load_order_components(components)
+
+    if not skip_pip:
+        yield from hass.loop.run_in_executor(
+            None, _install_requirements, hass, load_order, config)
+
     # Setup the components
-    for domain in loader.load_order_components(components):
-        yield from _async_setup_component(hass, domain, config)
+    yield from _async_setup_components(hass, load_order, config)
+
+    if not skip_pip:
+        yield from hass.loop.run_in_executor(
+            None, _requirements_manifest(hass).save)
+
+    yield from hass.loop.run_in_executor(None, loader.save_manifest)
 
     return hass
 
@@ -470,9 +765,12 @@ def async_from_config_file(config_path: str,
 
     enable_logging(hass, verbose, log_rotate_days)
 
+    tracer = startup_trace.async_setup_tracer(hass)
+
     try:
-        config_dict = yield from hass.loop.run_in_executor(
-            None, conf_util.load_yaml_config_file, config_path)
+        with tracer.span('config', 'load configuration'):
+            config_dict = yield from hass.loop.run_in_executor(
+                None, conf_util.load_yaml_config_file, config_path, True)
     except HomeAssistantError:
         return None
     finally:
@@ -5,8 +5,10 @@ For more details about the RESTful API, please refer to the documentation at
 https://home-assistant.io/developers/api/
 """
 import asyncio
+from datetime import datetime, timedelta
 import json
 import logging
+import math
 
 from aiohttp import web
 import async_timeout
@@ -19,12 +21,16 @@ from homeassistant.const import (
     HTTP_BAD_REQUEST, HTTP_CREATED, HTTP_NOT_FOUND,
     HTTP_UNPROCESSABLE_ENTITY, MATCH_ALL, URL_API, URL_API_COMPONENTS,
     URL_API_CONFIG, URL_API_DISCOVERY_INFO, URL_API_ERROR_LOG,
-    URL_API_EVENT_FORWARD, URL_API_EVENTS, URL_API_SERVICES,
-    URL_API_STATES, URL_API_STATES_ENTITY, URL_API_STREAM, URL_API_TEMPLATE,
-    __version__)
+    URL_API_EVENT_FORWARD, URL_API_EVENT_FORWARD_EVENTS, URL_API_EVENTS,
+    URL_API_HTTP_METRICS, URL_API_RUN_TRACE, URL_API_SERVICES,
+    URL_API_STARTUP_TRACE, URL_API_STATE_WRITES, URL_API_STATES,
+    URL_API_STATES_ENTITY, URL_API_STATES_POLL, URL_API_STREAM, URL_API_TEMPLATE,
+    CONTENT_TYPE_TEXT_PLAIN, __version__)
 from homeassistant.exceptions import TemplateError
+from homeassistant.helpers.event import async_track_state_change
 from homeassistant.helpers.state import AsyncTrackStates
-from homeassistant.helpers import template
+from homeassistant.helpers import run_trace, startup_trace, template
+import homeassistant.util.dt as dt_util
 from homeassistant.components.http import HomeAssistantView
 
 DOMAIN = 'api'
@@ -33,6 +39,12 @@ DEPENDENCIES = ['http']
 STREAM_PING_PAYLOAD = "ping"
 STREAM_PING_INTERVAL = 50  # seconds
 
+# How long a long-poll request waits for a state change
+LONG_POLL_TIMEOUT = 30  # seconds
+LONG_POLL_MAX_TIMEOUT = 300  # seconds
+
+VERSION_EPOCH = datetime(1970, 1, 1, tzinfo=dt_util.UTC)
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -44,14 +56,20 @@ def setup(hass, config):
     hass.http.register_view(APIDiscoveryView)
     hass.http.register_view(APIStatesView)
     hass.http.register_view(APIEntityStateView)
+    hass.http.register_view(APIStatesLongPollView)
     hass.http.register_view(APIEventListenersView)
     hass.http.register_view(APIEventView)
     hass.http.register_view(APIServicesView)
     hass.http.register_view(APIDomainServicesView)
     hass.http.register_view(APIEventForwardingView)
+    hass.http.register_view(APIEventForwardingEventsView)
     hass.http.register_view(APIComponentsView)
     hass.http.register_view(APIErrorLogView)
     hass.http.register_view(APITemplateView)
+    hass.http.register_view(APIHTTPMetricsView)
+    hass.http.register_view(APIStartupTraceView)
+    hass.http.register_view(APIRunTraceView)
+    hass.http.register_view(APIStateWritesView)
 
     return True
 
@@ -234,6 +252,99 @@ class APIEntityStateView(HomeAssistantView):
             return self.json_message('Entity not found', HTTP_NOT_FOUND)
 
 
+class APIStatesLongPollView(HomeAssistantView):
+    """View to wait for state changes of specific entities.
+
+    For clients that cannot keep a stream open. The request is held until
+    one of the entities changes after the version the client passes, or
+    the timeout passes. The version is the last_updated time of the newest
+    state the client has seen, in microseconds since the epoch. Without a
+    version the current states are returned right away. Requested entities
+    without a state are listed as removed, a removal while the request is
+    held returns it.
+    """
+
+    url = URL_API_STATES_POLL
+    name = "api:states-poll"
+
+    @asyncio.coroutine
+    def get(self, request):
+        """Return the states that changed since the given version."""
+        entity_ids = [entity_id.strip().lower() for entity_id
+                      in request.GET.get('entity_id', '').split(',')
+                      if entity_id.strip()]
+
+        if not entity_ids:
+            return self.json_message('No entity_id specified',
+                                     HTTP_BAD_REQUEST)
+
+        try:
+            since = int(request.GET['since']) if 'since' in request.GET \
+                else None
+        except ValueError:
+            return self.json_message('Invalid version specified',
+                                     HTTP_BAD_REQUEST)
+
+        try:
+            timeout = float(request.GET.get('timeout', LONG_POLL_TIMEOUT))
+        except ValueError:
+            timeout = None
+
+        if timeout is None or math.isnan(timeout) or timeout < 0:
+            return self.json_message('Invalid timeout specified',
+                                     HTTP_BAD_REQUEST)
+
+        timeout = min(timeout, LONG_POLL_MAX_TIMEOUT)
+
+        changed, removed = self._async_changed_states(entity_ids, since)
+
+        if since is not None and not changed:
+            changed_fut = asyncio.Future(loop=self.hass.loop)
+
+            @ha.callback
+            def state_changed(entity_id, old_state, new_state):
+                """Wake up the parked request."""
+                if not changed_fut.done():
+                    changed_fut.set_result(None)
+
+            unsub = async_track_state_change(
+                self.hass, entity_ids, state_changed)
+
+            try:
+                with async_timeout.timeout(timeout, loop=self.hass.loop):
+                    yield from changed_fut
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                unsub()
+
+            changed, removed = self._async_changed_states(entity_ids, since)
+
+        if changed:
+            version = max(_state_version(state) for state in changed)
+        else:
+            version = since
+
+        return self.json({'version': version, 'states': changed,
+                          'removed': removed})
+
+    @ha.callback
+    def _async_changed_states(self, entity_ids, since):
+        """Return states updated after since and entity_ids without state."""
+        changed = []
+        removed = []
+
+        for entity_id in entity_ids:
+            state = self.hass.states.get(entity_id)
+
+            if state is None:
+                removed.append(entity_id)
+            elif since is None or _state_version(state) > since:
+                changed.append(state)
+
+        return changed, removed
+
+
 class APIEventListenersView(HomeAssistantView):
     """View to handle EventListeners requests."""
 
@@ -262,14 +373,7 @@ class APIEventView(HomeAssistantView):
             return self.json_message('Event data should be a JSON object',
                                      HTTP_BAD_REQUEST)
 
-        # Special case handling for event STATE_CHANGED
-        # We will try to convert state dicts back to State objects
-        if event_type == ha.EVENT_STATE_CHANGED and event_data:
-            for key in ('old_state', 'new_state'):
-                state = ha.State.from_dict(event_data.get(key))
-
-                if state:
-                    event_data[key] = state
+        async_restore_states(event_type, event_data)
 
         self.hass.bus.async_fire(event_type, event_data, ha.EventOrigin.remote)
 
@@ -349,7 +453,7 @@ class APIEventForwardingView(HomeAssistantView):
         if self.event_forwarder is None:
             self.event_forwarder = rem.EventForwarder(self.hass)
 
-        self.event_forwarder.async_connect(api)
+        self.event_forwarder.async_connect(api, bool(data.get('batch')))
 
         return self.json_message("Event forwarding setup.")
 
@@ -380,6 +484,37 @@ class APIEventForwardingView(HomeAssistantView):
         return self.json_message("Event forwarding cancelled.")
 
 
+class APIEventForwardingEventsView(HomeAssistantView):
+    """View to receive batches of forwarded events."""
+
+    url = URL_API_EVENT_FORWARD_EVENTS
+    name = "api:event-forward-events"
+
+    @asyncio.coroutine
+    def post(self, request):
+        """Fire a batch of events in the order they were received."""
+        try:
+            data = yield from request.json()
+        except ValueError:
+            return self.json_message("Invalid JSON specified.",
+                                     HTTP_BAD_REQUEST)
+
+        if not isinstance(data, list) or not all(
+                isinstance(item, dict) and 'event_type' in item and
+                isinstance(item.get('data') or {}, dict) for item in data):
+            return self.json_message(
+                "Events should be a list of JSON objects with an event_type.",
+                HTTP_BAD_REQUEST)
+
+        for item in data:
+            event_data = item.get('data')
+            async_restore_states(item['event_type'], event_data)
+            self.hass.bus.async_fire(item['event_type'], event_data,
+                                     ha.EventOrigin.remote)
+
+        return self.json_message("{} events fired.".format(len(data)))
+
+
 class APIComponentsView(HomeAssistantView):
     """View to handle Components requests."""
 
@@ -424,6 +559,88 @@ class APITemplateView(HomeAssistantView):
                                      HTTP_BAD_REQUEST)
 
 
+class APIHTTPMetricsView(HomeAssistantView):
+    """View to handle HTTP metrics requests."""
+
+    url = URL_API_HTTP_METRICS
+    name = "api:http-metrics"
+
+    @ha.callback
+    def get(self, request):
+        """Get request metrics per view.
+
+        Pass format=prometheus to get them in the Prometheus text format.
+        """
+        if request.GET.get('format') == 'prometheus':
+            return web.Response(
+                body=self.hass.http.metrics.as_prometheus().encode('UTF-8'),
+                content_type=CONTENT_TYPE_TEXT_PLAIN)
+
+        return self.json(self.hass.http.metrics.as_dict())
+
+
+class APIStateWritesView(HomeAssistantView):
+    """View to get the counts of state writes."""
+
+    url = URL_API_STATE_WRITES
+    name = "api:state-writes"
+
+    @ha.callback
+    def get(self, request):
+        """Get the writes that changed a state, did not or were skipped."""
+        return self.json(dict(self.hass.states.write_stats))
+
+
+class APIStartupTraceView(HomeAssistantView):
+    """View to get the trace of the startup."""
+
+    url = URL_API_STARTUP_TRACE
+    name = "api:startup-trace"
+
+    @ha.callback
+    def get(self, request):
+        """Get the startup trace in the Chrome trace event format."""
+        tracer = startup_trace.get_tracer(self.hass)
+
+        if tracer is startup_trace.NOOP_TRACER:
+            return self.json_message('Startup was not traced',
+                                     HTTP_NOT_FOUND)
+
+        return self.json(tracer.as_dict())
+
+
+class APIRunTraceView(HomeAssistantView):
+    """View to get the traces of the last automation and script runs."""
+
+    url = URL_API_RUN_TRACE
+    name = "api:run-trace"
+
+    @ha.callback
+    def get(self, request):
+        """Get the traces of the last runs."""
+        tracer = run_trace.get_tracer(self.hass)
+
+        if tracer is run_trace.NOOP_TRACER:
+            return self.json_message('Runs are not traced', HTTP_NOT_FOUND)
+
+        return self.json(tracer.as_dict())
+
+
+def _state_version(state):
+    """Return the last_updated time of a state in microseconds."""
+    return (state.last_updated - VERSION_EPOCH) // timedelta(microseconds=1)
+
+
+def async_restore_states(event_type, event_data):
+    """Convert state dicts of a state_changed event back to State objects."""
+    if event_type == ha.EVENT_STATE_CHANGED and event_data:
+        for key in ('old_state', 'new_state'):
+            state = ha.State.from_dict(event_data.get(key))
+
+            if state:
+                event_data[key] = state
+
+
 def async_services_json(hass):
     """Generate services data to JSONify."""
     return [{"domain": key, "services": value}
@@ -18,7 +18,8 @@ from homeassistant.const import (
     SERVICE_TOGGLE)
 from homeassistant.components import logbook
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.helpers import extract_domain_configs, script, condition
+from homeassistant.helpers import (
+    extract_domain_configs, script, condition, run_trace)
 from homeassistant.helpers.entity import ToggleEntity
 from homeassistant.helpers.entity_component import EntityComponent
 from homeassistant.loader import get_platform
@@ -283,10 +284,31 @@ class AutomationEntity(ToggleEntity):
 
         This method is a coroutine.
         """
-        if skip_condition or self._cond_func(variables):
-            yield from self._async_action(self.entity_id, variables)
-            self._last_triggered = utcnow()
-            yield from self.async_update_ha_state()
+        tracer = run_trace.get_tracer(self.hass)
+
+        if tracer is run_trace.NOOP_TRACER:
+            trace = run_trace.NOOP_RUN
+        else:
+            trigger = variables.get('trigger') or {}
+            trace = tracer.async_start_run(DOMAIN, self.entity_id, trigger={
+                key: trigger.get(key) for key in ('platform', 'entity_id')})
+
+        try:
+            with trace.step('condition', 'condition') as step:
+                step['result'] = passed = \
+                    skip_condition or self._cond_func(variables)
+
+            if not passed:
+                trace.finish('condition')
+                return
+
+            yield from self._async_action(self.entity_id, variables, trace)
+        except Exception:
+            trace.finish('error')
+            raise
+
+        self._last_triggered = utcnow()
+        yield from self.async_update_ha_state()
 
     @asyncio.coroutine
     def async_remove(self):
@@ -361,12 +383,12 @@ def _async_get_action(hass, config, name):
     script_obj = script.Script(hass, config, name)
 
     @asyncio.coroutine
-    def action(entity_id, variables):
+    def action(entity_id, variables, trace=None):
         """Action to be executed."""
         _LOGGER.info('Executing %s', name)
         logbook.async_log_entry(
             hass, name, 'has been triggered', DOMAIN, entity_id)
-        yield from script_obj.async_run(variables)
+        yield from script_obj.async_run(variables, trace)
 
     return action
 
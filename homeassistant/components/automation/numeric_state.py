@@ -12,7 +12,7 @@ from homeassistant.core import callback
 from homeassistant.const import (
     CONF_VALUE_TEMPLATE, CONF_PLATFORM, CONF_ENTITY_ID,
     CONF_BELOW, CONF_ABOVE)
-from homeassistant.helpers.event import async_track_state_change
+from homeassistant.helpers.event import async_track_indexed_state_change
 from homeassistant.helpers import condition, config_validation as cv
 
 TRIGGER_SCHEMA = vol.All(vol.Schema({
@@ -66,4 +66,5 @@ def async_trigger(hass, config, action):
 
         hass.async_run_job(action, variables)
 
-    return async_track_state_change(hass, entity_id, state_automation_listener)
+    return async_track_indexed_state_change(
+        hass, entity_id, state_automation_listener)
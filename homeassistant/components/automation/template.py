@@ -11,7 +11,7 @@ import voluptuous as vol
 from homeassistant.core import callback
 from homeassistant.const import CONF_VALUE_TEMPLATE, CONF_PLATFORM
 from homeassistant.helpers import condition
-from homeassistant.helpers.event import async_track_state_change
+from homeassistant.helpers.event import async_track_indexed_template
 import homeassistant.helpers.config_validation as cv
 
 
@@ -51,5 +51,5 @@ def async_trigger(hass, config, action):
         elif not template_result:
             already_triggered = False
 
-    return async_track_state_change(hass, value_template.extract_entities(),
-                                    state_changed_listener)
+    return async_track_indexed_template(
+        hass, value_template, state_changed_listener)
@@ -9,7 +9,7 @@ import voluptuous as vol
 from homeassistant.core import callback
 from homeassistant.const import (
     CONF_EVENT, CONF_ENTITY_ID, CONF_ZONE, MATCH_ALL, CONF_PLATFORM)
-from homeassistant.helpers.event import async_track_state_change
+from homeassistant.helpers.event import async_track_indexed_state_change
 from homeassistant.helpers import (
     condition, config_validation as cv, location)
 
@@ -60,5 +60,5 @@ def async_trigger(hass, config, action):
                 },
             })
 
-    return async_track_state_change(hass, entity_id, zone_automation_listener,
-                                    MATCH_ALL, MATCH_ALL)
+    return async_track_indexed_state_change(
+        hass, entity_id, zone_automation_listener, MATCH_ALL, MATCH_ALL)
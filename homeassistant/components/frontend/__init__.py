@@ -100,7 +100,7 @@ def register_panel(hass, component_name, path, md5=None, sidebar_title=None,
         url = URL_PANEL_COMPONENT.format(component_name)
 
         if url not in _REGISTERED_COMPONENTS:
-            hass.http.register_static_path(url, path)
+            hass.http.register_static_path(url, path, cache_files=True)
             _REGISTERED_COMPONENTS.add(url)
 
         fprinted_url = URL_PANEL_COMPONENT_FP.format(component_name, md5)
@@ -125,10 +125,12 @@ def setup(hass, config):
         sw_path = "service_worker.js"
 
     hass.http.register_static_path("/service_worker.js",
-                                   os.path.join(STATIC_PATH, sw_path), 0)
+                                   os.path.join(STATIC_PATH, sw_path), 0,
+                                   cache_files=True)
     hass.http.register_static_path("/robots.txt",
-                                   os.path.join(STATIC_PATH, "robots.txt"))
-    hass.http.register_static_path("/static", STATIC_PATH)
+                                   os.path.join(STATIC_PATH, "robots.txt"),
+                                   cache_files=True)
+    hass.http.register_static_path("/static", STATIC_PATH, cache_files=True)
 
     local = hass.config.path('www')
     if os.path.isdir(local):
@@ -5,6 +5,11 @@ For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/http/
 """
 import asyncio
+import bisect
+from collections import Counter, OrderedDict, namedtuple
+from email.utils import formatdate
+from functools import lru_cache
+import hashlib
 import hmac
 import json
 import logging
@@ -13,13 +18,14 @@ import os
 from pathlib import Path
 import re
 import ssl
+import time
 from ipaddress import ip_address, ip_network
 
 import voluptuous as vol
 from aiohttp import web, hdrs
 from aiohttp.file_sender import FileSender
 from aiohttp.web_exceptions import (
-    HTTPUnauthorized, HTTPMovedPermanently, HTTPNotModified)
+    HTTPException, HTTPUnauthorized, HTTPMovedPermanently, HTTPNotModified)
 from aiohttp.web_urldispatcher import StaticRoute
 
 from homeassistant.core import is_callback
@@ -71,6 +77,24 @@ CIPHERS = "ECDHE-ECDSA-CHACHA20-POLY1305:ECDHE-RSA-CHACHA20-POLY1305:" \
 
 _FINGERPRINT = re.compile(r'^(.+)-[a-z0-9]{32}\.(\w+)$', re.IGNORECASE)
 
+# Static files up to this size are kept in memory together with their headers
+STATIC_CACHE_MAX_FILE_SIZE = 256 * 1024  # bytes
+STATIC_CACHE_MAX_SIZE = 16 * 1024 * 1024  # bytes
+
+# Precompressed variants of static files, in order of preference
+STATIC_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+# Upper bounds of the request duration histogram buckets
+METRICS_DURATION_BUCKETS = (.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5,
+                            10)  # seconds
+
+# Upper bounds of the response size histogram buckets
+METRICS_SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000)  # bytes
+
+# body is None for files too large to be cached
+CachedFile = namedtuple('CachedFile', ['path', 'mtime', 'size', 'etag',
+                                       'body', 'headers'])
+
 _LOGGER = logging.getLogger(__name__)
 
 CONFIG_SCHEMA = vol.Schema({
@@ -168,53 +192,166 @@ def setup(hass, config):
 
 
 class GzipFileSender(FileSender):
-    """FileSender class capable of sending gzip version if available."""
+    """FileSender class capable of sending gzip version if available.
+
+    A precompressed brotli version is preferred when the client accepts it.
+    With cache_files set, small files are kept in memory together with their
+    headers. In development mode cached files are reloaded when their
+    modification time changes.
+    """
 
     # pylint: disable=invalid-name
 
     development = False
 
+    def __init__(self, *args, cache_files=False, **kwargs):
+        """Initialize the file sender."""
+        super().__init__(*args, **kwargs)
+        self.cache_files = cache_files
+        self._cache = OrderedDict()
+        self._cache_size = 0
+        # Files too large to be cached, sent from disk right away
+        self._uncached = {}
+
     @asyncio.coroutine
     def send(self, request, filepath):
         """Send filepath to client using request."""
-        gzip = False
-        if 'gzip' in request.headers[hdrs.ACCEPT_ENCODING]:
-            gzip_path = filepath.with_name(filepath.name + '.gz')
+        accepted = _accepted_encodings(
+            request.headers.get(hdrs.ACCEPT_ENCODING, ''))
+
+        if not self.cache_files:
+            resp = yield from self._send_file(request, filepath, accepted)
+            return resp
+
+        cache_key = (filepath, accepted)
+        cached = self._cache.get(cache_key) or self._uncached.get(cache_key)
+
+        if cached is not None and self.development:
+            try:
+                st = cached.path.stat()
+                if (st.st_mtime, st.st_size) != (cached.mtime, cached.size):
+                    cached = None
+            except OSError:
+                cached = None
+
+            if cached is None:
+                self._cache_remove(cache_key)
 
-            if gzip_path.is_file():
-                filepath = gzip_path
-                gzip = True
+        if cached is None:
+            cached = yield from self._async_load(
+                request.app.loop, filepath, accepted)
 
-        st = filepath.stat()
+            if cached.body is None:
+                self._uncached[cache_key] = cached
+            else:
+                self._cache_add(cache_key, cached)
+
+        elif cached.body is not None:
+            self._cache.move_to_end(cache_key)
+
+        if cached.body is None:
+            resp = yield from self._send_file(request, filepath, accepted)
+            return resp
+
+        if request.headers.get(hdrs.IF_NONE_MATCH) == cached.etag:
+            raise HTTPNotModified()
 
         modsince = request.if_modified_since
-        if modsince is not None and st.st_mtime <= modsince.timestamp():
+        if modsince is not None and cached.mtime <= modsince.timestamp():
             raise HTTPNotModified()
 
+        return web.Response(body=cached.body, headers=cached.headers)
+
+    @asyncio.coroutine
+    def _async_load(self, loop, filepath, accepted):
+        """Load a file to be cached.
+
+        The body of files too big to be cached is None.
+        """
+        def load():
+            """Read the file and build the response headers."""
+            path, encoding_override = _find_encoded_file(filepath, accepted)
+            st = path.stat()
+
+            if st.st_size > STATIC_CACHE_MAX_FILE_SIZE:
+                return CachedFile(path, st.st_mtime, st.st_size, None, None,
+                                  None)
+
+            with path.open('rb') as fil:
+                body = fil.read()
+
+            etag = '"{}"'.format(hashlib.md5(body).hexdigest())
+            headers = self._file_headers(
+                filepath, encoding_override, st.st_mtime)
+            headers[hdrs.ETAG] = etag
+
+            return CachedFile(path, st.st_mtime, st.st_size, etag, body,
+                              headers)
+
+        cached = yield from loop.run_in_executor(None, load)
+        return cached
+
+    def _cache_add(self, cache_key, cached):
+        """Add a file to the cache, evicting the least recently used."""
+        self._cache[cache_key] = cached
+        self._cache_size += len(cached.body)
+
+        while self._cache_size > STATIC_CACHE_MAX_SIZE:
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_size -= len(evicted.body)
+
+    def _cache_remove(self, cache_key):
+        """Remove a file from the cache."""
+        self._uncached.pop(cache_key, None)
+        cached = self._cache.pop(cache_key, None)
+
+        if cached is not None:
+            self._cache_size -= len(cached.body)
+
+    def _file_headers(self, filepath, encoding_override, mtime):
+        """Return the response headers to send filepath."""
         ct, encoding = mimetypes.guess_type(str(filepath))
         if not ct:
             ct = 'application/octet-stream'
 
-        resp = self._response_factory()
-        resp.content_type = ct
-        if encoding:
-            resp.headers[hdrs.CONTENT_ENCODING] = encoding
-        if gzip:
-            resp.headers[hdrs.VARY] = hdrs.ACCEPT_ENCODING
-        resp.last_modified = st.st_mtime
+        headers = {hdrs.CONTENT_TYPE: ct,
+                   hdrs.LAST_MODIFIED: formatdate(mtime, usegmt=True)}
+
+        if encoding_override:
+            headers[hdrs.CONTENT_ENCODING] = encoding_override
+            headers[hdrs.VARY] = hdrs.ACCEPT_ENCODING
+        elif encoding:
+            headers[hdrs.CONTENT_ENCODING] = encoding
 
         # CACHE HACK
         if not self.development:
             cache_time = 31 * 86400  # = 1 month
-            resp.headers[hdrs.CACHE_CONTROL] = "public, max-age={}".format(
+            headers[hdrs.CACHE_CONTROL] = "public, max-age={}".format(
                 cache_time)
 
+        return headers
+
+    @asyncio.coroutine
+    def _send_file(self, request, filepath, accepted):
+        """Send filepath from disk."""
+        path, encoding_override = _find_encoded_file(filepath, accepted)
+
+        st = path.stat()
+
+        modsince = request.if_modified_since
+        if modsince is not None and st.st_mtime <= modsince.timestamp():
+            raise HTTPNotModified()
+
+        resp = self._response_factory()
+        resp.headers.update(
+            self._file_headers(filepath, encoding_override, st.st_mtime))
+
         file_size = st.st_size
 
         resp.content_length = file_size
         resp.set_tcp_cork(True)
         try:
-            with filepath.open('rb') as f:
+            with path.open('rb') as f:
                 yield from self._sendfile(request, resp, f, file_size)
 
         finally:
@@ -222,16 +359,63 @@ class GzipFileSender(FileSender):
 
         return resp
 
+
+def _accepted_encodings(accept_encoding):
+    """Return the STATIC_ENCODINGS allowed by an Accept-Encoding header."""
+    codings = {}
+
+    for token in accept_encoding.split(','):
+        coding, _, params = token.partition(';')
+
+        try:
+            quality = float(params.strip().partition('q=')[2] or 1)
+        except ValueError:
+            quality = 1
+
+        codings[coding.strip().lower()] = quality
+
+    return tuple(encoding for encoding, _ in STATIC_ENCODINGS
+                 if codings.get(encoding, codings.get('*', 0)) > 0)
+
+
+def _find_encoded_file(filepath, accepted):
+    """Return the path to send and its encoding.
+
+    Picks a precompressed variant of filepath if the client accepts it.
+    """
+    for encoding, suffix in STATIC_ENCODINGS:
+        if encoding not in accepted:
+            continue
+
+        encoded_path = filepath.with_name(filepath.name + suffix)
+
+        if encoded_path.is_file():
+            return encoded_path, encoding
+
+    return filepath, None
+
+
+@lru_cache(maxsize=1024)
+def _strip_fingerprint(filename):
+    """Remove the fingerprint from a resource name."""
+    fingerprinted = _FINGERPRINT.match(filename)
+    if fingerprinted:
+        filename = '{}.{}'.format(*fingerprinted.groups())
+
+    return filename
+
+
 _GZIP_FILE_SENDER = GzipFileSender()
+_CACHING_FILE_SENDER = GzipFileSender(cache_files=True)
 
 
 class HAStaticRoute(StaticRoute):
     """StaticRoute with support for fingerprinting."""
 
-    def __init__(self, prefix, path):
+    def __init__(self, prefix, path, file_sender=_GZIP_FILE_SENDER):
         """Initialize a static route with gzip and cache busting support."""
         super().__init__(None, prefix, path)
-        self._file_sender = _GZIP_FILE_SENDER
+        self._file_sender = file_sender
 
     def match(self, path):
         """Match path to filename."""
@@ -239,12 +423,7 @@ class HAStaticRoute(StaticRoute):
             return None
 
         # Extra sauce to remove fingerprinted resource names
-        filename = path[self._prefix_len:]
-        fingerprinted = _FINGERPRINT.match(filename)
-        if fingerprinted:
-            filename = '{}.{}'.format(*fingerprinted.groups())
-
-        return {'filename': filename}
+        return {'filename': _strip_fingerprint(path[self._prefix_len:])}
 
 
 class HomeAssistantWSGI(object):
@@ -267,6 +446,7 @@ class HomeAssistantWSGI(object):
         self.use_x_forwarded_for = use_x_forwarded_for
         self.trusted_networks = trusted_networks
         self.event_forwarder = None
+        self.metrics = HTTPMetrics()
         self._handler = None
         self.server = None
 
@@ -282,6 +462,7 @@ class HomeAssistantWSGI(object):
 
         # CACHE HACK
         _GZIP_FILE_SENDER.development = development
+        _CACHING_FILE_SENDER.development = development
 
     def register_view(self, view):
         """Register a view with the WSGI server.
@@ -311,16 +492,23 @@ class HomeAssistantWSGI(object):
 
         self.app.router.add_route('GET', url, redirect)
 
-    def register_static_path(self, url_root, path, cache_length=31):
+    def register_static_path(self, url_root, path, cache_length=31,
+                             cache_files=False):
         """Register a folder to serve as a static path.
 
         Specify optional cache length of asset in days.
+
+        Set cache_files to keep small files in memory. Only use this for
+        files that do not change while Home Assistant is running.
         """
+        file_sender = _CACHING_FILE_SENDER if cache_files \
+            else _GZIP_FILE_SENDER
+
         if os.path.isdir(path):
             assert url_root.startswith('/')
             if not url_root.endswith('/'):
                 url_root += '/'
-            route = HAStaticRoute(url_root, path)
+            route = HAStaticRoute(url_root, path, file_sender)
             self.app.router.register_route(route)
             return
 
@@ -329,7 +517,7 @@ class HomeAssistantWSGI(object):
         @asyncio.coroutine
         def serve_file(request):
             """Redirect to location."""
-            res = yield from _GZIP_FILE_SENDER.send(request, filepath)
+            res = yield from file_sender.send(request, filepath)
             return res
 
         # aiohttp supports regex matching for variables. Using that as temp
@@ -453,6 +641,165 @@ class HomeAssistantView(object):
         #     self.app.router.add_route('*', url, self)
 
 
+class Histogram(object):
+    """Histogram with fixed buckets."""
+
+    __slots__ = ['bounds', 'counts', 'count', 'sum']
+
+    def __init__(self, bounds):
+        """Initialize the histogram."""
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0
+
+    def add(self, value):
+        """Add a value to the histogram."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        """Return (upper bound, number of values <= bound) per bucket."""
+        total = 0
+        result = []
+        for bound, count in zip(self.bounds + ('+Inf',), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def as_dict(self):
+        """Return a dict representation of the histogram."""
+        return {
+            'buckets': [[bound, count] for bound, count
+                        in self.cumulative()],
+            'count': self.count,
+            'sum': self.sum,
+        }
+
+
+class ViewMetrics(object):
+    """Metrics of the requests handled by a single view."""
+
+    __slots__ = ['duration', 'size', 'requests', 'cancelled']
+
+    def __init__(self):
+        """Initialize the view metrics."""
+        self.duration = Histogram(METRICS_DURATION_BUCKETS)
+        self.size = Histogram(METRICS_SIZE_BUCKETS)
+        # Number of requests per (status, authenticated)
+        self.requests = Counter()
+        # Requests the client went away from before the response was done
+        self.cancelled = 0
+
+    def as_dict(self):
+        """Return a dict representation of the view metrics."""
+        return {
+            'duration': self.duration.as_dict(),
+            'size': self.size.as_dict(),
+            'requests': [
+                {'status': status, 'authenticated': authenticated,
+                 'count': count}
+                for (status, authenticated), count
+                in sorted(self.requests.items())],
+            'cancelled': self.cancelled,
+        }
+
+
+class HTTPMetrics(object):
+    """Collect duration, size, status and auth result of requests per view."""
+
+    def __init__(self):
+        """Initialize the metrics."""
+        self.views = {}
+
+    def async_record(self, view_name, status, size, authenticated,
+                     duration):
+        """Record a handled request.
+
+        This method must be run in the event loop.
+        """
+        metrics = self._async_get_view(view_name)
+        metrics.duration.add(duration)
+        if size is not None:
+            metrics.size.add(size)
+        metrics.requests[(status, authenticated)] += 1
+
+    def async_record_cancelled(self, view_name):
+        """Record a request that was cancelled by the client.
+
+        This method must be run in the event loop.
+        """
+        self._async_get_view(view_name).cancelled += 1
+
+    def _async_get_view(self, view_name):
+        """Return the metrics of a view."""
+        metrics = self.views.get(view_name)
+
+        if metrics is None:
+            metrics = self.views[view_name] = ViewMetrics()
+
+        return metrics
+
+    def as_dict(self):
+        """Return a dict representation of the metrics."""
+        return {name: metrics.as_dict()
+                for name, metrics in self.views.items()}
+
+    def as_prometheus(self):
+        """Return the metrics in the Prometheus text exposition format."""
+        lines = []
+
+        for metric, attr, help_text in (
+                ('hass_http_request_duration_seconds', 'duration',
+                 'Time spent handling requests.'),
+                ('hass_http_response_size_bytes', 'size',
+                 'Size of response bodies.')):
+            lines.append('# HELP {} {}'.format(metric, help_text))
+            lines.append('# TYPE {} histogram'.format(metric))
+
+            for name, metrics in sorted(self.views.items()):
+                histogram = getattr(metrics, attr)
+                name = _prometheus_label(name)
+
+                for bound, count in histogram.cumulative():
+                    lines.append('{}_bucket{{view="{}",le="{}"}} {}'.format(
+                        metric, name, bound, count))
+
+                lines.append('{}_sum{{view="{}"}} {}'.format(
+                    metric, name, histogram.sum))
+                lines.append('{}_count{{view="{}"}} {}'.format(
+                    metric, name, histogram.count))
+
+        lines.append('# HELP hass_http_requests_total Handled requests.')
+        lines.append('# TYPE hass_http_requests_total counter')
+
+        for name, metrics in sorted(self.views.items()):
+            for (status, authenticated), count in \
+                    sorted(metrics.requests.items()):
+                lines.append(
+                    'hass_http_requests_total{{view="{}",status="{}",'
+                    'authenticated="{}"}} {}'.format(
+                        _prometheus_label(name), status,
+                        str(authenticated).lower(), count))
+
+        lines.append('# HELP hass_http_requests_cancelled_total Requests '
+                     'cancelled by the client.')
+        lines.append('# TYPE hass_http_requests_cancelled_total counter')
+
+        for name, metrics in sorted(self.views.items()):
+            lines.append('hass_http_requests_cancelled_total{{view="{}"}} {}'
+                         .format(_prometheus_label(name), metrics.cancelled))
+
+        return '\n'.join(lines) + '\n'
+
+
+def _prometheus_label(value):
+    """Escape a label value for the Prometheus text format."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace(
+        '\n', '\\n')
+
+
 def request_handler_factory(view, handler):
     """Factory to wrap our handler classes.
 
@@ -460,6 +807,38 @@ def request_handler_factory(view, handler):
     """
     @asyncio.coroutine
     def handle(request):
+        """Handle incoming request and record its metrics."""
+        start = time.monotonic()
+        status = 500
+        size = None
+        cancelled = False
+
+        try:
+            response = yield from handle_request(request)
+            status = response.status
+            size = response.content_length
+            return response
+
+        except HTTPException as err:
+            status = err.status
+            raise
+
+        except asyncio.CancelledError:
+            # The client went away, not an error of the view
+            cancelled = True
+            raise
+
+        finally:
+            if cancelled:
+                view.hass.http.metrics.async_record_cancelled(view.name)
+            else:
+                view.hass.http.metrics.async_record(
+                    view.name, status, size,
+                    getattr(request, 'authenticated', False),
+                    time.monotonic() - start)
+
+    @asyncio.coroutine
+    def handle_request(request):
         """Handle incoming request."""
         remote_addr = view.hass.http.get_real_ip(request)
 
@@ -12,6 +12,7 @@ import voluptuous as vol
 from homeassistant.const import (
     ATTR_ENTITY_ID, CONF_ICON, CONF_NAME, SERVICE_TURN_OFF, SERVICE_TURN_ON,
     SERVICE_TOGGLE, STATE_ON)
+from homeassistant.core import callback
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import ToggleEntity
 from homeassistant.helpers.entity_component import EntityComponent
@@ -29,13 +30,13 @@ SERVICE_SCHEMA = vol.Schema({
     vol.Optional(ATTR_ENTITY_ID): cv.entity_ids,
 })
 
-DEFAULT_CONFIG = {CONF_INITIAL: DEFAULT_INITIAL}
+DEFAULT_CONFIG = {}
 
 CONFIG_SCHEMA = vol.Schema({
     DOMAIN: vol.Schema({
         cv.slug: vol.Any({
             vol.Optional(CONF_NAME): cv.string,
-            vol.Optional(CONF_INITIAL, default=DEFAULT_INITIAL): cv.boolean,
+            vol.Optional(CONF_INITIAL): cv.boolean,
             vol.Optional(CONF_ICON): cv.icon,
         }, None)
     })
@@ -74,10 +75,11 @@ def async_setup(hass, config):
             cfg = DEFAULT_CONFIG
 
         name = cfg.get(CONF_NAME)
-        state = cfg.get(CONF_INITIAL)
+        state = cfg.get(CONF_INITIAL, DEFAULT_INITIAL)
         icon = cfg.get(CONF_ICON)
+        restore = CONF_INITIAL not in cfg
 
-        entities.append(InputBoolean(object_id, name, state, icon))
+        entities.append(InputBoolean(object_id, name, state, icon, restore))
 
     if not entities:
         return False
@@ -111,12 +113,13 @@ def async_setup(hass, config):
 class InputBoolean(ToggleEntity):
     """Representation of a boolean input."""
 
-    def __init__(self, object_id, name, state, icon):
+    def __init__(self, object_id, name, state, icon, restore=False):
         """Initialize a boolean input."""
         self.entity_id = ENTITY_ID_FORMAT.format(object_id)
         self._name = name
         self._state = state
         self._icon = icon
+        self._restore = restore
 
     @property
     def should_poll(self):
@@ -138,6 +141,15 @@ class InputBoolean(ToggleEntity):
         """Return true if entity is on."""
         return self._state
 
+    @callback
+    def async_restore_state(self, state):
+        """Restore the state of the last run if no initial state is set.
+
+        This method must be run in the event loop.
+        """
+        if self._restore:
+            self._state = state.state == STATE_ON
+
     @asyncio.coroutine
     def async_turn_on(self, **kwargs):
         """Turn the entity on."""
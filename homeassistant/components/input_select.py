@@ -10,6 +10,7 @@ import logging
 import voluptuous as vol
 
 from homeassistant.const import ATTR_ENTITY_ID, CONF_ICON, CONF_NAME
+from homeassistant.core import callback
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_component import EntityComponent
@@ -101,7 +102,9 @@ def async_setup(hass, config):
         options = cfg.get(CONF_OPTIONS)
         state = cfg.get(CONF_INITIAL, options[0])
         icon = cfg.get(CONF_ICON)
-        entities.append(InputSelect(object_id, name, state, options, icon))
+        restore = CONF_INITIAL not in cfg
+        entities.append(InputSelect(object_id, name, state, options, icon,
+                                    restore))
 
     if not entities:
         return False
@@ -152,13 +155,14 @@ def async_setup(hass, config):
 class InputSelect(Entity):
     """Representation of a select input."""
 
-    def __init__(self, object_id, name, state, options, icon):
+    def __init__(self, object_id, name, state, options, icon, restore=False):
         """Initialize a select input."""
         self.entity_id = ENTITY_ID_FORMAT.format(object_id)
         self._name = name
         self._current_option = state
         self._options = options
         self._icon = icon
+        self._restore = restore
 
     @property
     def should_poll(self):
@@ -187,6 +191,15 @@ class InputSelect(Entity):
             ATTR_OPTIONS: self._options,
         }
 
+    @callback
+    def async_restore_state(self, state):
+        """Restore the option of the last run if no initial option is set.
+
+        This method must be run in the event loop.
+        """
+        if self._restore and state.state in self._options:
+            self._current_option = state.state
+
     @asyncio.coroutine
     def async_select_option(self, option):
         """Select new option."""
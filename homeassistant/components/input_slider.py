@@ -11,6 +11,7 @@ import voluptuous as vol
 
 from homeassistant.const import (
     ATTR_ENTITY_ID, ATTR_UNIT_OF_MEASUREMENT, CONF_ICON, CONF_NAME)
+from homeassistant.core import callback
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_component import EntityComponent
@@ -48,7 +49,6 @@ def _cv_input_slider(cfg):
     if state < minimum or state > maximum:
         raise vol.Invalid('Initial value {} not in range {}-{}'
                           .format(state, minimum, maximum))
-    cfg[CONF_INITIAL] = state
     return cfg
 
 CONFIG_SCHEMA = vol.Schema({
@@ -90,9 +90,10 @@ def async_setup(hass, config):
         step = cfg.get(CONF_STEP)
         icon = cfg.get(CONF_ICON)
         unit = cfg.get(ATTR_UNIT_OF_MEASUREMENT)
+        restore = CONF_INITIAL not in cfg
 
         entities.append(InputSlider(object_id, name, state, minimum, maximum,
-                                    step, icon, unit))
+                                    step, icon, unit, restore))
 
     if not entities:
         return False
@@ -118,7 +119,7 @@ class InputSlider(Entity):
     """Represent an slider."""
 
     def __init__(self, object_id, name, state, minimum, maximum, step, icon,
-                 unit):
+                 unit, restore=False):
         """Initialize a select input."""
         self.entity_id = ENTITY_ID_FORMAT.format(object_id)
         self._name = name
@@ -128,6 +129,7 @@ class InputSlider(Entity):
         self._step = step
         self._icon = icon
         self._unit = unit
+        self._restore = restore
 
     @property
     def should_poll(self):
@@ -163,6 +165,23 @@ class InputSlider(Entity):
             ATTR_STEP: self._step
         }
 
+    @callback
+    def async_restore_state(self, state):
+        """Restore the value of the last run if no initial value is set.
+
+        This method must be run in the event loop.
+        """
+        if not self._restore:
+            return
+
+        try:
+            value = float(state.state)
+        except ValueError:
+            return
+
+        if self._minimum <= value <= self._maximum:
+            self._current_value = value
+
     @asyncio.coroutine
     def async_select_value(self, value):
         """Select new value."""
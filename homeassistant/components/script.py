@@ -19,7 +19,8 @@ from homeassistant.helpers.entity import ToggleEntity
 from homeassistant.helpers.entity_component import EntityComponent
 import homeassistant.helpers.config_validation as cv
 
-from homeassistant.helpers.script import Script
+from homeassistant.helpers.script import (
+    Script, DEFAULT_MAX_RUNS, MODE_CONTINUE, RUN_MODES)
 
 DOMAIN = "script"
 ENTITY_ID_FORMAT = DOMAIN + '.{}'
@@ -27,6 +28,8 @@ GROUP_NAME_ALL_SCRIPTS = 'all scripts'
 DEPENDENCIES = ["group"]
 
 CONF_SEQUENCE = "sequence"
+CONF_MODE = "mode"
+CONF_MAX_RUNS = "max_runs"
 
 ATTR_VARIABLES = 'variables'
 ATTR_LAST_ACTION = 'last_action'
@@ -37,6 +40,9 @@ _LOGGER = logging.getLogger(__name__)
 _SCRIPT_ENTRY_SCHEMA = vol.Schema({
     CONF_ALIAS: cv.string,
     vol.Required(CONF_SEQUENCE): cv.SCRIPT_SCHEMA,
+    vol.Optional(CONF_MODE, default=MODE_CONTINUE): vol.In(RUN_MODES),
+    vol.Optional(CONF_MAX_RUNS, default=DEFAULT_MAX_RUNS):
+        vol.All(vol.Coerce(int), vol.Range(min=1)),
 })
 
 CONFIG_SCHEMA = vol.Schema({
@@ -81,14 +87,15 @@ def setup(hass, config):
         """Execute a service call to script.<script name>."""
         entity_id = ENTITY_ID_FORMAT.format(service.service)
         script = component.entities.get(entity_id)
-        if script.is_on:
+        if script.is_on and script.script.mode == MODE_CONTINUE:
             _LOGGER.warning("Script %s already running.", entity_id)
             return
         script.turn_on(variables=service.data)
 
     for object_id, cfg in config[DOMAIN].items():
         alias = cfg.get(CONF_ALIAS, object_id)
-        script = ScriptEntity(hass, object_id, alias, cfg[CONF_SEQUENCE])
+        script = ScriptEntity(hass, object_id, alias, cfg[CONF_SEQUENCE],
+                              cfg[CONF_MODE], cfg[CONF_MAX_RUNS])
         component.add_entities((script,))
         hass.services.register(DOMAIN, object_id, service_handler,
                                schema=SCRIPT_SERVICE_SCHEMA)
@@ -122,10 +129,12 @@ def setup(hass, config):
 class ScriptEntity(ToggleEntity):
     """Representation of a script entity."""
 
-    def __init__(self, hass, object_id, name, sequence):
+    def __init__(self, hass, object_id, name, sequence, mode=MODE_CONTINUE,
+                 max_runs=DEFAULT_MAX_RUNS):
         """Initialize the script."""
         self.entity_id = ENTITY_ID_FORMAT.format(object_id)
-        self.script = Script(hass, sequence, name, self.async_update_ha_state)
+        self.script = Script(hass, sequence, name, self.async_update_ha_state,
+                             mode, max_runs)
 
     @property
     def should_poll(self):
@@ -12,9 +12,9 @@ import voluptuous as vol
 
 from homeassistant.components.sensor import PLATFORM_SCHEMA
 from homeassistant.const import (
-    CONF_HOST, CONF_PORT, STATE_UNKNOWN, CONF_NAME, CONF_RESOURCES)
-from homeassistant.helpers.entity import Entity
-from homeassistant.util import Throttle
+    CONF_HOST, CONF_PORT, CONF_NAME, CONF_RESOURCES)
+from homeassistant.helpers.data_coordinator import (
+    CoordinatorEntity, DataCoordinator)
 import homeassistant.helpers.config_validation as cv
 
 _LOGGER = logging.getLogger(__name__)
@@ -70,26 +70,31 @@ def setup_platform(hass, config, add_devices, discovery_info=None):
         _LOGGER.error("No route to resource/endpoint: %s", url)
         return False
 
-    rest = GlancesData(url)
+    def fetch_data():
+        """Get the latest data from the Glances REST API."""
+        return requests.get(url, timeout=10).json()
+
+    # All sensors share one request per interval
+    coordinator = DataCoordinator(
+        hass, _LOGGER, 'Glances', fetch_data, MIN_TIME_BETWEEN_UPDATES)
 
     dev = []
     for resource in var_conf:
-        dev.append(GlancesSensor(rest, name, resource))
+        dev.append(GlancesSensor(coordinator, name, resource))
 
+    coordinator.refresh()
     add_devices(dev)
 
 
-class GlancesSensor(Entity):
+class GlancesSensor(CoordinatorEntity):
     """Implementation of a Glances sensor."""
 
-    def __init__(self, rest, name, sensor_type):
+    def __init__(self, coordinator, name, sensor_type):
         """Initialize the sensor."""
-        self.rest = rest
+        super().__init__(coordinator)
         self._name = name
         self.type = sensor_type
-        self._state = STATE_UNKNOWN
         self._unit_of_measurement = SENSOR_TYPES[sensor_type][1]
-        self.update()
 
     @property
     def name(self):
@@ -108,7 +113,7 @@ class GlancesSensor(Entity):
     @property
     def state(self):
         """Return the state of the resources."""
-        value = self.rest.data
+        value = self.coordinator.data
 
         if value is not None:
             if self.type == 'disk_use_percent':
@@ -143,26 +148,3 @@ class GlancesSensor(Entity):
                 return value['processcount']['thread']
             elif self.type == 'process_sleeping':
                 return value['processcount']['sleeping']
-
-    def update(self):
-        """Get the latest data from REST API."""
-        self.rest.update()
-
-
-class GlancesData(object):
-    """The class for handling the data retrieval."""
-
-    def __init__(self, resource):
-        """Initialize the data object."""
-        self._resource = resource
-        self.data = dict()
-
-    @Throttle(MIN_TIME_BETWEEN_UPDATES)
-    def update(self):
-        """Get the latest data from the Glances REST API."""
-        try:
-            response = requests.get(self._resource, timeout=10)
-            self.data = response.json()
-        except requests.exceptions.ConnectionError:
-            _LOGGER.error("No route to host/endpoint: %s", self._resource)
-            self.data = None
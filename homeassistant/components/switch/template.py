@@ -17,7 +17,8 @@ from homeassistant.const import (
     ATTR_ENTITY_ID, CONF_SWITCHES)
 from homeassistant.exceptions import TemplateError
 from homeassistant.helpers.entity import async_generate_entity_id
-from homeassistant.helpers.event import async_track_state_change
+from homeassistant.helpers.event import (
+    async_track_state_change, async_track_template)
 from homeassistant.helpers.script import Script
 import homeassistant.helpers.config_validation as cv
 
@@ -51,8 +52,7 @@ def async_setup_platform(hass, config, async_add_devices, discovery_info=None):
         state_template = device_config[CONF_VALUE_TEMPLATE]
         on_action = device_config[ON_ACTION]
         off_action = device_config[OFF_ACTION]
-        entity_ids = (device_config.get(ATTR_ENTITY_ID) or
-                      state_template.extract_entities())
+        entity_ids = device_config.get(ATTR_ENTITY_ID)
 
         state_template.hass = hass
 
@@ -94,8 +94,13 @@ class SwitchTemplate(SwitchDevice):
             """Called when the target device changes state."""
             hass.async_add_job(self.async_update_ha_state, True)
 
-        async_track_state_change(
-            hass, entity_ids, template_switch_state_listener)
+        if entity_ids is None:
+            # Follow the states the template reads when it is rendered
+            async_track_template(
+                hass, state_template, template_switch_state_listener)
+        else:
+            async_track_state_change(
+                hass, entity_ids, template_switch_state_listener)
 
     @property
     def name(self):
@@ -13,11 +13,12 @@ import voluptuous as vol
 from homeassistant.const import (
     CONF_LATITUDE, CONF_LONGITUDE, CONF_NAME, CONF_UNIT_SYSTEM,
     CONF_TIME_ZONE, CONF_CUSTOMIZE, CONF_ELEVATION, CONF_UNIT_SYSTEM_METRIC,
-    CONF_UNIT_SYSTEM_IMPERIAL, CONF_TEMPERATURE_UNIT, TEMP_CELSIUS,
-    __version__)
+    CONF_UNIT_SYSTEM_IMPERIAL, CONF_TEMPERATURE_UNIT, CONF_SETUP_CONCURRENCY,
+    CONF_PROFILE_STARTUP, CONF_DEFER_FIRST_UPDATE, CONF_TRACE_RUNS,
+    TEMP_CELSIUS, __version__)
 from homeassistant.core import valid_entity_id
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.util.yaml import load_yaml
+from homeassistant.util.yaml import load_yaml, load_yaml_cached
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import set_customize
 from homeassistant.util import dt as date_util, location as loc_util
@@ -27,6 +28,7 @@ _LOGGER = logging.getLogger(__name__)
 
 YAML_CONFIG_FILE = 'configuration.yaml'
 VERSION_FILE = '.HA_VERSION'
+CONFIG_CACHE_FILE = '.config_cache'
 CONFIG_DIR_NAME = '.homeassistant'
 
 DEFAULT_CORE_CONFIG = (
@@ -103,6 +105,11 @@ CORE_CONFIG_SCHEMA = vol.Schema({
     CONF_TIME_ZONE: cv.time_zone,
     vol.Required(CONF_CUSTOMIZE,
                  default=MappingProxyType({})): _valid_customize,
+    vol.Optional(CONF_SETUP_CONCURRENCY):
+        vol.All(vol.Coerce(int), vol.Range(min=1)),
+    vol.Optional(CONF_PROFILE_STARTUP): cv.boolean,
+    vol.Optional(CONF_DEFER_FIRST_UPDATE): cv.boolean,
+    vol.Optional(CONF_TRACE_RUNS): vol.All(vol.Coerce(int), vol.Range(min=0)),
 })
 
 
@@ -193,7 +200,7 @@ def async_hass_config_yaml(hass):
     """
     def _load_hass_yaml_config():
         path = find_config_file(hass.config.config_dir)
-        conf = load_yaml_config_file(path)
+        conf = load_yaml_config_file(path, True)
         return conf
 
     conf = yield from hass.loop.run_in_executor(None, _load_hass_yaml_config)
@@ -210,12 +217,20 @@ def find_config_file(config_dir):
     return config_path if os.path.isfile(config_path) else None
 
 
-def load_yaml_config_file(config_path):
+def load_yaml_config_file(config_path, use_cache=False):
     """Parse a YAML configuration file.
 
+    With use_cache the parsed configuration is kept in CONFIG_CACHE_FILE
+    next to the configuration file and reused while no included file
+    changed.
+
     This method needs to run in an executor.
     """
-    conf_dict = load_yaml(config_path)
+    if use_cache:
+        conf_dict = load_yaml_cached(config_path, os.path.join(
+            os.path.dirname(config_path), CONFIG_CACHE_FILE))
+    else:
+        conf_dict = load_yaml(config_path)
 
     if not isinstance(conf_dict, dict):
         msg = 'The configuration file {} does not contain a dictionary'.format(
@@ -279,7 +294,11 @@ def async_process_ha_core_config(hass, config):
     for key, attr in ((CONF_LATITUDE, 'latitude'),
                       (CONF_LONGITUDE, 'longitude'),
                       (CONF_NAME, 'location_name'),
-                      (CONF_ELEVATION, 'elevation')):
+                      (CONF_ELEVATION, 'elevation'),
+                      (CONF_SETUP_CONCURRENCY, 'setup_concurrency'),
+                      (CONF_PROFILE_STARTUP, 'profile_startup'),
+                      (CONF_DEFER_FIRST_UPDATE, 'defer_first_update'),
+                      (CONF_TRACE_RUNS, 'trace_runs')):
         if key in config:
             setattr(hac, attr, config[key])
 
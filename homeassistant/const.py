@@ -76,6 +76,7 @@ CONF_COMMAND_STOP = 'command_stop'
 CONF_CONDITION = 'condition'
 CONF_COVERS = 'covers'
 CONF_CUSTOMIZE = 'customize'
+CONF_DEFER_FIRST_UPDATE = 'defer_first_update'
 CONF_DEVICE = 'device'
 CONF_DEVICES = 'devices'
 CONF_DISARM_AFTER_TRIGGER = 'disarm_after_trigger'
@@ -115,6 +116,7 @@ CONF_PIN = 'pin'
 CONF_PLATFORM = 'platform'
 CONF_PORT = 'port'
 CONF_PREFIX = 'prefix'
+CONF_PROFILE_STARTUP = 'profile_startup'
 CONF_PROTOCOL = 'protocol'
 CONF_QUOTE = 'quote'
 CONF_RECIPIENT = 'recipient'
@@ -125,6 +127,7 @@ CONF_SCAN_INTERVAL = 'scan_interval'
 CONF_SENDER = 'sender'
 CONF_SENSOR_CLASS = 'sensor_class'
 CONF_SENSORS = 'sensors'
+CONF_SETUP_CONCURRENCY = 'setup_concurrency'
 CONF_SSL = 'ssl'
 CONF_STATE = 'state'
 CONF_STRUCTURE = 'structure'
@@ -133,6 +136,7 @@ CONF_TEMPERATURE_UNIT = 'temperature_unit'
 CONF_TIME_ZONE = 'time_zone'
 CONF_TIMEOUT = 'timeout'
 CONF_TOKEN = 'token'
+CONF_TRACE_RUNS = 'trace_runs'
 CONF_TRIGGER_TIME = 'trigger_time'
 CONF_TYPE = 'type'
 CONF_UNIT_OF_MEASUREMENT = 'unit_of_measurement'
@@ -328,15 +332,21 @@ URL_API_CONFIG = '/api/config'
 URL_API_DISCOVERY_INFO = '/api/discovery_info'
 URL_API_STATES = '/api/states'
 URL_API_STATES_ENTITY = '/api/states/{}'
+URL_API_STATES_POLL = '/api/states_poll'
 URL_API_EVENTS = '/api/events'
 URL_API_EVENTS_EVENT = '/api/events/{}'
 URL_API_SERVICES = '/api/services'
 URL_API_SERVICES_SERVICE = '/api/services/{}/{}'
 URL_API_EVENT_FORWARD = '/api/event_forwarding'
+URL_API_EVENT_FORWARD_EVENTS = '/api/event_forwarding/events'
 URL_API_COMPONENTS = '/api/components'
 URL_API_ERROR_LOG = '/api/error_log'
 URL_API_LOG_OUT = '/api/log_out'
 URL_API_TEMPLATE = '/api/template'
+URL_API_HTTP_METRICS = '/api/http_metrics'
+URL_API_STARTUP_TRACE = '/api/startup_trace'
+URL_API_RUN_TRACE = '/api/run_trace'
+URL_API_STATE_WRITES = '/api/state_writes'
 
 HTTP_OK = 200
 HTTP_CREATED = 201
@@ -109,7 +109,7 @@ class HomeAssistant(object):
         else:
             self.loop = loop or asyncio.get_event_loop()
 
-        self.executor = ThreadPoolExecutor(max_workers=5)
+        self.executor = ThreadPoolExecutor(max_workers=EXECUTOR_POOL_SIZE)
         self.loop.set_default_executor(self.executor)
         self.loop.set_exception_handler(self._async_exception_handler)
         self._pending_tasks = []
@@ -660,6 +660,9 @@ class StateMachine(object):
         self._states = {}
         self._bus = bus
         self._loop = loop
+        # Writes that changed a state, that found it unchanged and that
+        # entities skipped because they knew nothing changed
+        self.write_stats = {'changed': 0, 'unchanged': 0, 'skipped': 0}
 
     def entity_ids(self, domain_filter=None):
         """List of entity ids that are being tracked."""
@@ -789,8 +792,11 @@ class StateMachine(object):
         same_attr = is_existing and old_state.attributes == attributes
 
         if same_state and same_attr:
+            self.write_stats['unchanged'] += 1
             return
 
+        self.write_stats['changed'] += 1
+
         # If state did not exist or is different, set it
         last_changed = old_state.last_changed if same_state else None
 
@@ -1082,6 +1088,18 @@ class Config(object):
         # If True, pip install is skipped for requirements on startup
         self.skip_pip = False  # type: bool
 
+        # Number of components that are set up at the same time on startup
+        self.setup_concurrency = 3  # type: int
+
+        # If True, a cProfile report of each component setup is recorded
+        self.profile_startup = False  # type: bool
+
+        # If True, entities added during startup are updated after it
+        self.defer_first_update = False  # type: bool
+
+        # Runs of each automation and script that are traced, 0 disables
+        self.trace_runs = 0  # type: int
+
         # List of loaded components
         self.components = []
 
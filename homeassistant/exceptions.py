@@ -26,3 +26,9 @@ class TemplateError(HomeAssistantError):
         """Initalize the error."""
         super().__init__('{}: {}'.format(exception.__class__.__name__,
                                          exception))
+
+
+class PlatformNotReady(HomeAssistantError):
+    """Error to indicate that a platform is not ready to be set up yet."""
+
+    pass
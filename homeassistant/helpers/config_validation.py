@@ -488,8 +488,13 @@ _SCRIPT_DELAY_SCHEMA = vol.Schema({
         template)
 })
 
+_SCRIPT_PARALLEL_SCHEMA = vol.Schema({
+    vol.Optional(CONF_ALIAS): string,
+    vol.Required("parallel"): vol.All(ensure_list, [SERVICE_SCHEMA]),
+})
+
 SCRIPT_SCHEMA = vol.All(
     ensure_list,
     [vol.Any(SERVICE_SCHEMA, _SCRIPT_DELAY_SCHEMA, EVENT_SCHEMA,
-             CONDITION_SCHEMA)],
+             CONDITION_SCHEMA, _SCRIPT_PARALLEL_SCHEMA)],
 )
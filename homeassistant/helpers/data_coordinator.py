@@ -0,0 +1,170 @@
+"""Fetch data once for all the entities of a platform that use it."""
+import asyncio
+
+from homeassistant.core import callback
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.event import async_track_point_in_utc_time
+import homeassistant.util.dt as dt_util
+from homeassistant.util.async import run_coroutine_threadsafe
+
+# Consecutive failed fetches after which the data is unavailable
+FETCH_RETRIES = 2
+
+
+class DataCoordinator(object):
+    """Fetch data every update_interval and push it to its listeners.
+
+    fetch_method is a coroutine function or a function that is run in the
+    executor. It returns the new data or raises if fetching failed. The last
+    data is kept until FETCH_RETRIES fetches in a row failed.
+    """
+
+    def __init__(self, hass, logger, name, fetch_method, update_interval):
+        """Initialize the coordinator."""
+        self.hass = hass
+        self.logger = logger
+        self.name = name
+        self.fetch_method = fetch_method
+        self.update_interval = update_interval
+        self.data = None
+        # Increased every time new data was fetched
+        self.data_version = 0
+        self.last_update_success = True
+        self.failures = 0
+        self._listeners = []
+        self._async_unsub_refresh = None
+
+    @callback
+    def async_add_listener(self, update_callback):
+        """Call update_callback in the event loop after each refresh.
+
+        Refreshing is scheduled while there are listeners. Returns a function
+        to remove the listener.
+
+        This method must be run in the event loop.
+        """
+        self._listeners.append(update_callback)
+
+        if self._async_unsub_refresh is None:
+            self._async_schedule_refresh()
+
+        @callback
+        def async_remove_listener():
+            """Remove the listener."""
+            self._listeners.remove(update_callback)
+
+            if not self._listeners and self._async_unsub_refresh is not None:
+                self._async_unsub_refresh()
+                self._async_unsub_refresh = None
+
+        return async_remove_listener
+
+    def refresh(self):
+        """Fetch the data and push it to the listeners."""
+        run_coroutine_threadsafe(self.async_refresh(), self.hass.loop).result()
+
+    @asyncio.coroutine
+    def async_refresh(self):
+        """Fetch the data and push it to the listeners.
+
+        The next refresh is scheduled update_interval after this one while
+        there are listeners.
+
+        This method is a coroutine.
+        """
+        if self._async_unsub_refresh is not None:
+            self._async_unsub_refresh()
+            self._async_unsub_refresh = None
+
+        try:
+            if asyncio.iscoroutinefunction(self.fetch_method):
+                data = yield from self.fetch_method()
+            else:
+                data = yield from self.hass.loop.run_in_executor(
+                    None, self.fetch_method)
+        except Exception:  # pylint: disable=broad-except
+            self.failures += 1
+
+            if self.failures == FETCH_RETRIES:
+                self.logger.exception('Error fetching %s data', self.name)
+                self.last_update_success = False
+        else:
+            if not self.last_update_success:
+                self.logger.info('Fetching %s data recovered', self.name)
+
+            self.data = data
+            self.data_version += 1
+            self.failures = 0
+            self.last_update_success = True
+
+        for update_callback in list(self._listeners):
+            update_callback()
+
+        if self._listeners:
+            self._async_schedule_refresh()
+
+    @callback
+    def _async_schedule_refresh(self):
+        """Schedule a refresh update_interval from now."""
+        if self._async_unsub_refresh is not None:
+            self._async_unsub_refresh()
+
+        self._async_unsub_refresh = async_track_point_in_utc_time(
+            self.hass, self._async_scheduled_refresh,
+            dt_util.utcnow() + self.update_interval)
+
+    @callback
+    def _async_scheduled_refresh(self, now):
+        """Refresh the data on schedule."""
+        self._async_unsub_refresh = None
+        self.hass.async_add_job(self.async_refresh())
+
+
+class CoordinatorEntity(Entity):
+    """An entity whose state is computed from the data of a coordinator.
+
+    The entity is not polled, its state is written each time the
+    coordinator fetched new data while the entity is added.
+    """
+
+    def __init__(self, coordinator):
+        """Initialize the entity."""
+        self.coordinator = coordinator
+        self._async_unsub_coordinator = None
+
+    @asyncio.coroutine
+    def async_added_to_hass(self):
+        """Listen to the coordinator."""
+        self._async_unsub_coordinator = self.coordinator.async_add_listener(
+            self._async_coordinator_updated)
+
+    @asyncio.coroutine
+    def async_will_remove_from_hass(self):
+        """Stop listening to the coordinator."""
+        if self._async_unsub_coordinator is not None:
+            self._async_unsub_coordinator()
+            self._async_unsub_coordinator = None
+
+    @property
+    def should_poll(self):
+        """No polling needed, the coordinator pushes its data."""
+        return False
+
+    @property
+    def available(self):
+        """Return if the coordinator has data."""
+        return self.coordinator.last_update_success
+
+    @property
+    def change_token(self):
+        """Return a token that changes with the data of the coordinator."""
+        return (self.coordinator.data_version,
+                self.coordinator.last_update_success)
+
+    @callback
+    def _async_coordinator_updated(self):
+        """Write the state for the new data."""
+        if self.hass is None or self.entity_id is None:
+            return
+
+        self.hass.async_add_job(self.async_update_ha_state())
@@ -12,6 +12,7 @@ from homeassistant.const import (
     ATTR_ENTITY_PICTURE)
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import NoEntitySpecifiedError
+from homeassistant.helpers.poll_scheduler import DATA_POLL_SCHEDULER
 from homeassistant.util import ensure_unique_string, slugify
 from homeassistant.util.async import (
     run_coroutine_threadsafe, run_callback_threadsafe)
@@ -78,6 +79,12 @@ class Entity(object):
     # Owning hass instance. Will be set by EntityComponent
     hass = None  # type: Optional[HomeAssistant]
 
+    # What was written by the last async_update_ha_state
+    _written_token = None  # type: Any
+    _written_inputs = None  # type: Any
+    _written_state = None  # type: Any
+    _written_overwrite = None  # type: Optional[Dict[str, Any]]
+
     @property
     def should_poll(self) -> bool:
         """Return True if entity has to be polled for state.
@@ -156,6 +163,17 @@ class Entity(object):
         """
         return False
 
+    @property
+    def change_token(self):
+        """Return a value that changes whenever the state may have changed.
+
+        This covers the state, the attributes and the availability. If the
+        token is the same as the last time the state was written, the state
+        is not built and written again. None disables this. Entities with a
+        dirty flag can return a counter they increase when they get dirty.
+        """
+        return None
+
     def update(self):
         """Retrieve latest state.
 
@@ -211,34 +229,65 @@ class Entity(object):
                 #     future support?
                 yield from self.hass.loop.run_in_executor(None, self.update)
 
+        scheduler = self.hass.data.get(DATA_POLL_SCHEDULER)
+        if scheduler is not None:
+            scheduler.async_check_entity(self)
+
+        token = self.change_token
+        written_state = self.hass.states.get(self.entity_id)
+        # The last write is still current and would be repeated as is
+        unchanged = (written_state is not None and
+                     written_state is self._written_state and
+                     self._written_overwrite is _OVERWRITE and
+                     not self.force_update)
+
+        if unchanged and token is not None and token == self._written_token:
+            self.hass.states.write_stats['skipped'] += 1
+            return
+
         start = timer()
 
         state = self.state
+        state_attributes = self.state_attributes
+        device_attr = self.device_state_attributes
+        inputs = (
+            state, self.available,
+            None if state_attributes is None else dict(state_attributes),
+            None if device_attr is None else dict(device_attr),
+            self.unit_of_measurement, self.name, self.icon,
+            self.entity_picture, self.hidden, self.assumed_state,
+            self.hass.config.units)
+
+        # Without token the properties are compared to the last write, so
+        # only the state machine lookup and property reads are done.
+        if unchanged and token is None and inputs == self._written_inputs:
+            self.hass.states.write_stats['skipped'] += 1
+            return
+
+        (state, available, state_attributes, device_attr, unit, name, icon,
+         entity_picture, hidden, assumed_state, units) = inputs
 
         if state is None:
             state = STATE_UNKNOWN
         else:
             state = str(state)
 
-        attr = self.state_attributes or {}
-
-        device_attr = self.device_state_attributes
+        attr = dict(state_attributes or {})
 
         if device_attr is not None:
             attr.update(device_attr)
 
-        self._attr_setter('unit_of_measurement', str, ATTR_UNIT_OF_MEASUREMENT,
-                          attr)
+        self._attr_setter(unit, str, ATTR_UNIT_OF_MEASUREMENT, attr)
 
-        if not self.available:
+        if not available:
             state = STATE_UNAVAILABLE
             attr = {}
 
-        self._attr_setter('name', str, ATTR_FRIENDLY_NAME, attr)
-        self._attr_setter('icon', str, ATTR_ICON, attr)
-        self._attr_setter('entity_picture', str, ATTR_ENTITY_PICTURE, attr)
-        self._attr_setter('hidden', bool, ATTR_HIDDEN, attr)
-        self._attr_setter('assumed_state', bool, ATTR_ASSUMED_STATE, attr)
+        self._attr_setter(name, str, ATTR_FRIENDLY_NAME, attr)
+        self._attr_setter(icon, str, ATTR_ICON, attr)
+        self._attr_setter(entity_picture, str, ATTR_ENTITY_PICTURE, attr)
+        self._attr_setter(hidden, bool, ATTR_HIDDEN, attr)
+        self._attr_setter(assumed_state, bool, ATTR_ASSUMED_STATE, attr)
 
         end = timer()
 
@@ -259,7 +308,6 @@ class Entity(object):
         try:
             unit_of_measure = attr.get(ATTR_UNIT_OF_MEASUREMENT)
             if unit_of_measure in (TEMP_CELSIUS, TEMP_FAHRENHEIT):
-                units = self.hass.config.units
                 state = str(units.temperature(float(state), unit_of_measure))
                 attr[ATTR_UNIT_OF_MEASUREMENT] = units.temperature_unit
         except ValueError:
@@ -269,27 +317,47 @@ class Entity(object):
         self.hass.states.async_set(
             self.entity_id, state, attr, self.force_update)
 
+        self._written_token = token
+        self._written_inputs = inputs
+        self._written_state = self.hass.states.get(self.entity_id)
+        self._written_overwrite = _OVERWRITE
+
     def remove(self) -> None:
         """Remove entitiy from HASS."""
         run_coroutine_threadsafe(
             self.async_remove(), self.hass.loop
         ).result()
 
+    @asyncio.coroutine
+    def async_added_to_hass(self) -> None:
+        """Run when the entity was added to Home Assistant.
+
+        This method must be run in the event loop.
+        """
+        pass
+
+    @asyncio.coroutine
+    def async_will_remove_from_hass(self) -> None:
+        """Run when the entity is about to be removed from Home Assistant.
+
+        This method must be run in the event loop.
+        """
+        pass
+
     @asyncio.coroutine
     def async_remove(self) -> None:
         """Remove entitiy from async HASS.
 
         This method must be run in the event loop.
         """
+        yield from self.async_will_remove_from_hass()
         self.hass.states.async_remove(self.entity_id)
 
-    def _attr_setter(self, name, typ, attr, attrs):
+    def _attr_setter(self, value, typ, attr, attrs):
         """Helper method to populate attributes based on properties."""
         if attr in attrs:
             return
 
-        value = getattr(self, name)
-
         if not value:
             return
 
@@ -1,24 +1,47 @@
 """Helpers for components that manage entities."""
 import asyncio
+from datetime import timedelta
 
 from homeassistant import config as conf_util
 from homeassistant.bootstrap import (
-    async_prepare_setup_platform, async_prepare_setup_component)
+    async_prepare_setup_platform, async_prepare_setup_component,
+    async_run_setup_job)
 from homeassistant.const import (
     ATTR_ENTITY_ID, CONF_SCAN_INTERVAL, CONF_ENTITY_NAMESPACE,
-    DEVICE_DEFAULT_NAME)
+    DEVICE_DEFAULT_NAME, EVENT_HOMEASSISTANT_START, STATE_UNKNOWN)
 from homeassistant.core import callback, valid_entity_id
-from homeassistant.exceptions import HomeAssistantError
+from homeassistant.exceptions import HomeAssistantError, PlatformNotReady
 from homeassistant.loader import get_component
-from homeassistant.helpers import config_per_platform, discovery
+from homeassistant.helpers import (
+    config_per_platform, discovery, poll_scheduler, restore_state,
+    startup_trace)
 from homeassistant.helpers.entity import async_generate_entity_id
-from homeassistant.helpers.event import async_track_utc_time_change
+from homeassistant.helpers.event import async_track_point_in_utc_time
 from homeassistant.helpers.service import extract_entity_ids
+import homeassistant.util.dt as dt_util
 from homeassistant.util.async import (
     run_callback_threadsafe, run_coroutine_threadsafe)
 
 DEFAULT_SCAN_INTERVAL = 15
 
+# Time the component setup waits for each of its platforms, slower
+# platforms continue their setup in the background
+PLATFORM_SETUP_TIMEOUT = 60  # seconds
+# Time after which a setup attempt of a platform is given up and retried.
+# The executor thread of a sync platform can not be stopped and is left
+# to finish on its own.
+PLATFORM_SETUP_ATTEMPT_TIMEOUT = 300  # seconds
+
+# Retries of platforms that are not ready yet, with exponential back off
+PLATFORM_SETUP_RETRIES = 5
+PLATFORM_RETRY_DELAY = 30  # seconds
+PLATFORM_RETRY_MAX_DELAY = 600  # seconds
+
+DATA_DEFERRED_UPDATES = 'entity_deferred_updates'
+# Entities updated at the same time after startup if their first update is
+# deferred
+DEFERRED_UPDATE_CONCURRENCY = 10
+
 
 class EntityComponent(object):
     """Helper class that will help a component manage its entities."""
@@ -42,6 +65,8 @@ class EntityComponent(object):
         self._platforms = {
             'core': EntityPlatform(self, self.scan_interval, None),
         }
+        self._async_unsub_retries = []
+        self._async_setup_tasks = set()
         self.async_add_entities = self._platforms['core'].async_add_entities
         self.add_entities = self._platforms['core'].add_entities
 
@@ -67,20 +92,29 @@ class EntityComponent(object):
         self.config = config
 
         # Look in config for Domain, Domain 2, Domain 3 etc and load them
-        tasks = []
+        # all at once. Platforms that are still busy after the timeout
+        # continue their setup in the background.
+        tasks = {}
         for p_type, p_config in config_per_platform(config, self.domain):
-            tasks.append(self._async_setup_platform(p_type, p_config))
+            task = self._async_start_platform_setup(p_type, p_config)
+            tasks[task] = p_type
 
         if tasks:
-            yield from asyncio.wait(tasks, loop=self.hass.loop)
+            _, pending = yield from asyncio.wait(
+                tasks, timeout=PLATFORM_SETUP_TIMEOUT, loop=self.hass.loop)
+
+            for task in pending:
+                self.logger.warning(
+                    'Setup of platform %s is taking over %s seconds, '
+                    'continuing in the background', tasks[task],
+                    PLATFORM_SETUP_TIMEOUT)
 
         # Generic discovery listener for loading platform dynamically
         # Refer to: homeassistant.components.discovery.load_platform()
         @callback
         def component_platform_discovered(platform, info):
             """Callback to load a platform."""
-            self.hass.async_add_job(
-                self._async_setup_platform(platform, {}, info))
+            self._async_start_platform_setup(platform, {}, info)
 
         discovery.async_listen_platform(
             self.hass, self.domain, component_platform_discovered)
@@ -111,11 +145,30 @@ class EntityComponent(object):
                 in extract_entity_ids(self.hass, service, expand_group)
                 if entity_id in self.entities]
 
+    @callback
+    def _async_start_platform_setup(self, platform_type, platform_config,
+                                    discovery_info=None, tries=0):
+        """Start the setup of a platform in a task and return the task.
+
+        The task is cancelled if the component is reset before it is done.
+
+        This method must be run in the event loop.
+        """
+        task = self.hass.loop.create_task(self._async_setup_platform(
+            platform_type, platform_config, discovery_info, tries))
+        self._async_setup_tasks.add(task)
+        task.add_done_callback(self._async_setup_tasks.discard)
+        return task
+
     @asyncio.coroutine
     def _async_setup_platform(self, platform_type, platform_config,
-                              discovery_info=None):
+                              discovery_info=None, tries=0):
         """Setup a platform for this component.
 
+        A platform that is not ready yet, cannot connect or takes longer
+        than PLATFORM_SETUP_ATTEMPT_TIMEOUT is set up again later, up to
+        PLATFORM_SETUP_RETRIES times.
+
         This method must be run in the event loop.
         """
         platform = yield from async_prepare_setup_platform(
@@ -133,29 +186,85 @@ class EntityComponent(object):
         key = (platform_type, scan_interval, entity_namespace)
 
         if key not in self._platforms:
-            self._platforms[key] = EntityPlatform(self, scan_interval,
-                                                  entity_namespace)
+            self._platforms[key] = EntityPlatform(
+                self, scan_interval, entity_namespace,
+                getattr(platform, 'POLL_BACKOFF', False))
         entity_platform = self._platforms[key]
 
+        platform_path = '{}.{}'.format(self.domain, platform_type)
+        tracer = startup_trace.get_tracer(self.hass)
+
         try:
-            self.logger.info("Setting up %s.%s", self.domain, platform_type)
-            if getattr(platform, 'async_setup_platform', None):
-                yield from platform.async_setup_platform(
-                    self.hass, platform_config,
-                    entity_platform.async_add_entities, discovery_info
-                )
-            else:
-                yield from self.hass.loop.run_in_executor(
-                    None, platform.setup_platform, self.hass, platform_config,
-                    entity_platform.add_entities, discovery_info
-                )
-
-            self.hass.config.components.append(
-                '{}.{}'.format(self.domain, platform_type))
+            self.logger.info("Setting up %s", platform_path)
+            with tracer.span('platform', platform_path):
+                if getattr(platform, 'async_setup_platform', None):
+                    setup = platform.async_setup_platform(
+                        self.hass, platform_config,
+                        entity_platform.async_add_entities, discovery_info
+                    )
+                else:
+                    setup = async_run_setup_job(
+                        self.hass, platform.setup_platform, self.hass,
+                        platform_config, entity_platform.add_entities,
+                        discovery_info
+                    )
+
+                yield from asyncio.wait_for(
+                    setup, PLATFORM_SETUP_ATTEMPT_TIMEOUT,
+                    loop=self.hass.loop)
+
+            self.hass.config.components.append(platform_path)
+        except PlatformNotReady:
+            self.logger.warning(
+                'Platform %s not ready yet', platform_type)
+            self._async_schedule_retry(
+                platform_type, platform_config, discovery_info, tries)
+        except asyncio.TimeoutError:
+            self.logger.warning(
+                'Setup of platform %s timed out', platform_type)
+            self._async_schedule_retry(
+                platform_type, platform_config, discovery_info, tries)
+        except OSError as err:
+            # Connection errors, including those of requests
+            self.logger.warning(
+                'Unable to connect while setting up platform %s: %s',
+                platform_type, err)
+            self._async_schedule_retry(
+                platform_type, platform_config, discovery_info, tries)
         except Exception:  # pylint: disable=broad-except
             self.logger.exception(
                 'Error while setting up platform %s', platform_type)
 
+    @callback
+    def _async_schedule_retry(self, platform_type, platform_config,
+                              discovery_info, tries):
+        """Schedule another setup of a platform that failed.
+
+        This method must be run in the event loop.
+        """
+        if tries >= PLATFORM_SETUP_RETRIES:
+            self.logger.error(
+                'Giving up setting up platform %s after %d retries',
+                platform_type, tries)
+            return
+
+        delay = min(PLATFORM_RETRY_DELAY * 2 ** tries,
+                    PLATFORM_RETRY_MAX_DELAY)
+        self.logger.info('Retrying setup of platform %s in %d seconds',
+                         platform_type, delay)
+
+        @callback
+        def async_retry(now):
+            """Setup the platform again."""
+            self._async_unsub_retries.remove(unsub)
+            self._async_start_platform_setup(
+                platform_type, platform_config, discovery_info, tries + 1)
+
+        unsub = async_track_point_in_utc_time(
+            self.hass, async_retry,
+            dt_util.utcnow() + timedelta(seconds=delay))
+        self._async_unsub_retries.append(unsub)
+
     def add_entity(self, entity, platform=None, update_before_add=False):
         """Add entity to component."""
         return run_coroutine_threadsafe(
@@ -174,23 +283,31 @@ class EntityComponent(object):
 
         entity.hass = self.hass
 
-        # update/init entity data
-        if update_before_add:
-            if hasattr(entity, 'async_update'):
-                yield from entity.async_update()
-            else:
-                yield from self.hass.loop.run_in_executor(None, entity.update)
+        # Register the entity now and update it once Home Assistant started
+        defer_update = update_before_add and _defer_first_update(self.hass)
 
-        if getattr(entity, 'entity_id', None) is None:
-            object_id = entity.name or DEVICE_DEFAULT_NAME
+        # Entities restoring their last state are updated after the startup
+        if hasattr(entity, 'async_restore_state') and \
+           restore_state.has_restore_cache(self.hass):
+            self._async_set_entity_id(entity, platform)
+            last_state = restore_state.async_get_last_state(
+                self.hass, entity.entity_id)
 
-            if platform is not None and platform.entity_namespace is not None:
-                object_id = '{} {}'.format(platform.entity_namespace,
-                                           object_id)
+            if last_state is not None:
+                entity.async_restore_state(last_state)
+                defer_update = update_before_add
 
-            entity.entity_id = async_generate_entity_id(
-                self.entity_id_format, object_id,
-                self.entities.keys())
+        # update/init entity data
+        if update_before_add and not defer_update:
+            with startup_trace.get_tracer(self.hass).span(
+                    'entity_update', entity.name or self.domain):
+                if hasattr(entity, 'async_update'):
+                    yield from entity.async_update()
+                else:
+                    yield from self.hass.loop.run_in_executor(
+                        None, entity.update)
+
+        self._async_set_entity_id(entity, platform)
 
         # Make sure it is valid in case an entity set the value themselves
         if entity.entity_id in self.entities:
@@ -201,10 +318,38 @@ class EntityComponent(object):
                 'Invalid entity id: {}'.format(entity.entity_id))
 
         self.entities[entity.entity_id] = entity
-        yield from entity.async_update_ha_state()
+        yield from entity.async_added_to_hass()
+
+        if not defer_update:
+            yield from entity.async_update_ha_state()
+            return True
+
+        try:
+            yield from entity.async_update_ha_state()
+        except Exception:  # pylint: disable=broad-except
+            # Entities may not have a valid state before their first update
+            self.hass.states.async_set(entity.entity_id, STATE_UNKNOWN)
 
+        _async_defer_first_update(self, entity)
         return True
 
+    @callback
+    def _async_set_entity_id(self, entity, platform):
+        """Generate an entity id for entity if it has none.
+
+        This method must be run in the event loop.
+        """
+        if getattr(entity, 'entity_id', None) is not None:
+            return
+
+        object_id = entity.name or DEVICE_DEFAULT_NAME
+
+        if platform is not None and platform.entity_namespace is not None:
+            object_id = '{} {}'.format(platform.entity_namespace, object_id)
+
+        entity.entity_id = async_generate_entity_id(
+            self.entity_id_format, object_id, self.entities.keys())
+
     def update_group(self):
         """Set up and/or update component group."""
         run_callback_threadsafe(
@@ -236,12 +381,20 @@ class EntityComponent(object):
 
         This method must be run in the event loop.
         """
+        # Platforms still setting up would add entities after the reset
+        for task in list(self._async_setup_tasks):
+            task.cancel()
+        self._async_setup_tasks.clear()
+
         tasks = [platform.async_reset() for platform
                  in self._platforms.values()]
 
         if tasks:
             yield from asyncio.wait(tasks, loop=self.hass.loop)
 
+        while self._async_unsub_retries:
+            self._async_unsub_retries.pop()()
+
         self._platforms = {
             'core': self._platforms['core']
         }
@@ -283,24 +436,37 @@ class EntityComponent(object):
 class EntityPlatform(object):
     """Keep track of entities for a single platform and stay in loop."""
 
-    def __init__(self, component, scan_interval, entity_namespace):
+    def __init__(self, component, scan_interval, entity_namespace,
+                 poll_backoff=False):
         """Initalize the entity platform."""
         self.component = component
         self.scan_interval = scan_interval
         self.entity_namespace = entity_namespace
+        # Poll entities less often while their state does not change
+        self.poll_backoff = poll_backoff
         self.platform_entities = []
-        self._async_unsub_polling = None
-        self._process_updates = False
 
     def add_entities(self, new_entities, update_before_add=False):
         """Add entities for a single platform."""
-        if update_before_add:
+        hass = self.component.hass
+        new_entities = list(new_entities)
+
+        # Entities that may restore their last state are updated later on
+        restore = restore_state.has_restore_cache(hass) and any(
+            hasattr(entity, 'async_restore_state') for entity in new_entities)
+
+        if update_before_add and not restore and \
+           not _defer_first_update(hass):
+            tracer = startup_trace.get_tracer(hass)
             for entity in new_entities:
-                entity.update()
+                with tracer.span('entity_update',
+                                 entity.name or self.component.domain):
+                    entity.update()
+            update_before_add = False
 
         run_coroutine_threadsafe(
-            self.async_add_entities(list(new_entities), False),
-            self.component.hass.loop
+            self.async_add_entities(new_entities, update_before_add),
+            hass.loop
         ).result()
 
     @asyncio.coroutine
@@ -319,23 +485,22 @@ class EntityPlatform(object):
         yield from asyncio.wait(tasks, loop=self.component.hass.loop)
         yield from self.component.async_update_group()
 
-        if self._async_unsub_polling is not None or \
-           not any(entity.should_poll for entity
-                   in self.platform_entities):
-            return
-
-        self._async_unsub_polling = async_track_utc_time_change(
-            self.component.hass, self._update_entity_states,
-            second=range(0, 60, self.scan_interval))
-
     @asyncio.coroutine
     def _async_process_entity(self, new_entity, update_before_add):
         """Add entities to StateMachine."""
         ret = yield from self.component.async_add_entity(
             new_entity, self, update_before_add=update_before_add
         )
-        if ret:
-            self.platform_entities.append(new_entity)
+        if not ret:
+            return
+
+        self.platform_entities.append(new_entity)
+
+        # Entities not polling yet are polled once they do
+        poll_scheduler.async_get_poll_scheduler(
+            self.component.hass).async_add_entity(
+                new_entity, self.scan_interval, self.component.logger,
+                self, self.poll_backoff)
 
     @asyncio.coroutine
     def async_reset(self):
@@ -346,45 +511,64 @@ class EntityPlatform(object):
         if not self.platform_entities:
             return
 
+        scheduler = poll_scheduler.async_get_poll_scheduler(
+            self.component.hass)
+
+        for entity in self.platform_entities:
+            scheduler.async_remove_entity(entity)
+
         tasks = [entity.async_remove() for entity in self.platform_entities]
 
         yield from asyncio.wait(tasks, loop=self.component.hass.loop)
 
-        if self._async_unsub_polling is not None:
-            self._async_unsub_polling()
-            self._async_unsub_polling = None
 
-    @asyncio.coroutine
-    def _update_entity_states(self, now):
-        """Update the states of all the polling entities.
+def _defer_first_update(hass):
+    """Return if first updates of new entities wait till after startup.
 
-        To protect from flooding the executor, we will update async entities
-        in parallel and other entities sequential.
+    Async friendly.
+    """
+    return hass.config.defer_first_update and not hass.is_running
 
-        This method must be run in the event loop.
-        """
-        if self._process_updates:
-            return
-        self._process_updates = True
 
-        try:
-            tasks = []
-            to_update = []
+@callback
+def _async_defer_first_update(component, entity):
+    """Update an entity once Home Assistant has started.
 
-            for entity in self.platform_entities:
-                if not entity.should_poll:
-                    continue
+    This method must be run in the event loop.
+    """
+    hass = component.hass
+    deferred = hass.data.get(DATA_DEFERRED_UPDATES)
 
-                update_coro = entity.async_update_ha_state(True)
-                if hasattr(entity, 'async_update'):
-                    tasks.append(update_coro)
-                else:
-                    to_update.append(update_coro)
+    if deferred is None:
+        deferred = hass.data[DATA_DEFERRED_UPDATES] = []
 
-            for update_coro in to_update:
-                yield from update_coro
+        @callback
+        def async_start_updates(event):
+            """Start the deferred updates, a limited number at a time."""
+            semaphore = asyncio.Semaphore(DEFERRED_UPDATE_CONCURRENCY,
+                                          loop=hass.loop)
+            for comp, ent in hass.data.pop(DATA_DEFERRED_UPDATES):
+                hass.async_add_job(_async_first_update(comp, ent, semaphore))
 
-            if tasks:
-                yield from asyncio.wait(tasks, loop=self.component.hass.loop)
-        finally:
-            self._process_updates = False
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_START,
+                                   async_start_updates)
+
+    deferred.append((component, entity))
+
+
+@asyncio.coroutine
+def _async_first_update(component, entity, semaphore):
+    """Do the deferred first update of an entity.
+
+    This method must be run in the event loop.
+    """
+    with (yield from semaphore):
+        # Skip entities that were removed in the meantime
+        if component.entities.get(entity.entity_id) is not entity:
+            return
+
+        try:
+            yield from entity.async_update_ha_state(True)
+        except Exception:  # pylint: disable=broad-except
+            component.logger.exception('Error during first update of %s',
+                                       entity.entity_id)
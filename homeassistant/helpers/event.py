@@ -8,6 +8,8 @@ from ..const import (
 from ..util import dt as dt_util
 from ..util.async import run_callback_threadsafe
 
+DATA_STATE_CHANGE_INDEX = 'state_change_index'
+
 # PyLint does not like the use of threaded_listener_factory
 # pylint: disable=invalid-name
 
@@ -63,25 +65,217 @@ def async_track_state_change(hass, entity_ids, action, from_state=None,
            event.data.get('entity_id') not in entity_ids:
             return
 
-        if event.data.get('old_state') is not None:
-            old_state = event.data['old_state'].state
-        else:
-            old_state = None
+        _async_call_if_matches(hass, event, action, from_state, to_state)
+
+    return hass.bus.async_listen(EVENT_STATE_CHANGED, state_change_listener)
+
+
+track_state_change = threaded_listener_factory(async_track_state_change)
+
+
+def async_track_template(hass, template, action):
+    """Track state changes of the entities a template read when rendered.
+
+    The entities are taken from the last render of the template, so the
+    tracked entities follow what the template actually reads. Before the
+    first render every state change is passed on.
+
+    Returns a function that can be called to remove the listener.
+
+    Must be run within the event loop.
+    """
+    @callback
+    def template_change_listener(event):
+        """The listener that listens for state changes of the template."""
+        entity_id = event.data.get('entity_id')
+        render_info = template.render_info
+
+        if render_info is not None and not render_info.filter(entity_id):
+            return
+
+        hass.async_run_job(action, entity_id, event.data.get('old_state'),
+                           event.data.get('new_state'))
+
+    return hass.bus.async_listen(EVENT_STATE_CHANGED,
+                                 template_change_listener)
+
+
+track_template = threaded_listener_factory(async_track_template)
+
+
+class _StateChangeIndex(object):
+    """Dispatch state changes to the listeners of the changed entity.
+
+    A single state changed listener on the bus looks up the listeners
+    registered for the entity id, for its domain (as 'domain.*') and for
+    all entities (MATCH_ALL) instead of every listener filtering every
+    state change.
+    """
+
+    def __init__(self, hass):
+        """Initialize the index."""
+        self.hass = hass
+        self._listeners = {}
+        self._async_unsub = None
+
+    @callback
+    def async_add(self, keys, listener):
+        """Call listener with the state changes of keys."""
+        for key in keys:
+            self._listeners.setdefault(key, []).append(listener)
+
+        if self._async_unsub is None:
+            self._async_unsub = self.hass.bus.async_listen(
+                EVENT_STATE_CHANGED, self._async_state_changed)
+
+    @callback
+    def async_remove(self, keys, listener):
+        """Stop calling listener with the state changes of keys."""
+        for key in keys:
+            listeners = self._listeners.get(key)
+
+            if listeners is None or listener not in listeners:
+                continue
+
+            listeners.remove(listener)
+
+            if not listeners:
+                self._listeners.pop(key)
+
+        if not self._listeners and self._async_unsub is not None:
+            self._async_unsub()
+            self._async_unsub = None
+
+    @callback
+    def _async_state_changed(self, event):
+        """Call the listeners registered for the changed entity."""
+        entity_id = event.data.get('entity_id')
+        get = self._listeners.get
+        listeners = []
+
+        for key in (entity_id, '{}.*'.format(entity_id.split('.', 1)[0]),
+                    MATCH_ALL):
+            for listener in get(key, ()):
+                # A listener can be registered for entity and domain
+                if listener not in listeners:
+                    listeners.append(listener)
+
+        for listener in listeners:
+            listener(event)
+
+
+@callback
+def _async_get_state_change_index(hass):
+    """Return the state change index of hass."""
+    index = hass.data.get(DATA_STATE_CHANGE_INDEX)
+
+    if index is None:
+        index = hass.data[DATA_STATE_CHANGE_INDEX] = _StateChangeIndex(hass)
+
+    return index
+
+
+def async_track_indexed_state_change(hass, entity_ids, action,
+                                     from_state=None, to_state=None):
+    """Track specific state changes through the shared state change index.
+
+    Same as async_track_state_change, but all trackers share one listener
+    on the bus that only passes a state change to the trackers of the
+    changed entity. Use it for large numbers of trackers, like automation
+    triggers.
 
-        if event.data.get('new_state') is not None:
-            new_state = event.data['new_state'].state
+    Returns a function that can be called to remove the listener.
+
+    Must be run within the event loop.
+    """
+    from_state = _process_state_match(from_state)
+    to_state = _process_state_match(to_state)
+
+    if entity_ids == MATCH_ALL:
+        keys = (MATCH_ALL,)
+    elif isinstance(entity_ids, str):
+        keys = (entity_ids.lower(),)
+    else:
+        keys = tuple(set(entity_id.lower() for entity_id in entity_ids))
+
+    @callback
+    def state_change_listener(event):
+        """The listener that listens for specific state changes."""
+        _async_call_if_matches(hass, event, action, from_state, to_state)
+
+    index = _async_get_state_change_index(hass)
+    index.async_add(keys, state_change_listener)
+
+    @callback
+    def async_remove():
+        """Remove the listener from the index."""
+        index.async_remove(keys, state_change_listener)
+
+    return async_remove
+
+
+track_indexed_state_change = threaded_listener_factory(
+    async_track_indexed_state_change)
+
+
+def async_track_indexed_template(hass, template, action):
+    """Track the states a template read through the state change index.
+
+    Same as async_track_template. The tracker is registered in the index
+    for the entities and domains the last render read and moved each time
+    a state change was passed on.
+
+    Returns a function that can be called to remove the listener.
+
+    Must be run within the event loop.
+    """
+    index = _async_get_state_change_index(hass)
+    keys = (MATCH_ALL,)
+
+    @callback
+    def async_update_keys():
+        """Register the tracker for the states of the last render."""
+        nonlocal keys
+        render_info = template.render_info
+
+        if render_info is None or render_info.matches_all:
+            new_keys = (MATCH_ALL,)
         else:
-            new_state = None
+            new_keys = tuple(render_info.entities) + tuple(
+                '{}.*'.format(domain) for domain in render_info.domains)
+
+        if new_keys != keys:
+            index.async_remove(keys, template_change_listener)
+            keys = new_keys
+            index.async_add(keys, template_change_listener)
 
-        if _matcher(old_state, from_state) and _matcher(new_state, to_state):
-            hass.async_run_job(action, event.data.get('entity_id'),
+    @callback
+    def template_change_listener(event):
+        """The listener that listens for state changes of the template."""
+        entity_id = event.data.get('entity_id')
+        render_info = template.render_info
+
+        if render_info is None or render_info.filter(entity_id):
+            hass.async_run_job(action, entity_id,
                                event.data.get('old_state'),
                                event.data.get('new_state'))
 
-    return hass.bus.async_listen(EVENT_STATE_CHANGED, state_change_listener)
+        # Callback actions have rendered the template by now
+        async_update_keys()
 
+    index.async_add(keys, template_change_listener)
+    async_update_keys()
 
-track_state_change = threaded_listener_factory(async_track_state_change)
+    @callback
+    def async_remove():
+        """Remove the listener from the index."""
+        index.async_remove(keys, template_change_listener)
+
+    return async_remove
+
+
+track_indexed_template = threaded_listener_factory(
+    async_track_indexed_template)
 
 
 def async_track_point_in_time(hass, action, point_in_time):
@@ -257,6 +451,25 @@ def async_track_time_change(hass, action, year=None, month=None, day=None,
 track_time_change = threaded_listener_factory(async_track_time_change)
 
 
+@callback
+def _async_call_if_matches(hass, event, action, from_state, to_state):
+    """Call action with a state change if it matches from and to state."""
+    if event.data.get('old_state') is not None:
+        old_state = event.data['old_state'].state
+    else:
+        old_state = None
+
+    if event.data.get('new_state') is not None:
+        new_state = event.data['new_state'].state
+    else:
+        new_state = None
+
+    if _matcher(old_state, from_state) and _matcher(new_state, to_state):
+        hass.async_run_job(action, event.data.get('entity_id'),
+                           event.data.get('old_state'),
+                           event.data.get('new_state'))
+
+
 def _process_state_match(parameter):
     """Wrap parameter in a tuple if it is not one and returns it."""
     if parameter is None or parameter == MATCH_ALL:
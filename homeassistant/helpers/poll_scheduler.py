@@ -0,0 +1,204 @@
+"""Poll entities spread out over time instead of all at once."""
+import asyncio
+from datetime import timedelta
+import heapq
+import itertools
+import random
+import weakref
+
+from homeassistant.core import EXECUTOR_POOL_SIZE, callback
+from homeassistant.helpers.event import async_track_utc_time_change
+import homeassistant.util.dt as dt_util
+
+DATA_POLL_SCHEDULER = 'poll_scheduler'
+
+# Entities without async_update of one platform that are updated at the
+# same time
+POLL_CONCURRENCY = 4
+# Entities without async_update updated at the same time over all
+# platforms, leaving executor workers for other jobs
+POLL_MAX_CONCURRENCY = max(1, EXECUTOR_POOL_SIZE - 5)
+
+# The interval of an entity grows by BACKOFF_FACTOR each time its update
+# failed, or if the platform opted in, did not change its state, up to
+# MAX_BACKOFF times the configured interval
+BACKOFF_FACTOR = 2
+MAX_BACKOFF = 4
+
+
+class _PollEntry(object):
+    """An entity scheduled to be polled."""
+
+    __slots__ = ['entity', 'scan_interval', 'interval', 'logger',
+                 'semaphore', 'backoff', 'active', 'removed']
+
+    def __init__(self, entity, scan_interval, logger, semaphore, backoff):
+        """Initialize the entry."""
+        self.entity = entity
+        self.scan_interval = scan_interval
+        self.interval = scan_interval
+        self.logger = logger
+        self.semaphore = semaphore
+        self.backoff = backoff
+        # Entities that did not poll when added are queued once they do
+        self.active = False
+        self.removed = False
+
+
+class PollScheduler(object):
+    """Poll entities of all platforms from a single queue.
+
+    Each entity gets a random phase within its interval so entities with the
+    same interval are not polled on the same second. Sync updates are
+    limited per platform and overall. The interval of entities whose update
+    fails backs off, as does the interval of entities whose state does not
+    change if their platform asks for it.
+    Entities that do not poll when added are queued once their should_poll
+    is True at one of their state writes.
+    """
+
+    def __init__(self, hass):
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._queue = []
+        self._entries = {}
+        self._counter = itertools.count()
+        self._semaphore = asyncio.Semaphore(POLL_MAX_CONCURRENCY,
+                                            loop=hass.loop)
+        self._platform_semaphores = weakref.WeakKeyDictionary()
+        self._default_semaphore = asyncio.Semaphore(POLL_CONCURRENCY,
+                                                    loop=hass.loop)
+        self._async_unsub_tick = None
+
+    @callback
+    def async_add_entity(self, entity, scan_interval, logger, platform=None,
+                         backoff=False):
+        """Start polling entity every scan_interval seconds.
+
+        Sync updates of entities of the same platform share a limit. If
+        backoff is True, the interval grows while the state does not change.
+
+        This method must be run in the event loop.
+        """
+        if id(entity) in self._entries:
+            return
+
+        if platform is None:
+            semaphore = self._default_semaphore
+        else:
+            semaphore = self._platform_semaphores.get(platform)
+
+            if semaphore is None:
+                semaphore = self._platform_semaphores[platform] = \
+                    asyncio.Semaphore(POLL_CONCURRENCY, loop=self.hass.loop)
+
+        entry = self._entries[id(entity)] = _PollEntry(
+            entity, scan_interval, logger, semaphore, backoff)
+
+        if entity.should_poll:
+            self._async_activate(entry)
+
+    @callback
+    def async_check_entity(self, entity):
+        """Start polling an added entity that started to poll.
+
+        Called on state writes of entities.
+
+        This method must be run in the event loop.
+        """
+        entry = self._entries.get(id(entity))
+
+        if entry is not None and not entry.active and entity.should_poll:
+            self._async_activate(entry)
+
+    @callback
+    def _async_activate(self, entry):
+        """Queue the first poll of entry at a random phase."""
+        entry.active = True
+        self._async_schedule(entry, dt_util.utcnow(),
+                             random.uniform(0, entry.scan_interval))
+
+        if self._async_unsub_tick is None:
+            self._async_unsub_tick = async_track_utc_time_change(
+                self.hass, self._async_tick)
+
+    @callback
+    def async_remove_entity(self, entity):
+        """Stop polling entity.
+
+        This method must be run in the event loop.
+        """
+        entry = self._entries.pop(id(entity), None)
+
+        if entry is not None:
+            entry.removed = True
+
+        if not self._entries and self._async_unsub_tick is not None:
+            self._async_unsub_tick()
+            self._async_unsub_tick = None
+            self._queue.clear()
+
+    @callback
+    def _async_schedule(self, entry, now, delay):
+        """Queue entry to be polled delay seconds after now."""
+        heapq.heappush(self._queue, (now + timedelta(seconds=delay),
+                                     next(self._counter), entry))
+
+    @callback
+    def _async_tick(self, now):
+        """Start polling the entities that are due."""
+        while self._queue and self._queue[0][0] <= now:
+            _, _, entry = heapq.heappop(self._queue)
+
+            if not entry.removed:
+                self.hass.async_add_job(self._async_poll(entry, now))
+
+    @asyncio.coroutine
+    def _async_poll(self, entry, now):
+        """Poll an entity and schedule its next poll."""
+        entity = entry.entity
+
+        if not entity.should_poll:
+            entry.interval = entry.scan_interval
+            self._async_schedule(entry, now, entry.interval)
+            return
+
+        old_state = self.hass.states.get(entity.entity_id)
+
+        try:
+            if hasattr(entity, 'async_update'):
+                yield from entity.async_update_ha_state(True)
+            else:
+                with (yield from entry.semaphore):
+                    with (yield from self._semaphore):
+                        yield from entity.async_update_ha_state(True)
+        except Exception:  # pylint: disable=broad-except
+            entry.logger.exception('Update for %s fails', entity.entity_id)
+            failed = True
+        else:
+            # The state machine keeps the old state if nothing changed
+            failed = False
+            changed = self.hass.states.get(entity.entity_id) is not old_state
+
+        if not failed and (changed or not entry.backoff):
+            entry.interval = entry.scan_interval
+        else:
+            entry.interval = min(entry.interval * BACKOFF_FACTOR,
+                                 entry.scan_interval * MAX_BACKOFF)
+
+        if not entry.removed:
+            self._async_schedule(entry, now, entry.interval)
+
+
+@callback
+def async_get_poll_scheduler(hass):
+    """Return the poll scheduler of hass.
+
+    This method must be run in the event loop.
+    """
+    scheduler = hass.data.get(DATA_POLL_SCHEDULER)
+
+    if scheduler is None:
+        scheduler = hass.data[DATA_POLL_SCHEDULER] = PollScheduler(hass)
+
+    return scheduler
@@ -0,0 +1,121 @@
+"""Keep the last known states to restore them on the next start."""
+import asyncio
+from datetime import datetime
+import json
+import logging
+import os
+
+from homeassistant.const import (
+    EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STOP, STATE_UNAVAILABLE,
+    STATE_UNKNOWN)
+from homeassistant.core import State, callback
+from homeassistant.helpers.event import async_track_utc_time_change
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_RESTORE_CACHE = 'restore_state_cache'
+RESTORE_FILE = '.restore_state.json'
+
+# The states are written every SAVE_INTERVAL minutes and on stop
+SAVE_INTERVAL = 15  # minutes
+
+# States not worth restoring
+SKIP_STATES = (STATE_UNKNOWN, STATE_UNAVAILABLE)
+
+
+def load_restore_cache(path):
+    """Return the states stored at path keyed by entity id.
+
+    This method needs to run in an executor.
+    """
+    if not os.path.isfile(path):
+        return {}
+
+    try:
+        with open(path) as fil:
+            data = json.load(fil)
+    except (OSError, ValueError):
+        _LOGGER.warning('Unable to read restore state file %s', path)
+        return {}
+
+    states = (State.from_dict(state) for state in data)
+    return {state.entity_id: state for state in states if state is not None}
+
+
+def save_restore_cache(path, states):
+    """Write the states to path.
+
+    This method needs to run in an executor.
+    """
+    data = [state for state in states if state.state not in SKIP_STATES]
+    tmp_path = '{}.tmp'.format(path)
+
+    try:
+        with open(tmp_path, 'w') as fil:
+            json.dump(data, fil, default=_json_default)
+        os.replace(tmp_path, path)
+    except (OSError, ValueError):
+        _LOGGER.exception('Unable to write restore state file %s', path)
+
+
+def _json_default(obj):
+    """Convert objects json can not serialize.
+
+    Attributes that can not be converted are stored as their string, a
+    restored state is only a stand-in until the first update.
+    """
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    elif hasattr(obj, 'as_dict'):
+        return obj.as_dict()
+    elif isinstance(obj, (set, tuple, frozenset)):
+        return list(obj)
+
+    return str(obj)
+
+
+@asyncio.coroutine
+def async_setup_restore_state(hass):
+    """Load the states of the last run and keep storing the current ones.
+
+    The states of the last run are available until Home Assistant has
+    started, entities added during the startup can restore them.
+
+    This method is a coroutine.
+    """
+    path = hass.config.path(RESTORE_FILE)
+
+    hass.data[DATA_RESTORE_CACHE] = yield from hass.loop.run_in_executor(
+        None, load_restore_cache, path)
+
+    @callback
+    def async_drop_cache(event):
+        """Forget the states of the last run once started."""
+        hass.data.pop(DATA_RESTORE_CACHE, None)
+
+    @callback
+    def async_save(event_or_now):
+        """Store the current states."""
+        hass.async_add_job(save_restore_cache, path, hass.states.async_all())
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_START, async_drop_cache)
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_save)
+    async_track_utc_time_change(
+        hass, async_save, minute=range(0, 60, SAVE_INTERVAL), second=0)
+
+
+def has_restore_cache(hass):
+    """Return if states of the last run can be restored.
+
+    Async friendly.
+    """
+    return bool(hass.data.get(DATA_RESTORE_CACHE))
+
+
+@callback
+def async_get_last_state(hass, entity_id):
+    """Return the state entity_id had in the last run or None.
+
+    This method must be run in the event loop.
+    """
+    return hass.data.get(DATA_RESTORE_CACHE, {}).get(entity_id)
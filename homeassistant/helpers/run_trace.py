@@ -0,0 +1,174 @@
+"""Record the steps of the last runs of automations and scripts."""
+from collections import deque
+import time
+
+import homeassistant.util.dt as dt_util
+
+DATA_RUN_TRACE = 'run_trace'
+
+
+class _TraceStep(object):
+    """Context manager recording the duration and outcome of a step."""
+
+    __slots__ = ['trace', 'record', '_start']
+
+    def __init__(self, trace, step_type, name):
+        """Initialize the step."""
+        self.trace = trace
+        self.record = {'type': step_type, 'name': name, 'result': None}
+        self._start = None
+
+    def __enter__(self):
+        """Start timing the step, return the record to set the result."""
+        self._start = time.monotonic()
+        return self.record
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Add the step to the trace."""
+        end = time.monotonic()
+        self.record['start'] = _ms(self._start - self.trace.monotonic_start)
+        self.record['duration'] = _ms(end - self._start)
+
+        if exc_type is not None:
+            self.record['error'] = str(exc_value) or exc_type.__name__
+
+        self.trace.steps.append(self.record)
+        return False
+
+
+class RunTrace(object):
+    """The steps of one run of an automation or script."""
+
+    def __init__(self, kind, name, context):
+        """Initialize the trace."""
+        self.kind = kind
+        self.name = name
+        self.context = context
+        self.start = dt_util.utcnow()
+        self.monotonic_start = time.monotonic()
+        self.steps = []
+        self.duration = None
+        self.outcome = None
+
+    def step(self, step_type, name):
+        """Return a context manager that records a step of the run."""
+        return _TraceStep(self, step_type, name)
+
+    def finish(self, outcome):
+        """Record the end of the run, later calls are ignored."""
+        if self.outcome is None:
+            self.outcome = outcome
+            self.duration = _ms(time.monotonic() - self.monotonic_start)
+
+    def as_dict(self):
+        """Return the trace as a dict."""
+        return {
+            'start': self.start.isoformat(),
+            'duration': self.duration,
+            'outcome': self.outcome or 'running',
+            'context': self.context,
+            'steps': list(self.steps),
+        }
+
+
+class _NoopStep(object):
+    """Step used when runs are not traced."""
+
+    __slots__ = []
+
+    def __enter__(self):
+        """Return a record that is thrown away."""
+        return {}
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Do not handle exceptions."""
+        return False
+
+
+class _NoopRunTrace(RunTrace):
+    """Trace used when runs are not traced."""
+
+    def __init__(self):
+        """Initialize the trace."""
+        super().__init__(None, None, {})
+
+    def step(self, step_type, name):
+        """Return a step that records nothing."""
+        return _NOOP_STEP
+
+    def finish(self, outcome):
+        """Do nothing."""
+        pass
+
+
+_NOOP_STEP = _NoopStep()
+NOOP_RUN = _NoopRunTrace()
+
+
+class RunTracer(object):
+    """Keep the traces of the last runs of each automation and script."""
+
+    def __init__(self, runs):
+        """Initialize the tracer."""
+        self.runs = runs
+        self._traces = {}
+
+    def async_start_run(self, kind, name, **context):
+        """Return a new trace for a run of the automation or script name.
+
+        This method must be run in the event loop.
+        """
+        traces = self._traces.get((kind, name))
+
+        if traces is None:
+            traces = self._traces[(kind, name)] = deque(maxlen=self.runs)
+
+        trace = RunTrace(kind, name, context)
+        traces.append(trace)
+        return trace
+
+    def as_dict(self):
+        """Return the traces grouped by kind and name, newest first."""
+        result = {}
+
+        for (kind, name), traces in self._traces.items():
+            result.setdefault(kind, {})[name] = [
+                trace.as_dict() for trace in reversed(traces)]
+
+        return result
+
+
+class _NoopRunTracer(RunTracer):
+    """Tracer used when runs are not traced."""
+
+    def __init__(self):
+        """Initialize the tracer."""
+        super().__init__(0)
+
+    def async_start_run(self, kind, name, **context):
+        """Return a trace that records nothing."""
+        return NOOP_RUN
+
+
+NOOP_TRACER = _NoopRunTracer()
+
+
+def get_tracer(hass):
+    """Return the run tracer of hass.
+
+    Runs are traced if the trace_runs core option is set.
+    Async friendly.
+    """
+    tracer = hass.data.get(DATA_RUN_TRACE)
+
+    if tracer is None:
+        runs = hass.config.trace_runs
+        tracer = hass.data[DATA_RUN_TRACE] = \
+            RunTracer(runs) if runs else NOOP_TRACER
+
+    return tracer
+
+
+def _ms(seconds):
+    """Return seconds in milliseconds."""
+    return round(seconds * 1000, 3)
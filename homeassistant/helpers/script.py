@@ -1,5 +1,6 @@
 """Helpers to execute scripts."""
 import asyncio
+from collections import deque
 import logging
 from itertools import islice
 from typing import Optional, Sequence
@@ -9,7 +10,7 @@ import voluptuous as vol
 from homeassistant.core import HomeAssistant
 from homeassistant.const import CONF_CONDITION
 from homeassistant.helpers import (
-    service, condition, template, config_validation as cv)
+    service, condition, template, run_trace, config_validation as cv)
 from homeassistant.helpers.event import async_track_point_in_utc_time
 from homeassistant.helpers.typing import ConfigType
 import homeassistant.util.dt as date_util
@@ -25,6 +26,20 @@ CONF_SEQUENCE = "sequence"
 CONF_EVENT = "event"
 CONF_EVENT_DATA = "event_data"
 CONF_DELAY = "delay"
+CONF_PARALLEL = "parallel"
+
+# What happens when a running script is run again: continue the running
+# script where it waits for a delay, stop it and run again, run after the
+# runs before are done or run alongside the running script
+MODE_CONTINUE = 'continue'
+MODE_RESTART = 'restart'
+MODE_QUEUED = 'queued'
+MODE_PARALLEL = 'parallel'
+RUN_MODES = (MODE_CONTINUE, MODE_RESTART, MODE_QUEUED, MODE_PARALLEL)
+
+# Runs waiting in the queue of a queued script or running at the same time
+# of a parallel script
+DEFAULT_MAX_RUNS = 10
 
 
 def call_from_config(hass: HomeAssistant, config: ConfigType,
@@ -37,25 +52,28 @@ class Script():
     """Representation of a script."""
 
     def __init__(self, hass: HomeAssistant, sequence, name: str=None,
-                 change_listener=None) -> None:
+                 change_listener=None, mode: str=MODE_CONTINUE,
+                 max_runs: int=DEFAULT_MAX_RUNS) -> None:
         """Initialize the script."""
         self.hass = hass
         self.sequence = sequence
         template.attach(hass, self.sequence)
         self.name = name
+        self.mode = mode
+        self.max_runs = max_runs
         self._change_listener = change_listener
-        self._cur = -1
+        self._runs = []
+        self._queue = deque()
         self.last_action = None
         self.can_cancel = any(CONF_DELAY in action for action
                               in self.sequence)
-        self._async_unsub_delay_listener = None
         self._template_cache = {}
         self._config_cache = {}
 
     @property
     def is_running(self) -> bool:
         """Return true if script is on."""
-        return self._cur != -1
+        return bool(self._runs)
 
     def run(self, variables=None):
         """Run script."""
@@ -63,61 +81,57 @@ class Script():
             self.async_run(variables), self.hass.loop).result()
 
     @asyncio.coroutine
-    def async_run(self, variables: Optional[Sequence]=None) -> None:
+    def async_run(self, variables: Optional[Sequence]=None,
+                  trace=None) -> None:
         """Run script.
 
+        If the script is running already, what happens depends on the
+        mode of the script. Queued and parallel scripts drop runs beyond
+        max_runs.
+
+        The steps are recorded in trace if given, else in a new trace of
+        the script if runs are traced.
+
         This method is a coroutine.
         """
-        if self._cur == -1:
-            self._log('Running script')
-            self._cur = 0
+        if self._runs and self.mode == MODE_CONTINUE:
+            run = self._runs[0]
 
-        # Unregister callback if we were in a delay but turn on is called
-        # again. In that case we just continue execution.
-        self._async_remove_listener()
+            if trace is not None and trace is not run.trace:
+                trace.finish('already running')
 
-        for cur, action in islice(enumerate(self.sequence), self._cur,
-                                  None):
-
-            if CONF_DELAY in action:
-                # Call ourselves in the future to continue work
-                @asyncio.coroutine
-                def script_delay(now):
-                    """Called after delay is done."""
-                    self._async_unsub_delay_listener = None
-                    self.hass.async_add_job(self.async_run(variables))
-
-                delay = action[CONF_DELAY]
-
-                if isinstance(delay, template.Template):
-                    delay = vol.All(
-                        cv.time_period,
-                        cv.positive_timedelta)(
-                            delay.async_render(variables))
-
-                self._async_unsub_delay_listener = \
-                    async_track_point_in_utc_time(
-                        self.hass, script_delay,
-                        date_util.utcnow() + delay)
-                self._cur = cur + 1
-                if self._change_listener:
-                    self.hass.async_add_job(self._change_listener)
-                return
+            # Continue with the new variables, skipping a running delay
+            run.variables = variables
+            yield from run.async_run()
+            return
 
-            elif CONF_CONDITION in action:
-                if not self._async_check_condition(action, variables):
-                    break
+        if self._runs and self.mode == MODE_RESTART:
+            self._async_stop_runs('restarted')
 
-            elif CONF_EVENT in action:
-                self._async_fire_event(action)
+        if trace is None and self.name is not None:
+            trace = run_trace.get_tracer(self.hass).async_start_run(
+                'script', self.name)
 
-            else:
-                yield from self._async_call_service(action, variables)
+        run = _ScriptRun(self, variables, trace or run_trace.NOOP_RUN)
 
-        self._cur = -1
-        self.last_action = None
-        if self._change_listener:
-            self.hass.async_add_job(self._change_listener)
+        if self._runs and self.mode == MODE_QUEUED:
+            if len(self._queue) >= self.max_runs:
+                self._log('Queue full, not running script', logging.WARNING)
+                run.trace.finish('queue full')
+                return
+
+            self._queue.append(run)
+            return
+
+        if self.mode == MODE_PARALLEL and len(self._runs) >= self.max_runs:
+            self._log('Running {} times already, not running script'.format(
+                len(self._runs)), logging.WARNING)
+            run.trace.finish('too many runs')
+            return
+
+        self._runs.append(run)
+        self._log('Running script')
+        yield from run.async_run()
 
     def stop(self) -> None:
         """Stop running script."""
@@ -125,43 +139,210 @@ class Script():
 
     def async_stop(self) -> None:
         """Stop running script."""
-        if self._cur == -1:
+        if not self._runs:
             return
 
-        self._cur = -1
-        self._async_remove_listener()
+        self._async_stop_runs('stopped')
+        self.last_action = None
         if self._change_listener:
             self.hass.async_add_job(self._change_listener)
 
+    def _async_stop_runs(self, outcome):
+        """Stop the running and queued runs."""
+        for run in self._runs + list(self._queue):
+            run.async_stop(outcome)
+
+        self._runs.clear()
+        self._queue.clear()
+
+    def _async_run_done(self, run):
+        """Remove a finished run and start the next queued run."""
+        if run not in self._runs:
+            return
+
+        self._runs.remove(run)
+
+        if self._queue:
+            run = self._queue.popleft()
+            self._runs.append(run)
+            self._log('Running queued script')
+            self.hass.async_add_job(run.async_run())
+        elif not self._runs:
+            self.last_action = None
+
+        if self._change_listener:
+            self.hass.async_add_job(self._change_listener)
+
+    def _async_get_condition(self, action):
+        """Return the condition of a condition action."""
+        config_cache_key = frozenset((k, str(v)) for k, v in action.items())
+        config = self._config_cache.get(config_cache_key)
+        if not config:
+            config = condition.async_from_config(action, False)
+            self._config_cache[config_cache_key] = config
+
+        return config
+
+    def _log(self, msg, level=logging.INFO):
+        """Logger helper."""
+        if self.name is not None:
+            msg = "Script {}: {}".format(self.name, msg)
+
+        _LOGGER.log(level, msg)
+
+
+class _ScriptRun(object):
+    """A run of a script that is continued after each delay."""
+
+    # pylint: disable=protected-access
+
+    def __init__(self, script, variables, trace):
+        """Initialize the run."""
+        self.script = script
+        self.hass = script.hass
+        self.variables = variables
+        self.trace = trace
+        self.stopped = False
+        self._cur = 0
+        self._async_unsub_delay_listener = None
+
     @asyncio.coroutine
-    def _async_call_service(self, action, variables):
+    def async_run(self):
+        """Run the actions from the current one till a delay or the end.
+
+        This method is a coroutine.
+        """
+        # Unregister callback if we were in a delay but turn on is called
+        # again. In that case we just continue execution.
+        self._async_remove_listener()
+        outcome = 'finished'
+
+        try:
+            for cur, action in islice(enumerate(self.script.sequence),
+                                      self._cur, None):
+                if self.stopped:
+                    return
+
+                if CONF_DELAY in action:
+                    self._async_start_delay(cur, action)
+                    return
+
+                elif CONF_CONDITION in action:
+                    if not self._async_check_condition(action):
+                        outcome = 'condition'
+                        break
+
+                elif CONF_EVENT in action:
+                    self._async_fire_event(action)
+
+                elif CONF_PARALLEL in action:
+                    yield from self._async_call_parallel(action)
+
+                else:
+                    yield from self._async_call_service(action)
+        except Exception:
+            self.trace.finish('error')
+            self.script._async_run_done(self)
+            raise
+
+        if not self.stopped:
+            self.trace.finish(outcome)
+            self.script._async_run_done(self)
+
+    def async_stop(self, outcome):
+        """Stop the run."""
+        self.stopped = True
+        self.trace.finish(outcome)
+        self._async_remove_listener()
+
+    def _async_start_delay(self, cur, action):
+        """Continue the run with the action after cur after a delay."""
+        # Call ourselves in the future to continue work
+        @asyncio.coroutine
+        def script_delay(now):
+            """Called after delay is done."""
+            self._async_unsub_delay_listener = None
+            self.hass.async_add_job(self.async_run())
+
+        with self.trace.step(
+                'delay', action.get(CONF_ALIAS, 'delay')) as step:
+            delay = action[CONF_DELAY]
+
+            if isinstance(delay, template.Template):
+                delay = vol.All(
+                    cv.time_period,
+                    cv.positive_timedelta)(
+                        delay.async_render(self.variables))
+
+            step['result'] = str(delay)
+
+        self._async_unsub_delay_listener = \
+            async_track_point_in_utc_time(
+                self.hass, script_delay,
+                date_util.utcnow() + delay)
+        self._cur = cur + 1
+        if self.script._change_listener:
+            self.hass.async_add_job(self.script._change_listener)
+
+    @asyncio.coroutine
+    def _async_call_service(self, action):
         """Call the service specified in the action.
 
         This method is a coroutine.
         """
-        self.last_action = action.get(CONF_ALIAS, 'call service')
-        self._log("Executing step %s" % self.last_action)
-        yield from service.async_call_from_config(
-            self.hass, action, True, variables, validate_config=False)
+        self.script.last_action = action.get(CONF_ALIAS, 'call service')
+        self.script._log("Executing step %s" % self.script.last_action)
+        yield from self._async_service_step(action)
+
+    @asyncio.coroutine
+    def _async_call_parallel(self, action):
+        """Call the services of a parallel action at the same time.
+
+        This method is a coroutine.
+        """
+        self.script.last_action = action.get(CONF_ALIAS, 'parallel')
+        self.script._log("Executing step %s" % self.script.last_action)
+
+        with self.trace.step('parallel', self.script.last_action) as step:
+            yield from asyncio.gather(*(
+                self._async_service_step(call)
+                for call in action[CONF_PARALLEL]), loop=self.hass.loop)
+            step['result'] = 'done'
+
+    @asyncio.coroutine
+    def _async_service_step(self, action):
+        """Call a service and wait till it is done.
+
+        This method is a coroutine.
+        """
+        with self.trace.step(
+                'service', action.get(CONF_ALIAS, 'call service')) as step:
+            yield from service.async_call_from_config(
+                self.hass, action, True, self.variables,
+                validate_config=False)
+            step['result'] = 'done'
 
     def _async_fire_event(self, action):
         """Fire an event."""
-        self.last_action = action.get(CONF_ALIAS, action[CONF_EVENT])
-        self._log("Executing step %s" % self.last_action)
-        self.hass.bus.async_fire(action[CONF_EVENT],
-                                 action.get(CONF_EVENT_DATA))
+        self.script.last_action = action.get(CONF_ALIAS, action[CONF_EVENT])
+        self.script._log("Executing step %s" % self.script.last_action)
 
-    def _async_check_condition(self, action, variables):
+        with self.trace.step('event', self.script.last_action) as step:
+            self.hass.bus.async_fire(action[CONF_EVENT],
+                                     action.get(CONF_EVENT_DATA))
+            step['result'] = 'fired'
+
+    def _async_check_condition(self, action):
         """Test if condition is matching."""
-        config_cache_key = frozenset((k, str(v)) for k, v in action.items())
-        config = self._config_cache.get(config_cache_key)
-        if not config:
-            config = condition.async_from_config(action, False)
-            self._config_cache[config_cache_key] = config
+        config = self.script._async_get_condition(action)
+        self.script.last_action = action.get(
+            CONF_ALIAS, action[CONF_CONDITION])
+
+        with self.trace.step('condition', self.script.last_action) as step:
+            check = step['result'] = config(self.hass, self.variables)
 
-        self.last_action = action.get(CONF_ALIAS, action[CONF_CONDITION])
-        check = config(self.hass, variables)
-        self._log("Test condition {}: {}".format(self.last_action, check))
+        self.script._log("Test condition {}: {}".format(
+            self.script.last_action, check))
         return check
 
     def _async_remove_listener(self):
@@ -169,10 +350,3 @@ class Script():
         if self._async_unsub_delay_listener:
             self._async_unsub_delay_listener()
             self._async_unsub_delay_listener = None
-
-    def _log(self, msg):
-        """Logger helper."""
-        if self.name is not None:
-            msg = "Script {}: {}".format(self.name, msg)
-
-        _LOGGER.info(msg)
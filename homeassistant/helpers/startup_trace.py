@@ -0,0 +1,184 @@
+"""Record where the time goes while Home Assistant starts."""
+import cProfile
+from contextlib import contextmanager
+import io
+import json
+import logging
+import pstats
+import threading
+import time
+
+from homeassistant.const import EVENT_HOMEASSISTANT_START
+from homeassistant.core import callback
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_STARTUP_TRACE = 'startup_trace'
+TRACE_FILE = 'startup_trace.json'
+
+# Number of functions kept of each component profile
+PROFILE_LINES = 25
+
+
+class StartupTracer(object):
+    """Collect timed spans of the startup in the Chrome trace format."""
+
+    def __init__(self, profile=False):
+        """Initialize the tracer."""
+        self.profile = profile
+        self.profiles = {}
+        self.events = []
+        self.finished = False
+        self._start = time.time()
+
+    @contextmanager
+    def span(self, category, name, **args):
+        """Record the time spent in the with block.
+
+        Async friendly.
+        """
+        if self.finished:
+            yield
+            return
+
+        start = time.time()
+        try:
+            yield
+        finally:
+            self._add_event(category, name, start, args)
+
+    def run_profiled(self, name, target, *args):
+        """Run target, recording a cProfile report for name if enabled.
+
+        Runs in the thread that calls it.
+        """
+        if not self.profile or self.finished:
+            return target(*args)
+
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(target, *args)
+        finally:
+            self._add_profile(name, profiler)
+
+    @contextmanager
+    def profiled(self, name):
+        """Record a cProfile report of the with block if enabled.
+
+        Only meaningful if nothing else runs in the meantime on this thread,
+        which is why components are set up one by one while profiling.
+
+        This method must be run in the event loop.
+        """
+        if not self.profile or self.finished:
+            yield
+            return
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            self._add_profile(name, profiler)
+
+    def finish(self):
+        """Stop tracing and record the total startup time.
+
+        Async friendly.
+        """
+        if self.finished:
+            return
+
+        self._add_event('startup', 'startup', self._start, {})
+        self.finished = True
+
+    def _add_event(self, category, name, start, args):
+        """Add a complete event that started at start and ends now."""
+        # list.append is atomic, spans end in the loop and in executors
+        self.events.append({
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': int((start - self._start) * 1000000),
+            'dur': int((time.time() - start) * 1000000),
+            'pid': 1,
+            'tid': threading.get_ident(),
+            'args': args,
+        })
+
+    def _add_profile(self, name, profiler):
+        """Store the report of a profiler."""
+        out = io.StringIO()
+        stats = pstats.Stats(profiler, stream=out)
+        stats.sort_stats('cumulative').print_stats(PROFILE_LINES)
+        self.profiles[name] = out.getvalue()
+
+    def as_dict(self):
+        """Return the trace in the Chrome trace event format."""
+        return {
+            'traceEvents': list(self.events),
+            'displayTimeUnit': 'ms',
+            'otherData': {
+                'finished': self.finished,
+                'profiles': self.profiles,
+            },
+        }
+
+    def save(self, path):
+        """Write the trace to a file.
+
+        This method needs to run in an executor.
+        """
+        try:
+            with open(path, 'w') as fil:
+                json.dump(self.as_dict(), fil)
+        except OSError:
+            _LOGGER.exception('Unable to write startup trace %s', path)
+
+
+class _NoopTracer(StartupTracer):
+    """Tracer used when startup is not traced."""
+
+    def __init__(self):
+        """Initialize the tracer."""
+        super().__init__()
+        self.finished = True
+
+
+NOOP_TRACER = _NoopTracer()
+
+
+def get_tracer(hass):
+    """Return the startup tracer of hass.
+
+    Async friendly.
+    """
+    return hass.data.get(DATA_STARTUP_TRACE, NOOP_TRACER)
+
+
+@callback
+def async_setup_tracer(hass, profile=False):
+    """Start tracing the startup of hass.
+
+    Tracing ends when Home Assistant has started. If the startup is
+    profiled the trace is then written to TRACE_FILE in the config dir,
+    otherwise it is only available from the API.
+
+    This method must be run in the event loop.
+    """
+    tracer = hass.data.get(DATA_STARTUP_TRACE)
+    if tracer is not None:
+        return tracer
+
+    tracer = hass.data[DATA_STARTUP_TRACE] = StartupTracer(profile)
+
+    @callback
+    def async_finish(event):
+        """Stop tracing and write the trace if profiling."""
+        tracer.finish()
+        if tracer.profile:
+            hass.async_add_job(tracer.save, hass.config.path(TRACE_FILE))
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_START, async_finish)
+    return tracer
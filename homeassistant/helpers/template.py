@@ -1,8 +1,10 @@
 """Template helper methods for rendering strings with HA data."""
+from collections import OrderedDict
 from datetime import datetime
 import json
 import logging
 import re
+import threading
 
 import jinja2
 from jinja2.sandbox import ImmutableSandboxedEnvironment
@@ -26,6 +28,150 @@ _RE_GET_ENTITIES = re.compile(
     re.I | re.M
 )
 
+_RE_TEMPLATE_SYNTAX = re.compile(r"\{[{%#]")
+_RE_SIMPLE_TEMPLATE = re.compile(
+    r"^\s*\{\{\s*(value|value_json)((?:\.[a-zA-Z_]\w*|\[\d+\])*)\s*"
+    r"(?:\|\s*([a-zA-Z_]\w*)\s*(?:\(([\d.,\s-]*)\))?\s*)?\}\}\s*$")
+_RE_PATH_SEGMENT = re.compile(r"\.([a-zA-Z_]\w*)|\[(\d+)\]")
+
+# Render info of the template being rendered in this thread
+_RENDER_INFO = threading.local()
+
+# Compiled code of the most recently used template sources
+COMPILE_CACHE_SIZE = 512
+_COMPILE_CACHE = OrderedDict()
+_COMPILE_CACHE_LOCK = threading.Lock()
+_COMPILE_CACHE_STATS = {'hits': 0, 'misses': 0}
+
+
+def compile_template(source):
+    """Return the compiled code of a template source.
+
+    Templates with the same source share their compiled code. The code of
+    the COMPILE_CACHE_SIZE most recently used sources is kept.
+    Async friendly.
+    """
+    with _COMPILE_CACHE_LOCK:
+        code = _COMPILE_CACHE.get(source)
+
+        if code is not None:
+            _COMPILE_CACHE.move_to_end(source)
+            _COMPILE_CACHE_STATS['hits'] += 1
+            return code
+
+        _COMPILE_CACHE_STATS['misses'] += 1
+
+    # Compile outside the lock, a source compiled twice is harmless
+    code = ENV.compile(source)
+
+    with _COMPILE_CACHE_LOCK:
+        _COMPILE_CACHE[source] = code
+
+        while len(_COMPILE_CACHE) > COMPILE_CACHE_SIZE:
+            _COMPILE_CACHE.popitem(last=False)
+
+    return code
+
+
+def compile_cache_info():
+    """Return the hits, misses and size of the compiled template cache."""
+    with _COMPILE_CACHE_LOCK:
+        return dict(_COMPILE_CACHE_STATS, size=len(_COMPILE_CACHE))
+
+
+def clear_compile_cache():
+    """Empty the compiled template cache and reset its stats."""
+    with _COMPILE_CACHE_LOCK:
+        _COMPILE_CACHE.clear()
+        _COMPILE_CACHE_STATS['hits'] = _COMPILE_CACHE_STATS['misses'] = 0
+
+
+class SimpleTemplate(object):
+    """Evaluate a template that only reads a path of value or value_json.
+
+    Templates like {{ value_json.temperature }} or {{ value | float }} are
+    rendered without Jinja. Anything the evaluator can not render exactly
+    like Jinja, like a missing key, is left to Jinja.
+    """
+
+    __slots__ = ['variable', 'path', 'filter', 'args']
+
+    def __init__(self, variable, path, filter_func=None, args=()):
+        """Initialize the simple template."""
+        self.variable = variable
+        self.path = path
+        self.filter = filter_func
+        self.args = args
+
+    def render(self, value):
+        """Render the template, return _SENTINEL if Jinja is needed."""
+        if self.variable == 'value_json':
+            try:
+                obj = json.loads(value)
+            except ValueError:
+                return _SENTINEL
+        else:
+            obj = value
+
+        for key in self.path:
+            if isinstance(key, int):
+                if not isinstance(obj, list) or key >= len(obj):
+                    return _SENTINEL
+            # Jinja prefers attributes like dict.items over keys
+            elif (not isinstance(obj, dict) or key not in obj or
+                  hasattr(obj, key)):
+                return _SENTINEL
+
+            obj = obj[key]
+
+        if self.filter is not None:
+            try:
+                obj = self.filter(obj, *self.args)
+            except Exception:  # pylint: disable=broad-except
+                return _SENTINEL
+
+        return str(obj).strip()
+
+
+def parse_simple_template(source):
+    """Return a SimpleTemplate for source or None if it is not simple."""
+    match = _RE_SIMPLE_TEMPLATE.match(source)
+
+    if match is None:
+        return None
+
+    variable, path, filter_name, args = match.groups()
+    path = tuple(int(index) if index else key
+                 for key, index in _RE_PATH_SEGMENT.findall(path))
+
+    if filter_name is None:
+        return SimpleTemplate(variable, path)
+
+    filter_func = ENV.filters.get(filter_name)
+
+    if filter_func is None or any(
+            getattr(filter_func, flag, False) for flag in
+            ('contextfilter', 'evalcontextfilter', 'environmentfilter')):
+        return None
+
+    try:
+        args = tuple(_parse_number(arg) for arg in args.split(',')) \
+            if args and args.strip() else ()
+    except ValueError:
+        return None
+
+    return SimpleTemplate(variable, path, filter_func, args)
+
+
+def _parse_number(value):
+    """Parse an int or float literal."""
+    value = value.strip()
+
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
 
 def attach(hass, obj):
     """Recursively attach hass to all template instances in list and dict."""
@@ -50,6 +196,51 @@ def extract_entities(template):
     return MATCH_ALL
 
 
+class RenderInfo(object):
+    """Entities and domains of the states read while rendering a template."""
+
+    def __init__(self):
+        """Initialize the render info."""
+        self.entities = set()
+        self.domains = set()
+        self.all_states = False
+
+    @property
+    def matches_all(self):
+        """Return if a change of any entity may change the result.
+
+        Templates that read no states, like those using now(), are
+        rendered again on every state change.
+        """
+        return self.all_states or not (self.entities or self.domains)
+
+    def filter(self, entity_id):
+        """Return if a change of entity_id may change the result."""
+        return (self.matches_all or entity_id in self.entities or
+                entity_id.split('.', 1)[0] in self.domains)
+
+
+def _collect_entity(entity_id):
+    """Record that the template being rendered read entity_id."""
+    info = getattr(_RENDER_INFO, 'info', None)
+    if info is not None:
+        info.entities.add(entity_id.lower())
+
+
+def _collect_domain(domain):
+    """Record that the template being rendered read a whole domain."""
+    info = getattr(_RENDER_INFO, 'info', None)
+    if info is not None:
+        info.domains.add(domain.lower())
+
+
+def _collect_all_states():
+    """Record that the template being rendered read all states."""
+    info = getattr(_RENDER_INFO, 'info', None)
+    if info is not None:
+        info.all_states = True
+
+
 class Template(object):
     """Class to hold a template and manage caching and rendering."""
 
@@ -61,7 +252,12 @@ class Template(object):
         self.template = template
         self._compiled_code = None
         self._compiled = None
+        # The result of templates without template syntax
+        self._static = None
+        self._simple = None
         self.hass = hass
+        # The states read by the last async_render, None if not rendered
+        self.render_info = None  # type: RenderInfo
 
     def ensure_valid(self):
         """Return if template is valid."""
@@ -69,10 +265,15 @@ class Template(object):
             return
 
         try:
-            self._compiled_code = ENV.compile(self.template)
+            self._compiled_code = compile_template(self.template)
         except jinja2.exceptions.TemplateSyntaxError as err:
             raise TemplateError(err)
 
+        if not _RE_TEMPLATE_SYNTAX.search(self.template):
+            self._static = self.template.strip()
+        else:
+            self._simple = parse_simple_template(self.template)
+
     def extract_entities(self):
         """Extract all entities for state_changed listener."""
         return extract_entities(self.template)
@@ -90,15 +291,28 @@ class Template(object):
 
         This method must be run in the event loop.
         """
+        self.ensure_valid()
+
+        if self._static is not None:
+            self.render_info = RenderInfo()
+            return self._static
+
         self._ensure_compiled()
 
         if variables is not None:
             kwargs.update(variables)
 
+        info = RenderInfo()
+        previous_info = getattr(_RENDER_INFO, 'info', None)
+        _RENDER_INFO.info = info
+
         try:
             return self._compiled.render(kwargs).strip()
         except jinja2.TemplateError as err:
             raise TemplateError(err)
+        finally:
+            _RENDER_INFO.info = previous_info
+            self.render_info = info
 
     def render_with_possible_json_value(self, value, error_value=_SENTINEL):
         """Render template with value exposed.
@@ -118,6 +332,17 @@ class Template(object):
 
         This method must be run in the event loop.
         """
+        self.ensure_valid()
+
+        if self._static is not None:
+            return self._static
+
+        if self._simple is not None:
+            result = self._simple.render(value)
+
+            if result is not _SENTINEL:
+                return result
+
         self._ensure_compiled()
 
         variables = {
@@ -145,12 +370,23 @@ class Template(object):
         assert self.hass is not None, 'hass variable not set on template'
 
         location_methods = LocationMethods(self.hass)
+        states = self.hass.states
+
+        def is_state(entity_id, state):
+            """Test if entity_id has the given state."""
+            _collect_entity(entity_id)
+            return states.is_state(entity_id, state)
+
+        def is_state_attr(entity_id, name, value):
+            """Test if entity_id has an attribute with the given value."""
+            _collect_entity(entity_id)
+            return states.is_state_attr(entity_id, name, value)
 
         global_vars = ENV.make_globals({
             'closest': location_methods.closest,
             'distance': location_methods.distance,
-            'is_state': self.hass.states.is_state,
-            'is_state_attr': self.hass.states.is_state_attr,
+            'is_state': is_state,
+            'is_state_attr': is_state_attr,
             'states': AllStates(self.hass),
         })
 
@@ -179,11 +415,13 @@ class AllStates(object):
 
     def __iter__(self):
         """Return all states."""
+        _collect_all_states()
         return iter(sorted(self._hass.states.async_all(),
                            key=lambda state: state.entity_id))
 
     def __call__(self, entity_id):
         """Return the states."""
+        _collect_entity(entity_id)
         state = self._hass.states.get(entity_id)
         return STATE_UNKNOWN if state is None else state.state
 
@@ -198,10 +436,13 @@ class DomainStates(object):
 
     def __getattr__(self, name):
         """Return the states."""
-        return self._hass.states.get('{}.{}'.format(self._domain, name))
+        entity_id = '{}.{}'.format(self._domain, name)
+        _collect_entity(entity_id)
+        return self._hass.states.get(entity_id)
 
     def __iter__(self):
         """Return the iteration over all the states."""
+        _collect_domain(self._domain)
         return iter(sorted(
             (state for state in self._hass.states.async_all()
              if state.domain == self._domain),
@@ -272,9 +513,14 @@ class LocationMethods(object):
                 gr_entity_id = str(entities)
 
             group = get_component('group')
+            entity_ids = group.expand_entity_ids(self._hass, [gr_entity_id])
+
+            _collect_entity(gr_entity_id)
+            for entity_id in entity_ids:
+                _collect_entity(entity_id)
 
-            states = [self._hass.states.get(entity_id) for entity_id
-                      in group.expand_entity_ids(self._hass, [gr_entity_id])]
+            states = [self._hass.states.get(entity_id)
+                      for entity_id in entity_ids]
 
         return loc_helper.closest(latitude, longitude, states)
 
@@ -331,6 +577,7 @@ class LocationMethods(object):
         if isinstance(entity_id_or_state, State):
             return entity_id_or_state
         elif isinstance(entity_id_or_state, str):
+            _collect_entity(entity_id_or_state)
             return self._hass.states.get(entity_id_or_state)
         return None
 
@@ -10,11 +10,14 @@ call get_component('switch.your_platform'). In both cases the config directory
 is checked to see if it contains a user provided version. If not available it
 will check the built-in components and platforms.
 """
+import ast
 import importlib
+import json
 import logging
 import os
 import pkgutil
 import sys
+import threading
 
 from types import ModuleType
 # pylint: disable=unused-import
@@ -36,6 +39,12 @@ AVAILABLE_COMPONENTS = []  # type: List[str]
 # Dict of loaded components mapped name => module
 _COMPONENT_CACHE = {}  # type: Dict[str, ModuleType]
 
+# Metadata of components read from their source, kept in the config dir
+MANIFEST_FILENAME = '.components_manifest.json'
+_MANIFEST = {}  # type: Dict[str, Dict]
+_MANIFEST_LOCK = threading.Lock()
+_MANIFEST_STATE = {'path': None, 'custom_path': None, 'dirty': False}
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -80,6 +89,10 @@ def prepare(hass: 'HomeAssistant'):
                 AVAILABLE_COMPONENTS.append(
                     'custom_components.{}'.format(fil[0:-3]))
 
+    _MANIFEST_STATE['custom_path'] = custom_path
+    _MANIFEST_STATE['path'] = hass.config.path(MANIFEST_FILENAME)
+    _load_manifest()
+
     PREPARED = True
 
 
@@ -168,6 +181,147 @@ def get_component(comp_name) -> Optional[ModuleType]:
     return None
 
 
+def get_component_metadata(comp_name: str) -> Optional[Dict]:
+    """Return the dependencies and requirements of a component.
+
+    The metadata is read from the source of the component without importing
+    it and cached in the manifest. Components that are already loaded or
+    whose metadata is not a literal are imported instead.
+
+    Returns a dict with the keys dependencies, requirements and async_setup
+    or None if the component could not be found.
+
+    Async friendly.
+    """
+    if comp_name not in _COMPONENT_CACHE:
+        path = _find_source(comp_name)
+        metadata = _source_metadata(comp_name, path) if path else None
+
+        if metadata is not None:
+            return metadata
+
+    component = get_component(comp_name)
+
+    if component is None:
+        return None
+
+    return {
+        'dependencies': list(getattr(component, 'DEPENDENCIES', [])),
+        'requirements': list(getattr(component, 'REQUIREMENTS', [])),
+        'async_setup': hasattr(component, 'async_setup'),
+    }
+
+
+def save_manifest() -> None:
+    """Write the component manifest if it changed.
+
+    This method needs to run in an executor.
+    """
+    path = _MANIFEST_STATE['path']
+
+    with _MANIFEST_LOCK:
+        if path is None or not _MANIFEST_STATE['dirty']:
+            return
+        data = dict(_MANIFEST)
+        _MANIFEST_STATE['dirty'] = False
+
+    try:
+        with open(path, 'w') as fil:
+            json.dump(data, fil)
+    except OSError:
+        _LOGGER.exception('Unable to write component manifest %s', path)
+
+
+def _load_manifest() -> None:
+    """Load the component manifest from the config dir."""
+    try:
+        with open(_MANIFEST_STATE['path']) as fil:
+            data = json.load(fil)
+    except (OSError, ValueError):
+        data = {}
+
+    with _MANIFEST_LOCK:
+        _MANIFEST.clear()
+        if isinstance(data, dict):
+            _MANIFEST.update(data)
+        _MANIFEST_STATE['dirty'] = False
+
+
+def _find_source(comp_name: str) -> Optional[str]:
+    """Return the source file that get_component would import.
+
+    Async friendly.
+    """
+    import homeassistant.components as components
+
+    parts = comp_name.split('.')
+    roots = [('homeassistant.components', components.__path__[0])]
+    if _MANIFEST_STATE['custom_path'] is not None:
+        roots.insert(0, ('custom_components', _MANIFEST_STATE['custom_path']))
+
+    for package, base in roots:
+        if '{}.{}'.format(package, parts[0]) not in AVAILABLE_COMPONENTS:
+            continue
+
+        path = os.path.join(base, *parts)
+        for source in (path + '.py', os.path.join(path, '__init__.py')):
+            if os.path.isfile(source):
+                return source
+
+    return None
+
+
+def _source_metadata(comp_name: str, path: str) -> Optional[Dict]:
+    """Return the metadata of a component from its source file.
+
+    Returns None if the metadata cannot be read without importing it.
+    Async friendly.
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+
+    with _MANIFEST_LOCK:
+        entry = _MANIFEST.get(comp_name)
+
+    if entry is not None and entry.get('path') == path and \
+       entry.get('mtime') == mtime:
+        return entry
+
+    try:
+        with open(path, encoding='utf-8') as fil:
+            tree = ast.parse(fil.read(), path)
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+    entry = {'path': path, 'mtime': mtime, 'dependencies': [],
+             'requirements': [], 'async_setup': False}
+
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name == 'async_setup':
+            entry['async_setup'] = True
+            continue
+        elif not isinstance(node, ast.Assign):
+            continue
+
+        for target in node.targets:
+            if not isinstance(target, ast.Name) or \
+               target.id not in ('DEPENDENCIES', 'REQUIREMENTS'):
+                continue
+            try:
+                entry[target.id.lower()] = list(ast.literal_eval(node.value))
+            except ValueError:
+                # Not a literal, for example a constant of another module
+                return None
+
+    with _MANIFEST_LOCK:
+        _MANIFEST[comp_name] = entry
+        _MANIFEST_STATE['dirty'] = True
+
+    return entry
+
+
 def load_order_components(components: Sequence[str]) -> OrderedSet:
     """Take in a list of components we want to load.
 
@@ -217,15 +371,15 @@ def _load_order_component(comp_name: str, load_order: OrderedSet,
 
     Async friendly.
     """
-    component = get_component(comp_name)
+    metadata = get_component_metadata(comp_name)
 
     # If None it does not exist, error already thrown by get_component.
-    if component is None:
+    if metadata is None:
         return OrderedSet()
 
     loading.add(comp_name)
 
-    for dependency in getattr(component, 'DEPENDENCIES', []):
+    for dependency in metadata['dependencies']:
         # Check not already loaded
         if dependency in load_order:
             continue
@@ -8,9 +8,11 @@ For more details about the Python API, please refer to the documentation at
 https://home-assistant.io/developers/python_api/
 """
 import asyncio
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import enum
+import gzip
 import json
 import logging
 import time
@@ -19,21 +21,42 @@ import urllib.parse
 
 from typing import Optional
 
+import aiohttp
+import async_timeout
 import requests
+from requests.adapters import HTTPAdapter
 
 import homeassistant.bootstrap as bootstrap
 import homeassistant.core as ha
 from homeassistant.const import (
     HTTP_HEADER_HA_AUTH, SERVER_PORT, URL_API, URL_API_EVENT_FORWARD,
-    URL_API_EVENTS, URL_API_EVENTS_EVENT, URL_API_SERVICES, URL_API_CONFIG,
-    URL_API_SERVICES_SERVICE, URL_API_STATES, URL_API_STATES_ENTITY,
-    HTTP_HEADER_CONTENT_TYPE, CONTENT_TYPE_JSON)
+    URL_API_EVENT_FORWARD_EVENTS, URL_API_EVENTS, URL_API_EVENTS_EVENT,
+    URL_API_SERVICES, URL_API_CONFIG, URL_API_SERVICES_SERVICE,
+    URL_API_STATES, URL_API_STATES_ENTITY, HTTP_HEADER_CONTENT_ENCODING,
+    HTTP_HEADER_CONTENT_TYPE, CONTENT_TYPE_JSON, HTTP_BAD_REQUEST,
+    HTTP_NOT_FOUND, HTTP_OK, HTTP_UNPROCESSABLE_ENTITY)
 from homeassistant.exceptions import HomeAssistantError
 
 METHOD_GET = "get"
 METHOD_POST = "post"
 METHOD_DELETE = "delete"
 
+# Number of keep-alive connections kept open to a single instance
+CONNECTION_POOL_SIZE = 10
+
+# How long events are collected before they are forwarded as one batch
+FORWARD_BATCH_DELAY = 0.05  # seconds
+
+# Maximum number of events forwarded in a single batch
+FORWARD_BATCH_SIZE = 100
+
+# Maximum number of events buffered per target while it is unavailable
+FORWARD_BUFFER_SIZE = 1000
+
+# Delay before retrying an unavailable target, doubled on each failure
+FORWARD_RETRY_DELAY = 1  # seconds
+FORWARD_RETRY_MAX_DELAY = 60  # seconds
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -72,6 +95,15 @@ class API(object):
         if api_password is not None:
             self._headers[HTTP_HEADER_HA_AUTH] = api_password
 
+        # Connections are kept alive and reused between calls
+        self._session = requests.Session()
+        self._session.headers.update(self._headers)
+        adapter = HTTPAdapter(pool_connections=1,
+                              pool_maxsize=CONNECTION_POOL_SIZE)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._websession = None
+
     def validate_api(self, force_validate: bool=False) -> bool:
         """Test if we can communicate with the API."""
         if self.status is None or force_validate:
@@ -79,21 +111,23 @@ class API(object):
 
         return self.status == APIStatus.OK
 
-    def __call__(self, method, path, data=None, timeout=5):
-        """Make a call to the Home Assistant API."""
-        if data is not None:
+    def __call__(self, method, path, data=None, timeout=5, headers=None):
+        """Make a call to the Home Assistant API.
+
+        Data that is already encoded as bytes is sent as is.
+        """
+        if data is not None and not isinstance(data, bytes):
             data = json.dumps(data, cls=JSONEncoder)
 
         url = urllib.parse.urljoin(self.base_url, path)
 
         try:
             if method == METHOD_GET:
-                return requests.get(
-                    url, params=data, timeout=timeout, headers=self._headers)
+                return self._session.get(
+                    url, params=data, timeout=timeout, headers=headers)
             else:
-                return requests.request(
-                    method, url, data=data, timeout=timeout,
-                    headers=self._headers)
+                return self._session.request(
+                    method, url, data=data, timeout=timeout, headers=headers)
 
         except requests.exceptions.ConnectionError:
             _LOGGER.exception("Error connecting to server")
@@ -104,6 +138,62 @@ class API(object):
             _LOGGER.exception(error)
             raise HomeAssistantError(error)
 
+    @asyncio.coroutine
+    def async_call(self, method, path, data=None, timeout=5, loop=None):
+        """Make a call to the Home Assistant API from inside the event loop.
+
+        Returns the response with its body already read.
+
+        This method is a coroutine.
+        """
+        if data is not None:
+            data = json.dumps(data, cls=JSONEncoder)
+
+        url = urllib.parse.urljoin(self.base_url, path)
+
+        if self._websession is None:
+            loop = loop or asyncio.get_event_loop()
+            self._websession = aiohttp.ClientSession(
+                loop=loop, headers=self._headers,
+                connector=aiohttp.TCPConnector(
+                    loop=loop, limit=CONNECTION_POOL_SIZE))
+
+        try:
+            with async_timeout.timeout(timeout, loop=self._websession.loop):
+                if method == METHOD_GET:
+                    resp = yield from self._websession.get(url, params=data)
+                else:
+                    resp = yield from self._websession.request(
+                        method, url, data=data)
+
+                yield from resp.read()
+                yield from resp.release()
+                return resp
+
+        except (aiohttp.errors.ClientError,
+                aiohttp.errors.ClientDisconnectedError):
+            _LOGGER.exception("Error connecting to server")
+            raise HomeAssistantError("Error connecting to server")
+
+        except asyncio.TimeoutError:
+            error = "Timeout when talking to {}".format(self.host)
+            _LOGGER.exception(error)
+            raise HomeAssistantError(error)
+
+    def close(self):
+        """Close the pooled connections of the blocking API."""
+        self._session.close()
+
+    @asyncio.coroutine
+    def async_close(self):
+        """Close the pooled connections of the async API.
+
+        This method is a coroutine.
+        """
+        if self._websession is not None:
+            yield from self._websession.close()
+            self._websession = None
+
     def __repr__(self) -> str:
         """Return the representation of the API."""
         return "API({}, {}, {})".format(
@@ -114,7 +204,8 @@ class HomeAssistant(ha.HomeAssistant):
     """Home Assistant that forwards work."""
 
     # pylint: disable=super-init-not-called
-    def __init__(self, remote_api, local_api=None, loop=None):
+    def __init__(self, remote_api, local_api=None, loop=None,
+                 batch_events=False):
         """Initalize the forward instance."""
         if not remote_api.validate_api():
             raise HomeAssistantError(
@@ -122,6 +213,7 @@ class HomeAssistant(ha.HomeAssistant):
                     remote_api.host, remote_api.port, remote_api.status))
 
         self.remote_api = remote_api
+        self.batch_events = batch_events
 
         self.loop = loop or asyncio.get_event_loop()
         self.executor = ThreadPoolExecutor(max_workers=5)
@@ -164,7 +256,8 @@ class HomeAssistant(ha.HomeAssistant):
         # Setup that events from remote_api get forwarded to local_api
         # Do this after we are running, otherwise HTTP is not started
         # or requests are blocked
-        if not connect_remote_events(self.remote_api, self.config.api):
+        if not connect_remote_events(self.remote_api, self.config.api,
+                                     self.batch_events):
             raise HomeAssistantError((
                 'Could not setup event forwarding from api {} to '
                 'local api {}').format(self.remote_api, self.config.api))
@@ -217,13 +310,15 @@ class EventForwarder(object):
         # that we do not forward to the same host twice
         self._targets = {}
 
-        self._lock = threading.Lock()
         self._async_unsub_listener = None
 
     @ha.callback
-    def async_connect(self, api):
+    def async_connect(self, api, batch=False):
         """Attach to a Home Assistant instance and forward events.
 
+        If batch is True, events are collected for FORWARD_BATCH_DELAY and
+        forwarded as one compressed request.
+
         Will overwrite old target if one exists with same host/port.
         """
         if self._async_unsub_listener is None:
@@ -232,32 +327,182 @@ class EventForwarder(object):
 
         key = (api.host, api.port)
 
-        self._targets[key] = api
+        self._targets[key] = EventForwardTarget(self.hass, api, batch)
 
     @ha.callback
     def async_disconnect(self, api):
         """Remove target from being forwarded to."""
         key = (api.host, api.port)
 
-        did_remove = self._targets.pop(key, None) is None
+        target = self._targets.pop(key, None)
+        did_remove = target is None
 
-        if len(self._targets) == 0:
+        if target is not None:
+            target.async_stop()
+
+        if len(self._targets) == 0 and \
+           self._async_unsub_listener is not None:
             # Remove event listener if no forwarding targets present
             self._async_unsub_listener()
             self._async_unsub_listener = None
 
         return did_remove
 
+    @ha.callback
     def _event_listener(self, event):
         """Listen and forward all events."""
+        # We don't forward time events or, if enabled, non-local events
+        if event.event_type == ha.EVENT_TIME_CHANGED or \
+           (self.restrict_origin and event.origin != self.restrict_origin):
+            return
+
+        for target in self._targets.values():
+            target.async_queue_event(event)
+
+
+class EventForwardTarget(object):
+    """Forward queued events to a single API in order.
+
+    At most one executor job per target sends events. Events that arrive
+    while it is busy are picked up by the same job over the kept-alive
+    connection instead of each occupying an executor worker.
+
+    In batch mode events are sent in compressed batches. Batches that
+    that cannot be delivered are kept and retried with a growing delay,
+    holding on to at most FORWARD_BUFFER_SIZE events. Batches the target
+    rejects as invalid are dropped.
+    """
+
+    def __init__(self, hass, api, batch=False):
+        """Initialize the target."""
+        self.hass = hass
+        self.api = api
+        self.batch = batch
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._sending = False
+        self._retry_delay = FORWARD_RETRY_DELAY
+        self._async_send_handle = None
+        self.stopped = False
+        self.dropped = 0
+
+    @ha.callback
+    def async_queue_event(self, event):
+        """Queue an event to be forwarded.
+
+        This method must be run in the event loop.
+        """
         with self._lock:
-            # We don't forward time events or, if enabled, non-local events
-            if event.event_type == ha.EVENT_TIME_CHANGED or \
-               (self.restrict_origin and event.origin != self.restrict_origin):
+            self._queue.append(event)
+            self._trim_queue()
+
+            if self._sending:
                 return
 
-            for api in self._targets.values():
-                fire_event(api, event.event_type, event.data)
+            self._sending = True
+
+        if self.batch:
+            self._async_send_handle = self.hass.loop.call_later(
+                FORWARD_BATCH_DELAY, self._async_schedule_send)
+        else:
+            self.hass.async_add_job(self._send_queued)
+
+    @ha.callback
+    def async_stop(self):
+        """Stop forwarding, the queued events are dropped.
+
+        This method must be run in the event loop.
+        """
+        self.stopped = True
+
+        if self._async_send_handle is not None:
+            self._async_send_handle.cancel()
+            self._async_send_handle = None
+
+        with self._lock:
+            self._queue.clear()
+
+    @ha.callback
+    def _async_schedule_send(self):
+        """Start sending the queued events.
+
+        This method must be run in the event loop.
+        """
+        self._async_send_handle = None
+
+        if self.stopped or not self.hass.is_running:
+            with self._lock:
+                self._sending = False
+            return
+
+        self.hass.async_add_job(self._send_queued)
+
+    @ha.callback
+    def _async_schedule_retry(self, delay):
+        """Send the queued events again after delay.
+
+        This method must be run in the event loop.
+        """
+        if self.stopped:
+            with self._lock:
+                self._sending = False
+            return
+
+        self._async_send_handle = self.hass.loop.call_later(
+            delay, self._async_schedule_send)
+
+    def _trim_queue(self):
+        """Drop the oldest events if the buffer is full.
+
+        Must be called with the lock held.
+        """
+        if len(self._queue) <= FORWARD_BUFFER_SIZE:
+            return
+
+        if not self.dropped:
+            _LOGGER.warning(
+                "Event buffer for %s:%s full, dropping oldest events",
+                self.api.host, self.api.port)
+
+        while len(self._queue) > FORWARD_BUFFER_SIZE:
+            self._queue.popleft()
+            self.dropped += 1
+
+    def _send_queued(self):
+        """Send queued events until the queue is empty."""
+        while True:
+            with self._lock:
+                if not self._queue or self.stopped:
+                    self._sending = False
+                    return
+
+                if not self.batch:
+                    event = self._queue.popleft()
+                else:
+                    events = [self._queue.popleft() for _ in range(
+                        min(len(self._queue), FORWARD_BATCH_SIZE))]
+
+            if not self.batch:
+                fire_event(self.api, event.event_type, event.data)
+                continue
+
+            if fire_events(self.api, events):
+                self._retry_delay = FORWARD_RETRY_DELAY
+                continue
+
+            with self._lock:
+                self._queue.extendleft(reversed(events))
+                self._trim_queue()
+
+            _LOGGER.warning("Unable to forward events to %s:%s, "
+                            "retrying in %d seconds", self.api.host,
+                            self.api.port, self._retry_delay)
+
+            self.hass.loop.call_soon_threadsafe(
+                self._async_schedule_retry, self._retry_delay)
+            self._retry_delay = min(self._retry_delay * 2,
+                                    FORWARD_RETRY_MAX_DELAY)
+            return
 
 
 class StateMachine(ha.StateMachine):
@@ -340,14 +585,20 @@ def validate_api(api):
         return APIStatus.CANNOT_CONNECT
 
 
-def connect_remote_events(from_api, to_api):
-    """Setup from_api to forward all events to to_api."""
+def connect_remote_events(from_api, to_api, batch=False):
+    """Setup from_api to forward all events to to_api.
+
+    If batch is True, events are forwarded in compressed batches.
+    """
     data = {
         'host': to_api.host,
         'api_password': to_api.api_password,
         'port': to_api.port
     }
 
+    if batch:
+        data['batch'] = True
+
     try:
         req = from_api(METHOD_POST, URL_API_EVENT_FORWARD, data)
 
@@ -416,6 +667,45 @@ def fire_event(api, event_type, data=None):
         _LOGGER.exception("Error firing event")
 
 
+def fire_events(api, events):
+    """Fire a batch of events at remote API in a single compressed request.
+
+    Return False if the events could not be delivered, for example because
+    of a connection, server or authentication error, and should be sent
+    again. Events the remote API rejects as invalid are dropped, sending
+    them again would fail the same way. An API without the batch endpoint
+    gets the events one by one.
+    """
+    data = gzip.compress(json.dumps(
+        [{'event_type': event.event_type, 'data': event.data}
+         for event in events], cls=JSONEncoder).encode('UTF-8'))
+
+    try:
+        req = api(METHOD_POST, URL_API_EVENT_FORWARD_EVENTS, data,
+                  headers={HTTP_HEADER_CONTENT_ENCODING: 'gzip'})
+
+        if req.status_code == HTTP_OK:
+            return True
+
+        elif req.status_code == HTTP_NOT_FOUND:
+            # Older versions do not support batches
+            for event in events:
+                fire_event(api, event.event_type, event.data)
+            return True
+
+        elif req.status_code in (HTTP_BAD_REQUEST, HTTP_UNPROCESSABLE_ENTITY):
+            _LOGGER.error("Events rejected, dropping %d events: %d - %s",
+                          len(events), req.status_code, req.text)
+            return True
+
+        _LOGGER.error("Error firing events: %d - %s",
+                      req.status_code, req.text)
+        return False
+
+    except HomeAssistantError:
+        return False
+
+
 def get_state(api, entity_id):
     """Query given API for state of entity_id."""
     try:
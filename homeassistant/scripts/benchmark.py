@@ -0,0 +1,194 @@
+"""Script to run benchmarks."""
+import argparse
+import os
+import shutil
+import tempfile
+from timeit import default_timer as timer
+from typing import Callable, Dict, List  # NOQA
+
+BENCHMARKS = {}  # type: Dict[str, Callable]
+
+
+def run(args: List) -> int:
+    """Handle benchmark commandline script."""
+    parser = argparse.ArgumentParser(
+        description=("Run a Home Assistant benchmark."))
+    parser.add_argument(
+        '--script', choices=['benchmark'])
+    parser.add_argument(
+        'name', choices=sorted(BENCHMARKS),
+        help="Benchmark to run")
+
+    args = parser.parse_args(args)
+
+    BENCHMARKS[args.name]()
+    return 0
+
+
+def benchmark(func: Callable) -> Callable:
+    """Decorator to register a benchmark."""
+    BENCHMARKS[func.__name__] = func
+    return func
+
+
+@benchmark
+def yaml_load(sensor_files=60, sensors_per_file=20, automations=300):
+    """Load a large split configuration with each YAML loader."""
+    import homeassistant.util.yaml as yaml
+
+    config_dir = tempfile.mkdtemp()
+
+    try:
+        config_path = _write_config_tree(
+            config_dir, sensor_files, sensors_per_file, automations)
+
+        with open(config_path) as fil:
+            lines = sum(1 for _ in fil)
+        for root, _, files in os.walk(config_dir):
+            for fname in files:
+                if fname != 'configuration.yaml':
+                    with open(os.path.join(root, fname)) as fil:
+                        lines += sum(1 for _ in fil)
+
+        print('Loading a config tree of {} lines'.format(lines))
+
+        loaders = [('SafeLineLoader', yaml.SafeLineLoader)]
+        if yaml.CSafeLineLoader is not None:
+            loaders.append(('CSafeLineLoader', yaml.CSafeLineLoader))
+        else:
+            print('PyYAML is built without libyaml, no C loader available')
+
+        default_loader = yaml.DEFAULT_LOADER
+        results = []
+
+        try:
+            for name, loader in loaders:
+                yaml.DEFAULT_LOADER = loader
+                durations = []
+                for _ in range(3):
+                    yaml.clear_secret_cache()
+                    start = timer()
+                    yaml.load_yaml(config_path)
+                    durations.append(timer() - start)
+                results.append(min(durations))
+                print('{:<16} {:.3f}s'.format(name, min(durations)))
+        finally:
+            yaml.DEFAULT_LOADER = default_loader
+            yaml.clear_secret_cache()
+
+        if len(results) == 2:
+            print('Speedup          {:.1f}x'.format(results[0] / results[1]))
+    finally:
+        shutil.rmtree(config_dir)
+
+
+@benchmark
+def state_triggers(automations=400, rounds=20):
+    """Dispatch state changes to the state triggers of many automations."""
+    import asyncio
+    from homeassistant import core
+    from homeassistant.helpers import event as event_helper
+
+    loop = asyncio.new_event_loop()
+    hass = core.HomeAssistant(loop)
+    entity_ids = ['binary_sensor.motion_{}'.format(idx)
+                  for idx in range(automations)]
+    results = []
+
+    @asyncio.coroutine
+    def fire_state_changes():
+        """Toggle all entities and wait till the triggers are done."""
+        start = timer()
+        for num in range(rounds):
+            state = 'on' if num % 2 else 'off'
+            for entity_id in entity_ids:
+                hass.states.async_set(entity_id, state)
+        yield from hass.async_block_till_done()
+        return timer() - start
+
+    print('Firing {} state changes at {} state triggers'.format(
+        automations * rounds, automations))
+
+    try:
+        for name, track in (
+                ('Listener per trigger',
+                 event_helper.async_track_state_change),
+                ('Shared index',
+                 event_helper.async_track_indexed_state_change)):
+            triggered = 0
+
+            @core.callback
+            def action(entity_id, old_state, new_state):
+                """Count the triggered automations."""
+                nonlocal triggered
+                triggered += 1
+
+            unsubs = [track(hass, entity_id, action, 'off', 'on')
+                      for entity_id in entity_ids]
+            duration = loop.run_until_complete(fire_state_changes())
+            results.append(duration)
+
+            for unsub in unsubs:
+                unsub()
+            for entity_id in entity_ids:
+                hass.states.async_remove(entity_id)
+
+            print('{:<22} {:.3f}s ({:.1f}us per state change, {} triggered)'
+                  .format(name, duration,
+                          duration / (automations * rounds) * 1000000,
+                          triggered))
+
+        print('Speedup                {:.1f}x'.format(results[0] / results[1]))
+    finally:
+        loop.run_until_complete(hass.async_block_till_done())
+        hass.executor.shutdown()
+        loop.close()
+
+
+def _write_config_tree(config_dir, sensor_files, sensors_per_file,
+                       automations):
+    """Write a split configuration and return the configuration.yaml path."""
+    def write(path, content):
+        """Write content to a file in the config dir."""
+        path = os.path.join(config_dir, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as fil:
+            fil.write(content)
+        return path
+
+    write('secrets.yaml', 'api_password: benchmark\n')
+
+    for idx in range(sensor_files):
+        write('sensors/sensors_{}.yaml'.format(idx), ''.join(
+            '- platform: template\n'
+            '  sensors:\n'
+            '    sensor_{0}_{1}:\n'
+            '      value_template: "{{{{ states.sensor.s_{0}_{1}.state }}}}"\n'
+            '      friendly_name: Sensor {0} {1}\n'
+            '      unit_of_measurement: "W"\n'.format(idx, num)
+            for num in range(sensors_per_file)))
+
+    for idx in range(automations):
+        write('automations/automation_{}.yaml'.format(idx), (
+            'alias: Automation {0}\n'
+            'trigger:\n'
+            '  - platform: state\n'
+            '    entity_id: binary_sensor.motion_{0}\n'
+            '    from: "off"\n'
+            '    to: "on"\n'
+            'condition:\n'
+            '  - condition: time\n'
+            '    after: "07:00:00"\n'
+            'action:\n'
+            '  - service: light.turn_on\n'
+            '    entity_id: light.room_{0}\n'
+            '    data:\n'
+            '      brightness: 150\n').format(idx))
+
+    return write('configuration.yaml', (
+        'homeassistant:\n'
+        '  name: Benchmark\n'
+        'http:\n'
+        '  api_password: !secret api_password\n'
+        'sensor: !include_dir_merge_list sensors\n'
+        'automation: !include_dir_list automations\n'))
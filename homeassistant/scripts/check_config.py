@@ -1,16 +1,26 @@
 """Script to ensure a configuration file exists."""
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
 import logging
 import os
+import pickle
 from collections import OrderedDict
 from glob import glob
 from platform import system
+from types import SimpleNamespace
 from unittest.mock import patch
 
 from typing import Dict, List, Sequence
 
+import voluptuous as vol
+
 import homeassistant.bootstrap as bootstrap
 import homeassistant.config as config_util
+from homeassistant.const import __version__
+import homeassistant.core as core
+from homeassistant.helpers import config_per_platform
 import homeassistant.loader as loader
 import homeassistant.util.yaml as yaml
 from homeassistant.exceptions import HomeAssistantError
@@ -42,6 +52,12 @@ PATCHES = {}
 C_HEAD = 'bold'
 ERROR_STR = 'General Errors'
 
+# Fingerprints and validated configs of the components that passed a
+# fast check
+VALIDATION_CACHE = '.check_config_cache'
+# Components validated at the same time in a fast check
+FAST_CHECK_WORKERS = 8
+
 
 def color(the_color, *args, reset=None):
     """Color helper."""
@@ -78,6 +94,11 @@ def run(script_args: List) -> int:
         '-s', '--secrets',
         action='store_true',
         help="Show secret information")
+    parser.add_argument(
+        '--fast',
+        action='store_true',
+        help="Only validate the schemas of changed components, "
+             "without setting anything up")
 
     args = parser.parse_args()
 
@@ -93,7 +114,7 @@ def run(script_args: List) -> int:
     if args.info:
         domain_info = args.info.split(',')
 
-    res = check(config_path)
+    res = check(config_path, args.fast)
 
     if args.files:
         print(color(C_HEAD, 'yaml files'), '(used /',
@@ -149,8 +170,12 @@ def run(script_args: List) -> int:
     return 0
 
 
-def check(config_path):
-    """Perform a check by mocking hass load functions."""
+def check(config_path, fast=False):
+    """Perform a check by mocking hass load functions.
+
+    A fast check validates the configuration against the component schemas
+    only, see check_fast.
+    """
     res = {
         'yaml_files': OrderedDict(),  # yaml_files loaded
         'secrets': OrderedDict(),  # secret cache and secrets loaded
@@ -217,6 +242,11 @@ def check(config_path):
     for sil in SILENCE:
         PATCHES[sil] = patch(sil)
 
+    # Always parse the YAML files, a cached copy skips the mocks above
+    PATCHES['cache'] = patch(
+        'homeassistant.config.load_yaml_cached',
+        side_effect=lambda fname, cache_path: yaml.load_yaml(fname))
+
     # Patches with local mock functions
     for key, val in MOCKS.items():
         # The * in the key is removed to find the mock_function (side_effect)
@@ -229,9 +259,13 @@ def check(config_path):
         pat.start()
     # Ensure !secrets point to the patched function
     yaml.yaml.SafeLoader.add_constructor('!secret', yaml._secret_yaml)
+    yaml.DEFAULT_LOADER.add_constructor('!secret', yaml._secret_yaml)
 
     try:
-        bootstrap.from_config_file(config_path, skip_pip=True)
+        if fast:
+            check_fast(config_path, res)
+        else:
+            bootstrap.from_config_file(config_path, skip_pip=True)
         res['secret_cache'] = dict(yaml.__SECRET_CACHE)
     except Exception as err:  # pylint: disable=broad-except
         print(color('red', 'Fatal error while loading config:'), str(err))
@@ -241,11 +275,219 @@ def check(config_path):
             pat.stop()
         # Ensure !secrets point to the original function
         yaml.yaml.SafeLoader.add_constructor('!secret', yaml._secret_yaml)
+        yaml.DEFAULT_LOADER.add_constructor('!secret', yaml._secret_yaml)
         bootstrap.clear_secret_cache()
 
     return res
 
 
+def check_fast(config_path, res):
+    """Validate the configuration without setting up Home Assistant.
+
+    Components and platforms are looked up in the component manifest. Only
+    components whose configuration or source changed since they last passed
+    are imported to validate their schemas, independent components are
+    validated in parallel.
+    """
+    config_dir = os.path.dirname(config_path)
+    config = config_util.load_yaml_config_file(config_path)
+
+    core_config = config.get(core.DOMAIN, {})
+    try:
+        config_util.CORE_CONFIG_SCHEMA(core_config)
+    except vol.Invalid as ex:
+        bootstrap.async_log_exception(ex, core.DOMAIN, core_config, None)
+
+    # The loader only needs to know where to find custom components
+    ha_config = core.Config()
+    ha_config.config_dir = config_dir
+    loader.prepare(SimpleNamespace(config=ha_config))
+
+    cache_path = os.path.join(config_dir, VALIDATION_CACHE)
+    cache = _load_validation_cache(cache_path)
+
+    domains = sorted(set(key.split(' ')[0] for key in config
+                         if key != core.DOMAIN))
+
+    with ThreadPoolExecutor(max_workers=FAST_CHECK_WORKERS) as executor:
+        results = list(executor.map(
+            lambda domain: _check_domain(config, domain, cache.get(domain)),
+            domains))
+
+    new_cache = {}
+
+    for domain, result in zip(domains, results):
+        not_found, invalid, validated, fingerprint = result
+
+        for comp_name in not_found:
+            res['except'].setdefault(ERROR_STR, []).append(
+                '{} not found: {}'.format(
+                    'Platform' if '.' in comp_name else 'Component',
+                    comp_name))
+
+        for ex, name, name_config in invalid:
+            bootstrap.async_log_exception(ex, name, name_config, None)
+
+        if validated is not None:
+            res['components'][domain] = validated
+
+        if fingerprint is not None and not not_found and not invalid:
+            new_cache[domain] = (fingerprint, validated)
+
+    if {domain: entry[0] for domain, entry in new_cache.items()} != \
+       {domain: entry[0] for domain, entry in cache.items()}:
+        _save_validation_cache(cache_path, new_cache)
+
+    loader.save_manifest()
+
+
+def _load_validation_cache(cache_path):
+    """Return the cached fingerprints and validated configs per domain."""
+    try:
+        with open(cache_path, 'rb') as fil:
+            cache = pickle.load(fil)
+    except FileNotFoundError:
+        return {}
+    except Exception:  # pylint: disable=broad-except
+        _LOGGER.warning('Ignoring invalid validation cache %s', cache_path)
+        return {}
+
+    if not isinstance(cache, dict) or cache.get('version') != __version__:
+        return {}
+
+    return cache['domains']
+
+
+def _save_validation_cache(cache_path, domains):
+    """Write the fingerprints and validated configs to the cache.
+
+    Domains whose validated config cannot be pickled are left out.
+    """
+    picklable = {}
+    for domain, entry in domains.items():
+        try:
+            pickle.dumps(entry, pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            continue
+        picklable[domain] = entry
+
+    try:
+        # Validated configs contain secrets, only the owner may read them
+        fd = os.open(cache_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+                     0o600)
+        with open(fd, 'wb') as fil:
+            pickle.dump({'version': __version__, 'domains': picklable}, fil,
+                        pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        _LOGGER.warning('Unable to write validation cache %s', cache_path)
+
+
+def _check_domain(config, domain, cached):
+    """Validate the config of a domain.
+
+    Cached is the (fingerprint, validated config) of the last check that
+    passed or None. Returns the components and platforms not found, the
+    invalid configs as (exception, name, config) tuples, the validated
+    config and the fingerprint of the config and sources or None if it
+    cannot be cached.
+    """
+    metadata = loader.get_component_metadata(domain)
+
+    if metadata is None:
+        return [domain], [], None, None
+
+    not_found = [dep for dep in metadata['dependencies']
+                 if loader.get_component_metadata(dep) is None]
+
+    sources = [metadata]
+    for p_name, _ in config_per_platform(config, domain):
+        if p_name is None:
+            continue
+
+        p_metadata = loader.get_component_metadata(
+            '{}.{}'.format(domain, p_name))
+
+        if p_metadata is None:
+            not_found.append('{}.{}'.format(domain, p_name))
+        else:
+            sources.append(p_metadata)
+
+    fingerprint = _fingerprint(config, domain, sources)
+
+    if fingerprint is not None and cached is not None and \
+       fingerprint == cached[0]:
+        return not_found, [], cached[1], fingerprint
+
+    invalid = []
+    component = loader.get_component(domain)
+
+    if hasattr(component, 'CONFIG_SCHEMA'):
+        try:
+            validated = component.CONFIG_SCHEMA(config)
+        except vol.Invalid as ex:
+            return not_found, [(ex, domain, config)], None, fingerprint
+
+        return not_found, [], validated.get(domain), fingerprint
+
+    elif not hasattr(component, 'PLATFORM_SCHEMA'):
+        return not_found, [], config.get(domain), fingerprint
+
+    platforms = []
+    for p_name, p_config in config_per_platform(config, domain):
+        if '{}.{}'.format(domain, p_name) in not_found:
+            continue
+
+        try:
+            p_validated = component.PLATFORM_SCHEMA(p_config)
+        except vol.Invalid as ex:
+            invalid.append((ex, domain, config))
+            continue
+
+        if p_name is None:
+            platforms.append(p_validated)
+            continue
+
+        platform = loader.get_platform(domain, p_name)
+
+        if platform is None:
+            continue
+
+        if hasattr(platform, 'PLATFORM_SCHEMA'):
+            try:
+                # pylint: disable=no-member
+                p_validated = platform.PLATFORM_SCHEMA(p_validated)
+            except vol.Invalid as ex:
+                invalid.append((ex, '{}.{}'.format(domain, p_name),
+                                p_validated))
+                continue
+
+        platforms.append(p_validated)
+
+    return not_found, invalid, platforms, fingerprint
+
+
+def _fingerprint(config, domain, sources):
+    """Return a hash of the config of a domain and the sources validating it.
+
+    Returns None if a source is not known.
+    """
+    if any('mtime' not in metadata for metadata in sources):
+        return None
+
+    sections = [config[key] for key in sorted(config)
+                if key.split(' ')[0] == domain]
+    sources = [(metadata['path'], metadata['mtime']) for metadata in sources]
+
+    try:
+        data = json.dumps([__version__, sections, sources],
+                          sort_keys=True, default=str)
+    except TypeError:
+        # Keys of different types can not be sorted
+        return None
+
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
 def dump_dict(layer, indent_count=3, listi=False, **kwargs):
     """Display a dict.
 
@@ -1,4 +1,5 @@
 """Helper methods for various modules."""
+import asyncio
 from collections.abc import MutableSet
 from itertools import chain
 import threading
@@ -9,6 +10,7 @@ import socket
 import random
 import string
 from functools import wraps
+from time import monotonic
 from types import MappingProxyType
 
 from typing import Any, Optional, TypeVar, Callable, Sequence, KeysView, Union
@@ -222,6 +224,30 @@ class OrderedSet(MutableSet):
         return set(self) == set(other)
 
 
+class _ThrottleState(object):
+    """State of a throttled method for a single host."""
+
+    __slots__ = ['lock', 'last_call', 'flight']
+
+    def __init__(self):
+        """Initialize the state."""
+        self.lock = threading.Lock()
+        self.last_call = None
+        self.flight = None
+
+
+class _ThrottleFlight(object):
+    """A running call of a throttled method that others can wait for."""
+
+    __slots__ = ['owner', 'done', 'result']
+
+    def __init__(self, owner, done):
+        """Initialize the flight."""
+        self.owner = owner
+        self.done = done
+        self.result = None
+
+
 class Throttle(object):
     """A class for throttling the execution of tasks.
 
@@ -230,6 +256,9 @@ class Throttle(object):
     returned its result.
 
     Calling a method a second time during the interval will return None.
+    Calls made while the method is running wait for it and share its result.
+    Coroutine functions are throttled in the same way, callers then wait
+    for the running call without blocking the event loop.
 
     Pass keyword argument `no_throttle=True` to the wrapped method to make
     the call not throttled.
@@ -237,13 +266,16 @@ class Throttle(object):
     Decorator takes in an optional second timedelta interval to throttle the
     'no_throttle' calls.
 
-    Adds a datetime attribute `last_call` to the method.
+    Adds a dict attribute `throttle_stats` to the method with the number of
+    calls that ran the method (misses), shared a running call (hits) or were
+    throttled.
     """
 
     def __init__(self, min_time, limit_no_throttle=None):
         """Initialize the throttle."""
         self.min_time = min_time
         self.limit_no_throttle = limit_no_throttle
+        self._stats_lock = threading.Lock()
 
     def __call__(self, method):
         """Caller for the throttle."""
@@ -262,13 +294,16 @@ class Throttle(object):
         # be prefixed by '.<locals>.' so we strip that out.
         is_func = (not hasattr(method, '__self__') and
                    '.' not in method.__qualname__.split('.<locals>.')[-1])
+        min_seconds = self.min_time.total_seconds()
+        stats = {'misses': 0, 'hits': 0, 'throttled': 0}
 
-        @wraps(method)
-        def wrapper(*args, **kwargs):
-            """Wrapper that allows wrapped to be called only once per min_time.
+        def count(key):
+            """Count a call in the stats."""
+            with self._stats_lock:
+                stats[key] += 1
 
-            If we cannot acquire the lock, it is running so return None.
-            """
+        def get_state(args):
+            """Return the throttle state of the host of the method."""
             # pylint: disable=protected-access
             if hasattr(method, '__self__'):
                 host = method.__self__
@@ -280,24 +315,97 @@ class Throttle(object):
             if not hasattr(host, '_throttle'):
                 host._throttle = {}
 
-            if id(self) not in host._throttle:
-                host._throttle[id(self)] = [threading.Lock(), None]
-            throttle = host._throttle[id(self)]
+            # setdefault is atomic, concurrent first calls share a state
+            return host._throttle.setdefault(id(self), _ThrottleState())
 
-            if not throttle[0].acquire(False):
-                return None
+        def start(state, kwargs, owner, done):
+            """Return the flight to run or wait for and if it is new.
 
+            The flight is None if the call is throttled.
+            """
             # Check if method is never called or no_throttle is given
-            force = not throttle[1] or kwargs.pop('no_throttle', False)
-
-            try:
-                if force or utcnow() - throttle[1] > self.min_time:
-                    result = method(*args, **kwargs)
-                    throttle[1] = utcnow()
-                    return result
-                else:
+            force = kwargs.pop('no_throttle', False) or \
+                state.last_call is None
+
+            with state.lock:
+                if state.flight is not None:
+                    return state.flight, False
+
+                if not force and \
+                   monotonic() - state.last_call <= min_seconds:
+                    return None, False
+
+                state.flight = _ThrottleFlight(owner, done)
+                return state.flight, True
+
+        def finish(state, flight, succeeded):
+            """Mark the flight as done."""
+            with state.lock:
+                if succeeded:
+                    state.last_call = monotonic()
+                state.flight = None
+
+        if asyncio.iscoroutinefunction(method):
+            @wraps(method)
+            @asyncio.coroutine
+            def wrapper(*args, **kwargs):
+                """Wrapper that allows wrapped to run only once per min_time.
+
+                If it is running, wait for it and return its result.
+                """
+                state = get_state(args)
+                loop = asyncio.get_event_loop()
+                task = asyncio.Task.current_task(loop)
+                flight, new = start(state, kwargs, task,
+                                    asyncio.Future(loop=loop))
+
+                if flight is None or (not new and flight.owner is task):
+                    count('throttled')
                     return None
-            finally:
-                throttle[0].release()
-
+                elif not new:
+                    count('hits')
+                    yield from asyncio.shield(flight.done, loop=loop)
+                    return flight.result
+
+                count('misses')
+                succeeded = False
+                try:
+                    flight.result = yield from method(*args, **kwargs)
+                    succeeded = True
+                    return flight.result
+                finally:
+                    finish(state, flight, succeeded)
+                    flight.done.set_result(None)
+        else:
+            @wraps(method)
+            def wrapper(*args, **kwargs):
+                """Wrapper that allows wrapped to run only once per min_time.
+
+                If it is running in another thread, wait for it and return
+                its result.
+                """
+                state = get_state(args)
+                thread = threading.get_ident()
+                flight, new = start(state, kwargs, thread, threading.Event())
+
+                # Called again by the running method, do not wait for itself
+                if flight is None or (not new and flight.owner == thread):
+                    count('throttled')
+                    return None
+                elif not new:
+                    count('hits')
+                    flight.done.wait()
+                    return flight.result
+
+                count('misses')
+                succeeded = False
+                try:
+                    flight.result = method(*args, **kwargs)
+                    succeeded = True
+                    return flight.result
+                finally:
+                    finish(state, flight, succeeded)
+                    flight.done.set()
+
+        wrapper.throttle_stats = stats
         return wrapper
@@ -1,4 +1,5 @@
 """Helpers to install PyPi packages."""
+import json
 import logging
 import os
 import subprocess
@@ -6,7 +7,7 @@ import sys
 import threading
 from urllib.parse import urlparse
 
-from typing import Optional
+from typing import List, Optional, Sequence
 
 import pkg_resources
 
@@ -26,17 +27,35 @@ def install_package(package: str, upgrade: bool=True,
             return True
 
         _LOGGER.info('Attempting install of %s', package)
-        args = [sys.executable, '-m', 'pip', 'install', '--quiet', package]
-        if upgrade:
-            args.append('--upgrade')
-        if target:
-            args += ['--target', os.path.abspath(target)]
+        return _run_pip([package], upgrade, target)
 
-        try:
-            return subprocess.call(args) == 0
-        except subprocess.SubprocessError:
-            _LOGGER.exception('Unable to install pacakge %s', package)
-            return False
+
+def install_packages(packages: Sequence[str], upgrade: bool=True,
+                     target: Optional[str]=None) -> bool:
+    """Install several packages on PyPi with a single pip invocation.
+
+    Packages are not checked for being installed already.
+    Return boolean if install successful.
+    """
+    with INSTALL_LOCK:
+        _LOGGER.info('Attempting install of %s', ', '.join(packages))
+        return _run_pip(list(packages), upgrade, target)
+
+
+def _run_pip(packages: List[str], upgrade: bool,
+             target: Optional[str]) -> bool:
+    """Run pip install for the given packages."""
+    args = [sys.executable, '-m', 'pip', 'install', '--quiet'] + packages
+    if upgrade:
+        args.append('--upgrade')
+    if target:
+        args += ['--target', os.path.abspath(target)]
+
+    try:
+        return subprocess.call(args) == 0
+    except subprocess.SubprocessError:
+        _LOGGER.exception('Unable to install pacakge %s', ', '.join(packages))
+        return False
 
 
 def check_package_exists(package: str, lib_dir: str) -> bool:
@@ -45,6 +64,16 @@ def check_package_exists(package: str, lib_dir: str) -> bool:
     Returns True when the requirement is met.
     Returns False when the package is not installed or doesn't meet req.
     """
+    return find_package(package, lib_dir) is not None
+
+
+def find_package(package: str,
+                 lib_dir: str) -> Optional[pkg_resources.Distribution]:
+    """Return the distribution that meets a requirement.
+
+    Looks in lib_dir first, then in the global + virtual environment.
+    Returns None when the package is not installed or doesn't meet req.
+    """
     try:
         req = pkg_resources.Requirement.parse(package)
     except ValueError:
@@ -53,10 +82,94 @@ def check_package_exists(package: str, lib_dir: str) -> bool:
 
     # Check packages from lib dir
     if lib_dir is not None:
-        if any(dist in req for dist in
-               pkg_resources.find_distributions(lib_dir)):
-            return True
+        for dist in pkg_resources.find_distributions(lib_dir):
+            if dist in req:
+                return dist
 
     # Check packages from global + virtual environment
     # pylint: disable=not-an-iterable
-    return any(dist in req for dist in pkg_resources.working_set)
+    for dist in pkg_resources.working_set:
+        if dist in req:
+            return dist
+
+    return None
+
+
+class RequirementsManifest(object):
+    """Persistent record of the distributions that met requirements.
+
+    A recorded requirement is still met as long as the metadata of its
+    distribution has not changed, which is a single stat call instead of a
+    scan of all installed distributions.
+    """
+
+    def __init__(self, path: str, lib_dir: Optional[str]=None) -> None:
+        """Initialize the manifest."""
+        self.path = path
+        self.lib_dir = lib_dir
+        self._entries = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def is_met(self, package: str) -> bool:
+        """Return if a requirement is met, recording it if so."""
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._load()
+
+            entry = self._entries.get(package)
+            if entry is not None:
+                try:
+                    if os.path.getmtime(entry[0]) == entry[1]:
+                        return True
+                except OSError:
+                    pass
+
+                self._entries.pop(package)
+                self._dirty = True
+
+            dist = find_package(package, self.lib_dir)
+            if dist is None:
+                return False
+
+            # Metadata dir of the distribution, changes on upgrade/removal
+            path = getattr(dist, 'egg_info', None) or dist.location
+            try:
+                self._entries[package] = [path, os.path.getmtime(path)]
+                self._dirty = True
+            except OSError:
+                pass
+
+            return True
+
+    def missing(self, packages: Sequence[str]) -> List[str]:
+        """Return the requirements that are not met."""
+        return [package for package in packages if not self.is_met(package)]
+
+    def save(self) -> None:
+        """Write the manifest if it changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+
+            try:
+                with open(self.path, 'w') as fil:
+                    json.dump({'python': sys.version,
+                               'requirements': self._entries}, fil)
+                self._dirty = False
+            except OSError:
+                _LOGGER.exception('Unable to write requirements manifest %s',
+                                  self.path)
+
+    def _load(self) -> dict:
+        """Read the manifest, discarding it if written by another Python."""
+        try:
+            with open(self.path) as fil:
+                data = json.load(fil)
+        except (OSError, ValueError):
+            return {}
+
+        if not isinstance(data, dict) or data.get('python') != sys.version:
+            return {}
+
+        return data.get('requirements', {})
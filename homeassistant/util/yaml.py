@@ -1,10 +1,13 @@
 """YAML utility functions."""
+import hashlib
 import logging
 import os
+import pickle
 import sys
 import fnmatch
+import threading
 from collections import OrderedDict
-from typing import Union, List, Dict
+from typing import Union, List, Dict, Optional
 
 import yaml
 try:
@@ -19,6 +22,10 @@ _SECRET_NAMESPACE = 'homeassistant'
 _SECRET_YAML = 'secrets.yaml'
 __SECRET_CACHE = {}  # type: Dict
 
+# Bump when the layout of the cached YAML changes
+_CACHE_VERSION = 2
+_SOURCES = threading.local()
+
 
 # pylint: disable=too-many-ancestors
 class SafeLineLoader(yaml.SafeLoader):
@@ -33,13 +40,42 @@ class SafeLineLoader(yaml.SafeLoader):
         return node
 
 
+if hasattr(yaml, 'CSafeLoader'):
+    # pylint: disable=too-many-ancestors
+    class CSafeLineLoader(yaml.CSafeLoader):
+        """Loader class based on libyaml.
+
+        The C parser does not allow to annotate nodes while composing. Line
+        numbers are taken from the start marks of the nodes instead, like
+        the constructors below already do.
+        """
+
+        def __init__(self, stream) -> None:
+            """Initialize the loader and keep track of the file name."""
+            super().__init__(stream)
+            self.stream = stream
+            self.name = getattr(stream, 'name', '<file>')
+else:
+    CSafeLineLoader = None
+
+# Loader used for configuration files, libyaml is a lot faster if available
+DEFAULT_LOADER = CSafeLineLoader or SafeLineLoader
+
+
+class NodeListClass(list):
+    """Wrapper class to be able to add attributes on a list."""
+
+    pass
+
+
 def load_yaml(fname: str) -> Union[List, Dict]:
     """Load a YAML file."""
+    _track_path(fname)
     try:
         with open(fname, encoding='utf-8') as conf_file:
             # If configuration file is empty YAML returns None
             # We convert that to an empty dict
-            return yaml.load(conf_file, Loader=SafeLineLoader) or {}
+            return yaml.load(conf_file, Loader=DEFAULT_LOADER) or {}
     except yaml.YAMLError as exc:
         _LOGGER.error(exc)
         raise HomeAssistantError(exc)
@@ -48,6 +84,121 @@ def load_yaml(fname: str) -> Union[List, Dict]:
         raise HomeAssistantError(exc)
 
 
+def load_yaml_cached(fname: str, cache_path: str) -> Union[List, Dict]:
+    """Load a YAML file, using a cached copy if none of its sources changed.
+
+    The sources are all files and directories read while loading, including
+    !include trees and secrets.yaml files, and the environment variables
+    that were used. A loaded file is only cached when all its sources can be
+    tracked, so it is not when secrets came from the keyring.
+    """
+    cached = _load_cache(cache_path)
+    if cached is not None:
+        _LOGGER.debug('Loaded %s from cache %s', fname, cache_path)
+        return cached
+
+    previous = getattr(_SOURCES, 'current', None)
+    sources = _SOURCES.current = {'paths': {}, 'env': {}, 'cacheable': True}
+
+    try:
+        data = load_yaml(fname)
+    finally:
+        _SOURCES.current = previous
+
+    if sources['cacheable']:
+        _save_cache(cache_path, data, sources)
+
+    return data
+
+
+def _track_path(path: str) -> None:
+    """Record a file or directory as source of the YAML being loaded."""
+    sources = getattr(_SOURCES, 'current', None)
+    if sources is not None and path not in sources['paths']:
+        sources['paths'][path] = _path_signature(path)
+
+
+def _track_env(name: str) -> None:
+    """Record an environment variable used by the YAML being loaded."""
+    sources = getattr(_SOURCES, 'current', None)
+    if sources is not None:
+        sources['env'][name] = os.environ.get(name)
+
+
+def _track_uncacheable() -> None:
+    """Mark the YAML being loaded as depending on an untracked source."""
+    sources = getattr(_SOURCES, 'current', None)
+    if sources is not None:
+        sources['cacheable'] = False
+
+
+def _path_signature(path: str) -> Optional[List]:
+    """Return the modification time, size and content hash of a path.
+
+    The hash of a directory is taken over its sorted entries. Returns None
+    if the path does not exist.
+    """
+    digest = hashlib.sha1()
+    try:
+        stat = os.stat(path)
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                digest.update(name.encode('utf-8', 'surrogateescape') + b'\0')
+        else:
+            with open(path, 'rb') as source:
+                digest.update(source.read())
+    except OSError:
+        return None
+    return [stat.st_mtime, stat.st_size, digest.hexdigest()]
+
+
+def _load_cache(cache_path: str) -> Union[List, Dict, None]:
+    """Return the cached YAML if all its sources are unchanged."""
+    try:
+        with open(cache_path, 'rb') as cache_file:
+            cache = pickle.load(cache_file)
+    except FileNotFoundError:
+        return None
+    except Exception:  # pylint: disable=broad-except
+        _LOGGER.warning('Ignoring invalid YAML cache %s', cache_path)
+        return None
+
+    if not isinstance(cache, dict) or \
+       cache.get('version') != (_CACHE_VERSION, sys.version_info[:2]):
+        return None
+
+    for path, signature in cache['paths'].items():
+        if _path_signature(path) != signature:
+            return None
+
+    for name, value in cache['env'].items():
+        if os.environ.get(name) != value:
+            return None
+
+    return cache['data']
+
+
+def _save_cache(cache_path: str, data: Union[List, Dict],
+                sources: Dict) -> None:
+    """Write loaded YAML and its sources to the cache file."""
+    cache = {
+        'version': (_CACHE_VERSION, sys.version_info[:2]),
+        'paths': sources['paths'],
+        'env': sources['env'],
+        'data': data,
+    }
+    tmp_path = cache_path + '.tmp'
+
+    try:
+        # The cache contains secrets, only the owner may read it
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with open(fd, 'wb') as cache_file:
+            pickle.dump(cache, cache_file, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except (OSError, pickle.PicklingError, TypeError):
+        _LOGGER.exception('Unable to write YAML cache %s', cache_path)
+
+
 def dump(_dict: dict) -> str:
     """Dump yaml to a string and remove null."""
     return yaml.safe_dump(_dict, default_flow_style=False) \
@@ -80,7 +231,9 @@ def _is_file_valid(name: str) -> bool:
 
 def _find_files(directory: str, pattern: str):
     """Recursively load files in a directory."""
+    _track_path(directory)
     for root, dirs, files in os.walk(directory, topdown=True):
+        _track_path(root)
         dirs[:] = [d for d in dirs if _is_file_valid(d)]
         for basename in files:
             if _is_file_valid(basename) and fnmatch.fnmatch(basename, pattern):
@@ -175,12 +328,7 @@ def _construct_seq(loader: SafeLineLoader, node: yaml.nodes.Node):
     """Add line number and file name to Load YAML sequence."""
     obj, = loader.construct_yaml_seq(node)
 
-    class NodeClass(list):
-        """Wrapper class to be able to add attributes on a list."""
-
-        pass
-
-    processed = NodeClass(obj)
+    processed = NodeListClass(obj)
     setattr(processed, '__config_file__', loader.name)
     setattr(processed, '__line__', node.start_mark.line)
     return processed
@@ -189,6 +337,7 @@ def _construct_seq(loader: SafeLineLoader, node: yaml.nodes.Node):
 def _env_var_yaml(loader: SafeLineLoader,
                   node: yaml.nodes.Node):
     """Load environment variables and embed it into the configuration YAML."""
+    _track_env(node.value)
     if node.value in os.environ:
         return os.environ[node.value]
     else:
@@ -199,6 +348,7 @@ def _env_var_yaml(loader: SafeLineLoader,
 def _load_secret_yaml(secret_path: str) -> Dict:
     """Load the secrets yaml from path."""
     secret_path = os.path.join(secret_path, _SECRET_YAML)
+    _track_path(secret_path)
     if secret_path in __SECRET_CACHE:
         return __SECRET_CACHE[secret_path]
 
@@ -241,6 +391,7 @@ def _secret_yaml(loader: SafeLineLoader,
 
     if keyring:
         # do some keyring stuff
+        _track_uncacheable()
         pwd = keyring.get_password(_SECRET_NAMESPACE, node.value)
         if pwd:
             _LOGGER.debug('Secret %s retrieved from keyring.', node.value)
@@ -249,16 +400,19 @@ def _secret_yaml(loader: SafeLineLoader,
     _LOGGER.error('Secret %s not defined.', node.value)
     raise HomeAssistantError(node.value)
 
-yaml.SafeLoader.add_constructor('!include', _include_yaml)
-yaml.SafeLoader.add_constructor(yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG,
-                                _ordered_dict)
-yaml.SafeLoader.add_constructor(
-    yaml.resolver.BaseResolver.DEFAULT_SEQUENCE_TAG, _construct_seq)
-yaml.SafeLoader.add_constructor('!env_var', _env_var_yaml)
-yaml.SafeLoader.add_constructor('!secret', _secret_yaml)
-yaml.SafeLoader.add_constructor('!include_dir_list', _include_dir_list_yaml)
-yaml.SafeLoader.add_constructor('!include_dir_merge_list',
-                                _include_dir_merge_list_yaml)
-yaml.SafeLoader.add_constructor('!include_dir_named', _include_dir_named_yaml)
-yaml.SafeLoader.add_constructor('!include_dir_merge_named',
-                                _include_dir_merge_named_yaml)
+for _loader in (yaml.SafeLoader, CSafeLineLoader):
+    if _loader is None:
+        continue
+    _loader.add_constructor('!include', _include_yaml)
+    _loader.add_constructor(yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG,
+                            _ordered_dict)
+    _loader.add_constructor(yaml.resolver.BaseResolver.DEFAULT_SEQUENCE_TAG,
+                            _construct_seq)
+    _loader.add_constructor('!env_var', _env_var_yaml)
+    _loader.add_constructor('!secret', _secret_yaml)
+    _loader.add_constructor('!include_dir_list', _include_dir_list_yaml)
+    _loader.add_constructor('!include_dir_merge_list',
+                            _include_dir_merge_list_yaml)
+    _loader.add_constructor('!include_dir_named', _include_dir_named_yaml)
+    _loader.add_constructor('!include_dir_merge_named',
+                            _include_dir_merge_named_yaml)
@@ -262,9 +262,10 @@ class MockPlatform(object):
 
     # pylint: disable=invalid-name
     def __init__(self, setup_platform=None, dependencies=None,
-                 platform_schema=None):
+                 platform_schema=None, requirements=None):
         """Initialize the platform."""
         self.DEPENDENCIES = dependencies or []
+        self.REQUIREMENTS = requirements or []
         self._setup_platform = setup_platform
 
         if platform_schema is not None:
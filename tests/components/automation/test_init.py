@@ -7,6 +7,7 @@ from homeassistant.bootstrap import setup_component
 import homeassistant.components.automation as automation
 from homeassistant.const import ATTR_ENTITY_ID
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import run_trace
 import homeassistant.util.dt as dt_util
 
 from tests.common import get_test_home_assistant, assert_setup_component
@@ -50,6 +51,78 @@ class TestAutomation(unittest.TestCase):
                 }
             })
 
+    def test_trace_runs(self):
+        """Test the runs of an automation are traced."""
+        self.hass.config.trace_runs = 5
+
+        assert setup_component(self.hass, automation.DOMAIN, {
+            automation.DOMAIN: {
+                'alias': 'hello',
+                'trigger': {
+                    'platform': 'event',
+                    'event_type': 'test_event',
+                },
+                'condition': {
+                    'condition': 'template',
+                    'value_template': '{{ trigger.event.data.run }}',
+                },
+                'action': {
+                    'service': 'test.automation',
+                }
+            }
+        })
+
+        self.hass.bus.fire('test_event', {'run': True})
+        self.hass.bus.fire('test_event', {'run': False})
+        self.hass.block_till_done()
+        assert len(self.calls) == 1
+
+        traces = run_trace.get_tracer(self.hass).as_dict()[
+            automation.DOMAIN]['automation.hello']
+        assert [trace['outcome'] for trace in traces] == \
+            ['condition', 'finished']
+        assert traces[1]['context'] == {
+            'trigger': {'platform': 'event', 'entity_id': None}}
+        assert [(step['type'], step['result'])
+                for step in traces[1]['steps']] == \
+            [('condition', True), ('service', 'done')]
+
+    def test_trace_run_condition_error(self):
+        """Test a run with a failing condition is traced as an error."""
+        self.hass.config.trace_runs = 5
+
+        def if_action(variables=None):
+            """Fail to check the condition."""
+            raise ValueError('broken')
+
+        with patch('homeassistant.components.automation._async_process_if',
+                   return_value=if_action):
+            assert setup_component(self.hass, automation.DOMAIN, {
+                automation.DOMAIN: {
+                    'alias': 'hello',
+                    'trigger': {
+                        'platform': 'event',
+                        'event_type': 'test_event',
+                    },
+                    'condition': {
+                        'condition': 'template',
+                        'value_template': '{{ true }}',
+                    },
+                    'action': {
+                        'service': 'test.automation',
+                    }
+                }
+            })
+
+        self.hass.bus.fire('test_event')
+        self.hass.block_till_done()
+        assert len(self.calls) == 0
+
+        traces = run_trace.get_tracer(self.hass).as_dict()[
+            automation.DOMAIN]['automation.hello']
+        assert [trace['outcome'] for trace in traces] == ['error']
+        assert traces[0]['steps'][0]['error'] == 'broken'
+
     def test_service_specify_data(self):
         """Test service data."""
         assert setup_component(self.hass, automation.DOMAIN, {
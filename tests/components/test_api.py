@@ -2,7 +2,10 @@
 # pylint: disable=protected-access
 import asyncio
 from contextlib import closing
+import gzip
 import json
+import threading
+import time
 import unittest
 from unittest.mock import Mock, patch
 
@@ -12,6 +15,9 @@ import requests
 from homeassistant import bootstrap, const
 import homeassistant.core as ha
 import homeassistant.components.http as http
+from homeassistant.helpers.run_trace import DATA_RUN_TRACE, RunTracer
+from homeassistant.helpers.startup_trace import (
+    DATA_STARTUP_TRACE, StartupTracer)
 
 from tests.common import get_test_instance_port, get_test_home_assistant
 
@@ -259,6 +265,60 @@ class TestAPI(unittest.TestCase):
             self.assertEqual(test_string, req.text)
             self.assertIsNone(req.headers.get('expires'))
 
+    def test_api_get_startup_trace(self):
+        """Test the startup trace is returned once startup is traced."""
+        req = requests.get(_url(const.URL_API_STARTUP_TRACE),
+                           headers=HA_HEADERS)
+        self.assertEqual(404, req.status_code)
+
+        tracer = StartupTracer()
+        with tracer.span('setup', 'test_domain'):
+            pass
+
+        with patch.dict(hass.data, {DATA_STARTUP_TRACE: tracer}):
+            req = requests.get(_url(const.URL_API_STARTUP_TRACE),
+                               headers=HA_HEADERS)
+
+        self.assertEqual(200, req.status_code)
+        events = req.json()['traceEvents']
+        self.assertEqual(1, len(events))
+        self.assertEqual('test_domain', events[0]['name'])
+        self.assertEqual('setup', events[0]['cat'])
+
+    def test_api_get_run_trace(self):
+        """Test the run traces are returned if runs are traced."""
+        req = requests.get(_url(const.URL_API_RUN_TRACE),
+                           headers=HA_HEADERS)
+        self.assertEqual(404, req.status_code)
+
+        tracer = RunTracer(2)
+        trace = tracer.async_start_run('script', 'test')
+        with trace.step('service', 'call service') as step:
+            step['result'] = 'done'
+        trace.finish('finished')
+
+        with patch.dict(hass.data, {DATA_RUN_TRACE: tracer}):
+            req = requests.get(_url(const.URL_API_RUN_TRACE),
+                               headers=HA_HEADERS)
+
+        self.assertEqual(200, req.status_code)
+        traces = req.json()['script']['test']
+        self.assertEqual(1, len(traces))
+        self.assertEqual('finished', traces[0]['outcome'])
+        self.assertEqual('call service', traces[0]['steps'][0]['name'])
+
+    def test_api_get_state_writes(self):
+        """Test the counts of state writes are returned."""
+        hass.states.set('test.writes', 'on')
+        hass.states.set('test.writes', 'on')
+
+        req = requests.get(_url(const.URL_API_STATE_WRITES),
+                           headers=HA_HEADERS)
+
+        self.assertEqual(200, req.status_code)
+        self.assertEqual(hass.states.write_stats, req.json())
+        self.assertGreaterEqual(req.json()['unchanged'], 1)
+
     def test_api_get_event_listeners(self):
         """Test if we can get the list of events being listened for."""
         req = requests.get(_url(const.URL_API_EVENTS),
@@ -427,6 +487,117 @@ class TestAPI(unittest.TestCase):
             headers=HA_HEADERS)
         self.assertEqual(200, req.status_code)
 
+    def test_api_states_poll(self):
+        """Test waiting for state changes with a long-poll request."""
+        hass.states.set('test.poll', 'one')
+
+        req = requests.get(_url(const.URL_API_STATES_POLL),
+                           headers=HA_HEADERS)
+        self.assertEqual(400, req.status_code)
+
+        req = requests.get(_url(const.URL_API_STATES_POLL),
+                           params={'entity_id': 'test.poll'},
+                           headers=HA_HEADERS)
+        data = req.json()
+        self.assertEqual(['one'],
+                         [state['state'] for state in data['states']])
+        version = data['version']
+
+        # Nothing changed, request times out
+        req = requests.get(_url(const.URL_API_STATES_POLL),
+                           params={'entity_id': 'test.poll',
+                                   'since': version, 'timeout': 0.1},
+                           headers=HA_HEADERS)
+        data = req.json()
+        self.assertEqual([], data['states'])
+        self.assertEqual(version, data['version'])
+
+        # State changes while the request is waiting
+        timer = threading.Timer(0.2, hass.states.set, ('test.poll', 'two'))
+        timer.start()
+
+        req = requests.get(_url(const.URL_API_STATES_POLL),
+                           params={'entity_id': 'test.poll',
+                                   'since': version, 'timeout': 5},
+                           headers=HA_HEADERS)
+        timer.join()
+        data = req.json()
+        self.assertEqual(['two'],
+                         [state['state'] for state in data['states']])
+        self.assertGreater(data['version'], version)
+        version = data['version']
+
+        # Entity is removed while the request is waiting
+        timer = threading.Timer(0.2, hass.states.remove, ('test.poll',))
+        timer.start()
+
+        req = requests.get(_url(const.URL_API_STATES_POLL),
+                           params={'entity_id': 'test.poll',
+                                   'since': version, 'timeout': 5},
+                           headers=HA_HEADERS)
+        timer.join()
+        data = req.json()
+        self.assertEqual([], data['states'])
+        self.assertEqual(['test.poll'], data['removed'])
+
+        # Missing entities do not return the request right away
+        start = time.monotonic()
+        req = requests.get(_url(const.URL_API_STATES_POLL),
+                           params={'entity_id': 'test.poll,test.never',
+                                   'since': version, 'timeout': 0.2},
+                           headers=HA_HEADERS)
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+        data = req.json()
+        self.assertEqual([], data['states'])
+        self.assertEqual(['test.poll', 'test.never'], data['removed'])
+        self.assertEqual(version, data['version'])
+
+        # Without a version the request returns right away
+        req = requests.get(_url(const.URL_API_STATES_POLL),
+                           params={'entity_id': 'test.never',
+                                   'timeout': 5},
+                           headers=HA_HEADERS)
+        self.assertEqual(['test.never'], req.json()['removed'])
+
+        for timeout in ('nan', '-1', 'abc'):
+            req = requests.get(_url(const.URL_API_STATES_POLL),
+                               params={'entity_id': 'test.poll',
+                                       'timeout': timeout},
+                               headers=HA_HEADERS)
+            self.assertEqual(400, req.status_code)
+
+    def test_api_fire_forwarded_events(self):
+        """Test firing a compressed batch of forwarded events."""
+        test_value = []
+
+        @ha.callback
+        def listener(event):
+            """Helper method that will verify our events got called."""
+            test_value.append(event.data['order'])
+
+        hass.bus.listen("test.forwarded", listener)
+
+        headers = dict(HA_HEADERS)
+        headers[const.HTTP_HEADER_CONTENT_ENCODING] = 'gzip'
+
+        req = requests.post(
+            _url(const.URL_API_EVENT_FORWARD_EVENTS),
+            data=gzip.compress(json.dumps([
+                {'event_type': 'test.forwarded', 'data': {'order': 1}},
+                {'event_type': 'test.forwarded', 'data': {'order': 2}},
+            ]).encode('UTF-8')),
+            headers=headers)
+        hass.block_till_done()
+
+        self.assertEqual(200, req.status_code)
+        self.assertEqual([1, 2], test_value)
+
+        req = requests.post(
+            _url(const.URL_API_EVENT_FORWARD_EVENTS),
+            data=json.dumps({'event_type': 'test.forwarded'}),
+            headers=HA_HEADERS)
+        self.assertEqual(400, req.status_code)
+
     def test_stream(self):
         """Test the stream."""
         listen_count = self._listen_count()
@@ -1,5 +1,7 @@
 """The tests for the Home Assistant HTTP component."""
 # pylint: disable=protected-access
+import asyncio
+import gzip
 import logging
 from ipaddress import ip_network
 from unittest.mock import patch
@@ -227,3 +229,100 @@ class TestHttp:
         assert req.headers.get(allow_origin) == HTTP_BASE_URL
         assert req.headers.get(allow_headers) == \
             const.HTTP_HEADER_HA_AUTH.upper()
+
+    def test_request_metrics(self):
+        """Test that handled requests are recorded per view."""
+        requests.get(_url(const.URL_API), headers=HA_HEADERS)
+        requests.get(_url(const.URL_API))
+
+        req = requests.get(_url(const.URL_API_HTTP_METRICS),
+                           headers=HA_HEADERS)
+        assert req.status_code == 200
+
+        status = {(item['status'], item['authenticated']): item['count']
+                  for item in req.json()['api:status']['requests']}
+        assert status[(200, True)] >= 1
+        assert status[(401, False)] >= 1
+
+        req = requests.get(
+            _url(const.URL_API_HTTP_METRICS),
+            params={'format': 'prometheus'}, headers=HA_HEADERS)
+        assert req.status_code == 200
+        assert 'hass_http_request_duration_seconds_bucket{view="api:status"' \
+            in req.text
+
+
+def test_histogram():
+    """Test the fixed bucket histogram."""
+    histogram = http.Histogram((1, 10))
+
+    for value in (0.5, 1, 5, 20):
+        histogram.add(value)
+
+    assert histogram.cumulative() == [(1, 2), (10, 3), ('+Inf', 4)]
+    assert histogram.count == 4
+    assert histogram.sum == 26.5
+
+
+def test_metrics_prometheus_escaping():
+    """Test label values are escaped and cancellations are not errors."""
+    metrics = http.HTTPMetrics()
+    metrics.async_record('a"b\\c\nd', 200, 10, True, 0.1)
+    metrics.async_record_cancelled('api:status')
+
+    text = metrics.as_prometheus()
+    assert 'view="a\\"b\\\\c\\nd"' in text
+    assert 'hass_http_requests_cancelled_total{view="api:status"} 1' in text
+    assert 'view="api:status",status="500"' not in text
+    assert metrics.as_dict()['api:status']['requests'] == []
+
+
+@asyncio.coroutine
+def test_static_file_cache(hass, test_client, tmpdir):
+    """Test that small static files are served from memory."""
+    static = tmpdir.mkdir('static')
+    static.join('app.js').write('hello')
+    static.join('app.js.gz').write_binary(gzip.compress(b'hello gzip'))
+
+    yield from hass.loop.run_in_executor(
+        None, bootstrap.setup_component, hass, http.DOMAIN,
+        {http.DOMAIN: {http.CONF_SERVER_PORT: get_test_instance_port()}})
+    hass.http.register_static_path('/static', str(static), cache_files=True)
+
+    client = yield from test_client(hass.http.app)
+
+    resp = yield from client.get(
+        '/static/app.js', headers={'Accept-Encoding': 'identity'})
+    assert resp.status == 200
+    assert resp.headers['Content-Type'] == 'application/javascript'
+    assert (yield from resp.text()) == 'hello'
+    etag = resp.headers['ETag']
+
+    resp = yield from client.get(
+        '/static/app.js', headers={'Accept-Encoding': 'gzip'})
+    assert resp.status == 200
+    assert resp.headers['Content-Encoding'] == 'gzip'
+    assert (yield from resp.text()) == 'hello gzip'
+
+    # Outside development mode cached files are not read again
+    static.join('app.js').write('changed')
+
+    resp = yield from client.get(
+        '/static/app.js',
+        headers={'Accept-Encoding': 'identity', 'If-None-Match': etag})
+    assert resp.status == 304
+
+    resp = yield from client.get(
+        '/static/app-{}.js'.format('a' * 32),
+        headers={'Accept-Encoding': 'identity'})
+    assert resp.status == 200
+    assert (yield from resp.text()) == 'hello'
+
+
+def test_accepted_encodings():
+    """Test Accept-Encoding is parsed into codings."""
+    assert http._accepted_encodings('gzip, deflate, br') == ('br', 'gzip')
+    assert http._accepted_encodings('gzip;q=0.5, sdch') == ('gzip',)
+    assert http._accepted_encodings('brotli, xgzip') == ()
+    assert http._accepted_encodings('br;q=0, *') == ('gzip',)
+    assert http._accepted_encodings('') == ()
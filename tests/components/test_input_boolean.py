@@ -10,6 +10,8 @@ from homeassistant.components.input_boolean import (
     DOMAIN, is_on, toggle, turn_off, turn_on)
 from homeassistant.const import (
     STATE_ON, STATE_OFF, ATTR_ICON, ATTR_FRIENDLY_NAME)
+from homeassistant.core import State
+from homeassistant.helpers import restore_state
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -103,3 +105,22 @@ class TestInputBoolean(unittest.TestCase):
         self.assertEqual('Hello World',
                          state_2.attributes.get(ATTR_FRIENDLY_NAME))
         self.assertEqual('mdi:work', state_2.attributes.get(ATTR_ICON))
+
+    def test_restore_state(self):
+        """Test the state of the last run is restored without initial."""
+        self.hass.data[restore_state.DATA_RESTORE_CACHE] = {
+            'input_boolean.b1': State('input_boolean.b1', 'on'),
+            'input_boolean.b2': State('input_boolean.b2', 'on'),
+        }
+
+        self.assertTrue(setup_component(self.hass, DOMAIN, {DOMAIN: {
+            'b1': None,
+            'b2': {
+                'initial': False,
+            },
+        }}))
+
+        self.assertEqual(
+            STATE_ON, self.hass.states.get('input_boolean.b1').state)
+        self.assertEqual(
+            STATE_OFF, self.hass.states.get('input_boolean.b2').state)
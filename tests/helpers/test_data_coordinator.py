@@ -0,0 +1,115 @@
+"""Test the data coordinator helper."""
+from datetime import timedelta
+import logging
+import unittest
+from unittest.mock import Mock
+
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.helpers import data_coordinator
+from homeassistant.helpers.entity_component import EntityComponent
+import homeassistant.util.dt as dt_util
+
+from tests.common import get_test_home_assistant, fire_time_changed
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DataEntity(data_coordinator.CoordinatorEntity):
+    """Entity showing the data of a coordinator."""
+
+    def __init__(self, coordinator, key):
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self.entity_id = 'sensor.{}'.format(key)
+        self.key = key
+
+    @property
+    def state(self):
+        """Return the value of the key."""
+        return (self.coordinator.data or {}).get(self.key)
+
+
+class TestDataCoordinator(unittest.TestCase):
+    """Test the data coordinator."""
+
+    # pylint: disable=invalid-name
+    def setUp(self):
+        """Setup things to be run when tests are started."""
+        self.hass = get_test_home_assistant()
+        self.fetch = Mock(return_value={'one': 1, 'two': 2})
+        self.coordinator = data_coordinator.DataCoordinator(
+            self.hass, _LOGGER, 'test', self.fetch, timedelta(seconds=30))
+
+    # pylint: disable=invalid-name
+    def tearDown(self):
+        """Stop everything that was started."""
+        self.hass.stop()
+
+    def test_fetch_once_for_all_entities(self):
+        """Test all entities are updated from a single fetch."""
+        entities = [DataEntity(self.coordinator, 'one'),
+                    DataEntity(self.coordinator, 'two')]
+        self.coordinator.refresh()
+
+        EntityComponent(_LOGGER, 'sensor', self.hass).add_entities(entities)
+
+        assert self.fetch.call_count == 1
+        assert self.hass.states.get('sensor.one').state == '1'
+        assert self.hass.states.get('sensor.two').state == '2'
+
+        self.fetch.return_value = {'one': 10, 'two': 20}
+        fire_time_changed(self.hass, dt_util.utcnow() + timedelta(seconds=30))
+        self.hass.block_till_done()
+
+        assert self.fetch.call_count == 2
+        assert self.hass.states.get('sensor.one').state == '10'
+        assert self.hass.states.get('sensor.two').state == '20'
+
+    def test_unavailable_after_retries(self):
+        """Test the last data is kept until fetching failed repeatedly."""
+        entity = DataEntity(self.coordinator, 'one')
+        self.coordinator.refresh()
+        EntityComponent(_LOGGER, 'sensor', self.hass).add_entities([entity])
+
+        self.fetch.side_effect = OSError('Host gone')
+
+        for _ in range(1, data_coordinator.FETCH_RETRIES):
+            self.coordinator.refresh()
+            self.hass.block_till_done()
+            assert self.hass.states.get('sensor.one').state == '1'
+
+        self.coordinator.refresh()
+        self.hass.block_till_done()
+        assert self.hass.states.get('sensor.one').state == STATE_UNAVAILABLE
+
+        self.fetch.side_effect = None
+        self.coordinator.refresh()
+        self.hass.block_till_done()
+        assert self.hass.states.get('sensor.one').state == '1'
+
+    def test_no_refresh_without_listeners(self):
+        """Test the coordinator stops refreshing without listeners."""
+        self.coordinator.refresh()
+
+        fire_time_changed(self.hass, dt_util.utcnow() + timedelta(seconds=30))
+        self.hass.block_till_done()
+
+        assert self.fetch.call_count == 1
+
+    def test_removed_entity_stops_listening(self):
+        """Test removed entities no longer listen to the coordinator."""
+        entity = DataEntity(self.coordinator, 'one')
+        self.coordinator.refresh()
+        component = EntityComponent(_LOGGER, 'sensor', self.hass)
+        component.add_entities([entity])
+
+        assert len(self.coordinator._listeners) == 1
+
+        component.reset()
+        assert self.coordinator._listeners == []
+
+        fire_time_changed(self.hass, dt_util.utcnow() + timedelta(seconds=30))
+        self.hass.block_till_done()
+
+        assert self.fetch.call_count == 1
+        assert self.hass.states.get('sensor.one') is None
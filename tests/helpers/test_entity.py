@@ -94,6 +94,75 @@ class TestHelpersEntity(object):
         state = self.hass.states.get(self.entity.entity_id)
         assert state.attributes.get(ATTR_HIDDEN)
 
+    def test_change_token_skips_unchanged_writes(self):
+        """Test the state is not built again if the change token is equal."""
+        class TokenEntity(entity.Entity):
+            hass = self.hass
+            entity_id = 'sensor.token'
+            token = 1
+            value = 'a'
+
+            @property
+            def change_token(self):
+                return self.token
+
+            @property
+            def state(self):
+                return self.value
+
+        ent = TokenEntity()
+        ent.update_ha_state()
+        assert self.hass.states.write_stats['skipped'] == 0
+
+        ent.value = 'b'
+        ent.update_ha_state()
+        assert self.hass.states.get('sensor.token').state == 'a'
+        assert self.hass.states.write_stats['skipped'] == 1
+
+        ent.token = 2
+        ent.update_ha_state()
+        assert self.hass.states.get('sensor.token').state == 'b'
+
+        # Written again if the state was changed by someone else
+        self.hass.states.set('sensor.token', 'c')
+        ent.update_ha_state()
+        assert self.hass.states.get('sensor.token').state == 'b'
+        assert self.hass.states.write_stats['skipped'] == 1
+
+    def test_skip_unchanged_write_without_token(self):
+        """Test writes are skipped if no property changed."""
+        class ValueEntity(entity.Entity):
+            hass = self.hass
+            entity_id = 'sensor.value'
+            value = 'a'
+            attributes = {'level': 1}
+
+            @property
+            def state(self):
+                return self.value
+
+            @property
+            def device_state_attributes(self):
+                return self.attributes
+
+        ent = ValueEntity()
+        ent.update_ha_state()
+        skipped = self.hass.states.write_stats['skipped']
+
+        ent.update_ha_state()
+        assert self.hass.states.write_stats['skipped'] == skipped + 1
+
+        # Attributes changed in place are noticed
+        ent.attributes['level'] = 2
+        ent.update_ha_state()
+        assert self.hass.states.get('sensor.value').attributes['level'] == 2
+        assert self.hass.states.write_stats['skipped'] == skipped + 1
+
+        ent.value = 'b'
+        ent.update_ha_state()
+        assert self.hass.states.get('sensor.value').state == 'b'
+        assert self.hass.states.write_stats['skipped'] == skipped + 1
+
     def test_generate_entity_id_given_hass(self):
         """Test generating an entity id given hass object."""
         fmt = 'test.{}'
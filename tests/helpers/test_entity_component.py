@@ -2,17 +2,24 @@
 # pylint: disable=protected-access
 import asyncio
 from collections import OrderedDict
+from datetime import timedelta
 import logging
 import unittest
-from unittest.mock import patch, Mock
+from unittest.mock import patch, Mock, PropertyMock
+
+import requests
 
 import homeassistant.core as ha
 import homeassistant.loader as loader
+from homeassistant.const import EVENT_HOMEASSISTANT_START, STATE_UNKNOWN
 from homeassistant.components import group
+from homeassistant.exceptions import PlatformNotReady
 from homeassistant.helpers.entity import Entity, generate_entity_id
 from homeassistant.helpers.entity_component import EntityComponent
-from homeassistant.helpers import discovery
+from homeassistant.helpers import discovery, entity_component
 import homeassistant.util.dt as dt_util
+from homeassistant.util.async import (
+    run_callback_threadsafe, run_coroutine_threadsafe)
 
 from tests.common import (
     get_test_home_assistant, MockPlatform, MockModule, fire_time_changed,
@@ -106,7 +113,7 @@ class TestHelpersEntityComponent(unittest.TestCase):
         no_poll_ent.async_update.reset_mock()
         poll_ent.async_update.reset_mock()
 
-        fire_time_changed(self.hass, dt_util.utcnow().replace(second=0))
+        fire_time_changed(self.hass, dt_util.utcnow() + timedelta(seconds=20))
         self.hass.block_till_done()
 
         assert not no_poll_ent.async_update.called
@@ -123,7 +130,8 @@ class TestHelpersEntityComponent(unittest.TestCase):
         assert 1 == len(self.hass.states.entity_ids())
         ent2.update = lambda *_: component.add_entities([ent1])
 
-        fire_time_changed(self.hass, dt_util.utcnow().replace(second=0))
+        fire_time_changed(self.hass, dt_util.utcnow() + timedelta(
+            seconds=entity_component.DEFAULT_SCAN_INTERVAL))
         self.hass.block_till_done()
 
         assert 2 == len(self.hass.states.entity_ids())
@@ -154,6 +162,42 @@ class TestHelpersEntityComponent(unittest.TestCase):
         assert 1 == len(self.hass.states.entity_ids())
         assert not ent.update.called
 
+    def test_deferred_first_update(self):
+        """Test first updates are deferred till Home Assistant started."""
+        self.hass.config.defer_first_update = True
+        self.hass.state = ha.CoreState.not_running
+        component = EntityComponent(_LOGGER, DOMAIN, self.hass)
+
+        ent = EntityTest()
+        ent.update = Mock(spec_set=True)
+
+        component.add_entities([ent], True)
+        self.hass.block_till_done()
+
+        assert 1 == len(self.hass.states.entity_ids())
+        assert not ent.update.called
+
+        self.hass.state = ha.CoreState.running
+        self.hass.bus.fire(EVENT_HOMEASSISTANT_START)
+        self.hass.block_till_done()
+
+        assert ent.update.called
+
+    def test_deferred_first_update_invalid_state(self):
+        """Test entities without a state before the update are unknown."""
+        self.hass.config.defer_first_update = True
+        self.hass.state = ha.CoreState.not_running
+        component = EntityComponent(_LOGGER, DOMAIN, self.hass)
+
+        ent = EntityTest()
+        with patch.object(EntityTest, 'state', new_callable=PropertyMock,
+                          side_effect=AttributeError):
+            run_coroutine_threadsafe(
+                component.async_add_entity(ent, update_before_add=True),
+                self.hass.loop).result()
+
+        assert STATE_UNKNOWN == self.hass.states.get(ent.entity_id).state
+
     def test_adds_entities_with_update_befor_add_true_deadlock_protect(self):
         """Test if call update befor add to state machine.
 
@@ -291,8 +335,152 @@ class TestHelpersEntityComponent(unittest.TestCase):
         assert platform1_setup.called
         assert platform2_setup.called
 
+    def test_setup_retries_platform_not_ready(self):
+        """Test a platform that is not ready is set up again later."""
+        platform_setup = Mock(side_effect=[PlatformNotReady, None])
+        loader.set_component('test_domain.mod1', MockPlatform(platform_setup))
+
+        component = EntityComponent(_LOGGER, DOMAIN, self.hass)
+        component.setup({DOMAIN: {'platform': 'mod1'}})
+
+        assert platform_setup.call_count == 1
+        assert 'test_domain.mod1' not in self.hass.config.components
+
+        fire_time_changed(self.hass, dt_util.utcnow() + timedelta(
+            seconds=entity_component.PLATFORM_RETRY_DELAY))
+        self.hass.block_till_done()
+
+        assert platform_setup.call_count == 2
+        assert 'test_domain.mod1' in self.hass.config.components
+
+    def test_setup_retries_connection_errors(self):
+        """Test a platform that cannot connect is set up again later."""
+        platform_setup = Mock(
+            side_effect=[requests.exceptions.ConnectionError, None])
+        loader.set_component('test_domain.mod1', MockPlatform(platform_setup))
+
+        component = EntityComponent(_LOGGER, DOMAIN, self.hass)
+        component.setup({DOMAIN: {'platform': 'mod1'}})
+
+        fire_time_changed(self.hass, dt_util.utcnow() + timedelta(
+            seconds=entity_component.PLATFORM_RETRY_DELAY))
+        self.hass.block_till_done()
+
+        assert platform_setup.call_count == 2
+        assert 'test_domain.mod1' in self.hass.config.components
+
+    @patch('homeassistant.helpers.entity_component.'
+           'PLATFORM_SETUP_ATTEMPT_TIMEOUT', 0.01)
+    def test_setup_retries_hanging_platform(self):
+        """Test a platform that does not finish its setup is retried."""
+        calls = []
+
+        class HangingPlatform(object):
+            """Platform that never finishes its setup."""
+
+            DEPENDENCIES = []
+
+            @asyncio.coroutine
+            def async_setup_platform(self, hass, config, async_add_devices,
+                                     discovery_info=None):
+                """Setup the platform."""
+                calls.append(1)
+                yield from asyncio.Event(loop=hass.loop).wait()
+
+        loader.set_component('test_domain.hang', HangingPlatform())
+
+        component = EntityComponent(_LOGGER, DOMAIN, self.hass)
+        component.setup({DOMAIN: {'platform': 'hang'}})
+        self.hass.block_till_done()
+
+        fire_time_changed(self.hass, dt_util.utcnow() + timedelta(
+            seconds=entity_component.PLATFORM_RETRY_DELAY))
+        self.hass.block_till_done()
+
+        assert len(calls) == 2
+        assert 'test_domain.hang' not in self.hass.config.components
+
+    def test_setup_does_not_retry_platform_errors(self):
+        """Test a platform raising an unexpected error is not set up again."""
+        platform_setup = Mock(side_effect=[ValueError, None])
+        loader.set_component('test_domain.mod1', MockPlatform(platform_setup))
+
+        component = EntityComponent(_LOGGER, DOMAIN, self.hass)
+        component.setup({DOMAIN: {'platform': 'mod1'}})
+
+        fire_time_changed(self.hass, dt_util.utcnow() + timedelta(
+            seconds=entity_component.PLATFORM_RETRY_DELAY))
+        self.hass.block_till_done()
+
+        assert platform_setup.call_count == 1
+        assert 'test_domain.mod1' not in self.hass.config.components
+
+    @patch('homeassistant.helpers.entity_component.PLATFORM_SETUP_TIMEOUT',
+           0)
+    def test_reset_cancels_platform_setup(self):
+        """Test a reset cancels platforms still setting up."""
+        event = asyncio.Event(loop=self.hass.loop)
+
+        class SlowPlatform(object):
+            """Platform that waits for the event during setup."""
+
+            DEPENDENCIES = []
+
+            @asyncio.coroutine
+            def async_setup_platform(self, hass, config, async_add_devices,
+                                     discovery_info=None):
+                """Setup the platform."""
+                yield from event.wait()
+                yield from async_add_devices([EntityTest(name='slow')])
+
+        loader.set_component('test_domain.slow', SlowPlatform())
+
+        component = EntityComponent(_LOGGER, DOMAIN, self.hass)
+        component.setup({DOMAIN: {'platform': 'slow'}})
+        component.reset()
+
+        run_callback_threadsafe(self.hass.loop, event.set).result()
+        self.hass.block_till_done()
+
+        assert 'test_domain.slow' not in self.hass.config.components
+        assert len(self.hass.states.entity_ids()) == 0
+
+    @patch('homeassistant.helpers.entity_component.PLATFORM_SETUP_TIMEOUT',
+           0)
+    def test_setup_does_not_wait_for_slow_platform(self):
+        """Test a slow platform does not block the component setup."""
+        event = asyncio.Event(loop=self.hass.loop)
+
+        class SlowPlatform(object):
+            """Platform that waits for the event during setup."""
+
+            DEPENDENCIES = []
+
+            @asyncio.coroutine
+            def async_setup_platform(self, hass, config, async_add_devices,
+                                     discovery_info=None):
+                """Setup the platform."""
+                yield from event.wait()
+
+        loader.set_component('test_domain.slow', SlowPlatform())
+        loader.set_component('test_domain.fast', MockPlatform())
+
+        component = EntityComponent(_LOGGER, DOMAIN, self.hass)
+        component.setup(OrderedDict([
+            (DOMAIN, {'platform': 'slow'}),
+            ("{} 2".format(DOMAIN), {'platform': 'fast'}),
+        ]))
+
+        assert 'test_domain.slow' not in self.hass.config.components
+
+        run_callback_threadsafe(self.hass.loop, event.set).result()
+        self.hass.block_till_done()
+
+        assert 'test_domain.slow' in self.hass.config.components
+        assert 'test_domain.fast' in self.hass.config.components
+
     @patch('homeassistant.helpers.entity_component.EntityComponent'
-           '._async_setup_platform')
+           '._async_setup_platform', return_value=mock_coro()())
     @patch('homeassistant.bootstrap.async_setup_component',
            return_value=mock_coro(True)())
     def test_setup_does_discovery(self, mock_setup_component, mock_setup):
@@ -310,8 +498,8 @@ class TestHelpersEntityComponent(unittest.TestCase):
         assert ('platform_test', {}, {'msg': 'discovery_info'}) == \
             mock_setup.call_args[0]
 
-    @patch('homeassistant.helpers.entity_component.'
-           'async_track_utc_time_change')
+    @patch('homeassistant.helpers.poll_scheduler.PollScheduler.'
+           'async_add_entity')
     def test_set_scan_interval_via_config(self, mock_track):
         """Test the setting of the scan interval via configuration."""
         def platform_setup(hass, config, add_devices, discovery_info=None):
@@ -331,10 +519,10 @@ class TestHelpersEntityComponent(unittest.TestCase):
         })
 
         assert mock_track.called
-        assert [0, 30] == list(mock_track.call_args[1]['second'])
+        assert 30 == mock_track.call_args[0][1]
 
-    @patch('homeassistant.helpers.entity_component.'
-           'async_track_utc_time_change')
+    @patch('homeassistant.helpers.poll_scheduler.PollScheduler.'
+           'async_add_entity')
     def test_set_scan_interval_via_platform(self, mock_track):
         """Test the setting of the scan interval via platform."""
         def platform_setup(hass, config, add_devices, discovery_info=None):
@@ -355,7 +543,7 @@ class TestHelpersEntityComponent(unittest.TestCase):
         })
 
         assert mock_track.called
-        assert [0, 30] == list(mock_track.call_args[1]['second'])
+        assert 30 == mock_track.call_args[0][1]
 
     def test_set_entity_namespace_via_config(self):
         """Test setting an entity namespace."""
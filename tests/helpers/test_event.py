@@ -15,9 +15,13 @@ from homeassistant.helpers.event import (
     track_utc_time_change,
     track_time_change,
     track_state_change,
+    track_template,
+    track_indexed_state_change,
+    track_indexed_template,
     track_sunrise,
     track_sunset,
 )
+from homeassistant.helpers.template import Template
 from homeassistant.components import sun
 import homeassistant.util.dt as dt_util
 
@@ -187,6 +191,139 @@ class TestEventHelpers(unittest.TestCase):
         self.assertEqual(5, len(wildcard_runs))
         self.assertEqual(6, len(wildercard_runs))
 
+    def test_track_template(self):
+        """Test tracking the states a template read."""
+        runs = []
+        tpl = Template(
+            "{{ states.switch.test.state if is_state('switch.mode', 'on') "
+            "else states.light.test.state }}", self.hass)
+
+        track_template(self.hass, tpl,
+                       lambda entity_id, old_s, new_s: runs.append(entity_id))
+
+        # Every change passes till the template was rendered
+        self.hass.states.set('light.test', 'on')
+        self.hass.block_till_done()
+        self.assertEqual(['light.test'], runs)
+
+        self.hass.states.set('switch.mode', 'on')
+        tpl.render()
+
+        self.hass.states.set('light.test', 'off')
+        self.hass.states.set('switch.test', 'on')
+        self.hass.block_till_done()
+        self.assertEqual(['light.test', 'switch.mode', 'switch.test'], runs)
+
+        self.hass.states.set('switch.mode', 'off')
+        tpl.render()
+
+        self.hass.states.set('switch.test', 'off')
+        self.hass.states.set('light.test', 'on')
+        self.hass.block_till_done()
+        self.assertEqual(
+            ['light.test', 'switch.mode', 'switch.test', 'switch.mode',
+             'light.test'], runs)
+
+    def test_track_template_without_states(self):
+        """Test a template that reads no states follows every change."""
+        runs = []
+        tpl = Template("{{ now().hour }}", self.hass)
+
+        track_template(self.hass, tpl,
+                       lambda entity_id, old_s, new_s: runs.append(entity_id))
+
+        tpl.render()
+        self.assertFalse(tpl.render_info.entities)
+
+        self.hass.states.set('light.test', 'on')
+        self.hass.states.set('switch.test', 'on')
+        self.hass.block_till_done()
+        self.assertEqual(['light.test', 'switch.test'], runs)
+
+    def test_track_indexed_state_change(self):
+        """Test indexed state trackers share one bus listener."""
+        light_runs = []
+        on_runs = []
+        all_runs = []
+
+        unsub_light = track_indexed_state_change(
+            self.hass, 'light.Bowl',
+            lambda entity_id, old_s, new_s: light_runs.append(entity_id))
+        unsub_on = track_indexed_state_change(
+            self.hass, ['light.bowl', 'switch.fan'],
+            lambda entity_id, old_s, new_s: on_runs.append(entity_id),
+            'off', 'on')
+        unsub_all = track_indexed_state_change(
+            self.hass, MATCH_ALL,
+            lambda entity_id, old_s, new_s: all_runs.append(entity_id))
+
+        self.assertEqual(
+            1, self.hass.bus.listeners.get(ha.EVENT_STATE_CHANGED))
+
+        self.hass.states.set('light.bowl', 'off')
+        self.hass.states.set('light.bowl', 'on')
+        self.hass.states.set('switch.fan', 'off')
+        self.hass.states.set('switch.fan', 'on')
+        self.hass.states.set('light.other', 'on')
+        self.hass.block_till_done()
+
+        self.assertEqual(['light.bowl', 'light.bowl'], light_runs)
+        self.assertEqual(['light.bowl', 'switch.fan'], on_runs)
+        self.assertEqual(5, len(all_runs))
+
+        unsub_light()
+        unsub_on()
+        self.hass.states.set('light.bowl', 'off')
+        self.hass.block_till_done()
+        self.assertEqual(2, len(light_runs))
+        self.assertEqual(6, len(all_runs))
+
+        unsub_all()
+        self.assertIsNone(
+            self.hass.bus.listeners.get(ha.EVENT_STATE_CHANGED))
+
+    def test_track_indexed_template(self):
+        """Test the indexed template tracker follows the last render."""
+        runs = []
+        tpl = Template("{{ states.sensor | list | count }} "
+                       "{{ is_state('switch.test', 'on') }}", self.hass)
+
+        @ha.callback
+        def action(entity_id, old_s, new_s):
+            """Render the template like the template trigger."""
+            runs.append(entity_id)
+            tpl.async_render()
+
+        track_indexed_template(self.hass, tpl, action)
+
+        self.hass.states.set('light.test', 'on')
+        self.hass.block_till_done()
+        self.assertEqual(['light.test'], runs)
+
+        self.hass.states.set('light.test', 'off')
+        self.hass.states.set('sensor.new', '1')
+        self.hass.states.set('switch.test', 'on')
+        self.hass.block_till_done()
+        self.assertEqual(['light.test', 'sensor.new', 'switch.test'], runs)
+
+    def test_track_indexed_template_without_states(self):
+        """Test an indexed template that reads no states follows all."""
+        runs = []
+        tpl = Template("{{ now().hour }}", self.hass)
+
+        @ha.callback
+        def action(entity_id, old_s, new_s):
+            """Render the template like the template trigger."""
+            runs.append(entity_id)
+            tpl.async_render()
+
+        track_indexed_template(self.hass, tpl, action)
+
+        self.hass.states.set('light.test', 'on')
+        self.hass.states.set('switch.test', 'on')
+        self.hass.block_till_done()
+        self.assertEqual(['light.test', 'switch.test'], runs)
+
     def test_track_sunrise(self):
         """Test track the sunrise."""
         latitude = 32.87336
@@ -0,0 +1,172 @@
+"""Test the poll scheduler."""
+from datetime import timedelta
+import logging
+import unittest
+from unittest.mock import Mock, patch
+
+from homeassistant.helpers import poll_scheduler
+from homeassistant.helpers.entity import Entity
+import homeassistant.util.dt as dt_util
+from homeassistant.util.async import run_callback_threadsafe
+
+from tests.common import get_test_home_assistant, fire_time_changed
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PollEntity(Entity):
+    """Entity counting its updates."""
+
+    def __init__(self, entity_id):
+        """Initialize the entity."""
+        self.entity_id = entity_id
+        self.value = 0
+        self.updates = 0
+        self.fail = False
+
+    @property
+    def state(self):
+        """Return the state of the entity."""
+        return self.value
+
+    def update(self):
+        """Count the update."""
+        self.updates += 1
+        if self.fail:
+            raise OSError('Device gone')
+
+
+class TestPollScheduler(unittest.TestCase):
+    """Test the poll scheduler."""
+
+    # pylint: disable=invalid-name
+    def setUp(self):
+        """Setup things to be run when tests are started."""
+        self.hass = get_test_home_assistant()
+        self.now = dt_util.utcnow()
+        self.scheduler = run_callback_threadsafe(
+            self.hass.loop, poll_scheduler.async_get_poll_scheduler,
+            self.hass).result()
+
+    # pylint: disable=invalid-name
+    def tearDown(self):
+        """Stop everything that was started."""
+        self.hass.stop()
+
+    def add_entity(self, entity, scan_interval, phase=0, backoff=False):
+        """Add an entity to the scheduler with a fixed phase."""
+        entity.hass = self.hass
+        with patch('homeassistant.helpers.poll_scheduler.random.uniform',
+                   return_value=phase), \
+                patch('homeassistant.util.dt.utcnow', return_value=self.now):
+            run_callback_threadsafe(
+                self.hass.loop, self.scheduler.async_add_entity, entity,
+                scan_interval, _LOGGER, None, backoff).result()
+
+    def tick(self, seconds):
+        """Fire a time changed event seconds after the start."""
+        fire_time_changed(self.hass, self.now + timedelta(seconds=seconds))
+        self.hass.block_till_done()
+
+    def test_phase(self):
+        """Test entities are polled at their own phase of the interval."""
+        ent1 = PollEntity('sensor.one')
+        ent2 = PollEntity('sensor.two')
+        self.add_entity(ent1, 10, phase=2)
+        self.add_entity(ent2, 10, phase=7)
+
+        self.tick(2)
+        assert (ent1.updates, ent2.updates) == (1, 0)
+
+        self.tick(7)
+        assert (ent1.updates, ent2.updates) == (1, 1)
+
+    def test_no_backoff_by_default(self):
+        """Test the interval stays the same if backoff is not asked for."""
+        ent = PollEntity('sensor.one')
+        self.add_entity(ent, 10)
+
+        for seconds, updates in ((0, 1), (10, 2), (20, 3), (30, 4)):
+            self.tick(seconds)
+            assert ent.updates == updates, seconds
+
+    def test_backoff_unchanged(self):
+        """Test the interval backs off while the state does not change."""
+        ent = PollEntity('sensor.one')
+        self.add_entity(ent, 10, backoff=True)
+
+        for seconds, updates in ((0, 1), (10, 2), (20, 2), (30, 3),
+                                 (60, 3), (70, 4), (110, 5)):
+            self.tick(seconds)
+            assert ent.updates == updates, seconds
+
+        # Back to the configured interval once the state changes
+        ent.value = 1
+        self.tick(150)
+        assert ent.updates == 6
+        self.tick(160)
+        assert ent.updates == 7
+        self.tick(170)
+        assert ent.updates == 7
+
+    def test_backoff_error(self):
+        """Test failing updates are logged and back off."""
+        ent = PollEntity('sensor.one')
+        ent.fail = True
+        self.add_entity(ent, 10)
+
+        with patch.object(_LOGGER, 'exception') as mock_log:
+            self.tick(0)
+            self.tick(10)
+            self.tick(20)
+
+        assert ent.updates == 2
+        assert mock_log.call_count == 2
+
+        self.tick(40)
+        assert ent.updates == 2
+
+    def test_skip_not_polling(self):
+        """Test entities that stop polling are not updated."""
+        ent = PollEntity('sensor.one')
+        ent.update = Mock()
+        self.add_entity(ent, 10)
+
+        with patch.object(PollEntity, 'should_poll', False):
+            self.tick(0)
+
+        assert not ent.update.called
+
+        self.tick(10)
+        assert ent.update.called
+
+    def test_start_polling_on_state_write(self):
+        """Test an entity added without polling is polled once it does."""
+        ent = PollEntity('sensor.one')
+
+        with patch.object(PollEntity, 'should_poll', False):
+            self.add_entity(ent, 10)
+            self.tick(0)
+            self.tick(10)
+
+        assert ent.updates == 0
+
+        with patch('homeassistant.helpers.poll_scheduler.random.uniform',
+                   return_value=0), \
+                patch('homeassistant.util.dt.utcnow',
+                      return_value=self.now + timedelta(seconds=20)):
+            ent.update_ha_state()
+
+        self.tick(20)
+        assert ent.updates == 1
+
+    def test_remove(self):
+        """Test removed entities are no longer polled."""
+        ent = PollEntity('sensor.one')
+        self.add_entity(ent, 10, phase=5)
+
+        run_callback_threadsafe(
+            self.hass.loop, self.scheduler.async_remove_entity, ent).result()
+
+        self.tick(5)
+        assert ent.updates == 0
@@ -0,0 +1,81 @@
+"""Test the restore state helper."""
+from datetime import datetime
+import os
+import unittest
+
+from homeassistant.const import (
+    EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STOP)
+from homeassistant.core import State
+from homeassistant.helpers import restore_state
+from homeassistant.util.async import run_coroutine_threadsafe
+
+from tests.common import get_test_home_assistant
+
+
+class TestRestoreState(unittest.TestCase):
+    """Test the restore state helper."""
+
+    # pylint: disable=invalid-name
+    def setUp(self):
+        """Setup things to be run when tests are started."""
+        self.hass = get_test_home_assistant()
+        self.path = self.hass.config.path(restore_state.RESTORE_FILE)
+
+    # pylint: disable=invalid-name
+    def tearDown(self):
+        """Stop everything that was started."""
+        self.hass.stop()
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+
+    def test_save_and_load(self):
+        """Test states survive a round trip, unknown states are skipped."""
+        states = [
+            State('input_boolean.b1', 'on', {'since': datetime(2016, 1, 1)}),
+            State('sensor.temperature', '21.5', {'unit': 'C'}),
+            State('sensor.missing', 'unknown'),
+        ]
+
+        restore_state.save_restore_cache(self.path, states)
+        cache = restore_state.load_restore_cache(self.path)
+
+        assert sorted(cache) == ['input_boolean.b1', 'sensor.temperature']
+        assert cache['sensor.temperature'] == states[1]
+        assert cache['input_boolean.b1'].attributes['since'] == \
+            '2016-01-01T00:00:00'
+
+    def test_load_missing_or_invalid(self):
+        """Test nothing is restored from a missing or broken file."""
+        assert restore_state.load_restore_cache(self.path) == {}
+
+        with open(self.path, 'w') as fil:
+            fil.write('[{"entity_id": ')
+
+        assert restore_state.load_restore_cache(self.path) == {}
+
+    def test_restore_till_started(self):
+        """Test states are restorable till started and saved on stop."""
+        restore_state.save_restore_cache(
+            self.path, [State('input_boolean.b1', 'on')])
+
+        run_coroutine_threadsafe(
+            restore_state.async_setup_restore_state(self.hass),
+            self.hass.loop).result()
+
+        assert restore_state.has_restore_cache(self.hass)
+        assert restore_state.async_get_last_state(
+            self.hass, 'input_boolean.b1').state == 'on'
+
+        self.hass.bus.fire(EVENT_HOMEASSISTANT_START)
+        self.hass.block_till_done()
+
+        assert not restore_state.has_restore_cache(self.hass)
+        assert restore_state.async_get_last_state(
+            self.hass, 'input_boolean.b1') is None
+
+        self.hass.states.set('input_boolean.b2', 'off')
+        self.hass.bus.fire(EVENT_HOMEASSISTANT_STOP)
+        self.hass.block_till_done()
+
+        assert list(restore_state.load_restore_cache(self.path)) == \
+            ['input_boolean.b2']
@@ -1,5 +1,6 @@
 """The tests for the Script component."""
 # pylint: disable=protected-access
+import asyncio
 from datetime import timedelta
 from unittest import mock
 import unittest
@@ -8,7 +9,7 @@ from homeassistant.core import callback
 # Otherwise can't test just this file (import order issue)
 import homeassistant.components  # noqa
 import homeassistant.util.dt as dt_util
-from homeassistant.helpers import script, config_validation as cv
+from homeassistant.helpers import run_trace, script, config_validation as cv
 
 from tests.common import fire_time_changed, get_test_home_assistant
 
@@ -353,3 +354,161 @@ class TestScriptHelper(unittest.TestCase):
         script_obj.run()
         self.hass.block_till_done()
         assert len(script_obj._config_cache) == 2
+
+    def test_trace_runs(self):
+        """Test the steps of the last runs are traced."""
+        self.hass.config.trace_runs = 2
+        self.hass.states.set('test.entity', 'hello')
+
+        script_obj = script.Script(self.hass, cv.SCRIPT_SCHEMA([
+            {'event': 'test_event'},
+            {'delay': {'seconds': 5}},
+            {
+                'condition': 'template',
+                'value_template': '{{ states.test.entity.state == "hello" }}',
+            },
+            {'event': 'test_event'},
+        ]), 'Test Script')
+
+        script_obj.run()
+        self.hass.block_till_done()
+
+        tracer = run_trace.get_tracer(self.hass)
+        trace = tracer.as_dict()['script']['Test Script'][0]
+        assert trace['outcome'] == 'running'
+        assert [step['type'] for step in trace['steps']] == \
+            ['event', 'delay']
+        assert trace['steps'][1]['result'] == '0:00:05'
+
+        future = dt_util.utcnow() + timedelta(seconds=5)
+        fire_time_changed(self.hass, future)
+        self.hass.block_till_done()
+
+        trace = tracer.as_dict()['script']['Test Script'][0]
+        assert trace['outcome'] == 'finished'
+        assert [step['type'] for step in trace['steps']] == \
+            ['event', 'delay', 'condition', 'event']
+        assert trace['steps'][2]['result'] is True
+        assert trace['duration'] >= trace['steps'][3]['start']
+
+        self.hass.states.set('test.entity', 'goodbye')
+
+        for _ in range(2):
+            script_obj.run()
+            fire_time_changed(self.hass, dt_util.utcnow() +
+                              timedelta(seconds=5))
+            self.hass.block_till_done()
+
+        traces = tracer.as_dict()['script']['Test Script']
+        assert len(traces) == 2
+        assert [trace['outcome'] for trace in traces] == \
+            ['condition', 'condition']
+
+    def test_trace_disabled(self):
+        """Test nothing is recorded if runs are not traced."""
+        script_obj = script.Script(self.hass, cv.SCRIPT_SCHEMA([
+            {'event': 'test_event'}]), 'Test Script')
+
+        script_obj.run()
+        self.hass.block_till_done()
+
+        assert run_trace.get_tracer(self.hass) is run_trace.NOOP_TRACER
+        assert run_trace.NOOP_RUN.steps == []
+
+    def test_parallel_action(self):
+        """Test the services of a parallel action are called together."""
+        started = []
+        all_started = asyncio.Event(loop=self.hass.loop)
+
+        @asyncio.coroutine
+        def slow_service(call):
+            """Wait till both services are called."""
+            started.append(call.service)
+            if len(started) == 2:
+                all_started.set()
+            yield from asyncio.wait_for(all_started.wait(), 5,
+                                        loop=self.hass.loop)
+
+        self.hass.services.register('test', 'one', slow_service)
+        self.hass.services.register('test', 'two', slow_service)
+
+        script_obj = script.Script(self.hass, cv.SCRIPT_SCHEMA([
+            {'parallel': [{'service': 'test.one'}, {'service': 'test.two'}]},
+            {'event': 'test_event'}]))
+
+        events = []
+        self.hass.bus.listen('test_event', events.append)
+
+        script_obj.run()
+        self.hass.block_till_done()
+
+        assert sorted(started) == ['one', 'two']
+        assert len(events) == 1
+        assert not script_obj.is_running
+
+    def _run_modes_script(self, mode, max_runs=script.DEFAULT_MAX_RUNS):
+        """Return a script firing its variable after a delay."""
+        events = []
+
+        @callback
+        def record_event(event):
+            """Add recorded event to set."""
+            events.append(event.data['run'])
+
+        self.hass.bus.listen('test_event', record_event)
+
+        script_obj = script.Script(self.hass, cv.SCRIPT_SCHEMA([
+            {'delay': {'seconds': 5}},
+            {'event': 'test_event', 'event_data': {'run': 'done'}}]),
+            mode=mode, max_runs=max_runs)
+
+        return script_obj, events
+
+    def _fire_delay(self):
+        """Fire the time changed event ending the delays."""
+        fire_time_changed(self.hass,
+                          dt_util.utcnow() + timedelta(seconds=5))
+        self.hass.block_till_done()
+
+    def test_mode_restart(self):
+        """Test restart scripts stop the running run."""
+        script_obj, events = self._run_modes_script(script.MODE_RESTART)
+
+        script_obj.run()
+        script_obj.run()
+        assert len(script_obj._runs) == 1
+
+        self._fire_delay()
+        assert events == ['done']
+        assert not script_obj.is_running
+
+    def test_mode_queued(self):
+        """Test queued scripts run one after the other."""
+        script_obj, events = self._run_modes_script(script.MODE_QUEUED, 1)
+
+        script_obj.run()
+        script_obj.run()
+        script_obj.run()
+        assert len(script_obj._runs) == 1
+        assert len(script_obj._queue) == 1
+
+        self._fire_delay()
+        assert events == ['done']
+        assert script_obj.is_running
+
+        self._fire_delay()
+        assert events == ['done', 'done']
+        assert not script_obj.is_running
+
+    def test_mode_parallel(self):
+        """Test parallel scripts run at the same time up to max_runs."""
+        script_obj, events = self._run_modes_script(script.MODE_PARALLEL, 2)
+
+        script_obj.run()
+        script_obj.run()
+        script_obj.run()
+        assert len(script_obj._runs) == 2
+
+        self._fire_delay()
+        assert events == ['done', 'done']
+        assert not script_obj.is_running
@@ -0,0 +1,95 @@
+"""Test the startup trace helper."""
+import json
+import os
+import unittest
+
+from homeassistant.const import EVENT_HOMEASSISTANT_START
+from homeassistant.helpers import startup_trace
+from homeassistant.util.async import run_callback_threadsafe
+
+from tests.common import get_test_home_assistant
+
+
+class TestStartupTrace(unittest.TestCase):
+    """Test the startup tracer."""
+
+    # pylint: disable=invalid-name
+    def setUp(self):
+        """Setup things to be run when tests are started."""
+        self.hass = get_test_home_assistant()
+        self.trace_path = self.hass.config.path(startup_trace.TRACE_FILE)
+
+    # pylint: disable=invalid-name
+    def tearDown(self):
+        """Stop everything that was started."""
+        self.hass.stop()
+        if os.path.isfile(self.trace_path):
+            os.remove(self.trace_path)
+
+    def test_span(self):
+        """Test spans are recorded as complete events."""
+        tracer = startup_trace.StartupTracer()
+
+        with tracer.span('setup', 'light', platforms=2):
+            pass
+
+        event, = tracer.as_dict()['traceEvents']
+        assert event['name'] == 'light'
+        assert event['cat'] == 'setup'
+        assert event['ph'] == 'X'
+        assert event['args'] == {'platforms': 2}
+        assert event['dur'] >= 0
+
+    def test_profile(self):
+        """Test profiles are only recorded when enabled."""
+        tracer = startup_trace.StartupTracer()
+        assert tracer.run_profiled('light', sum, [1, 2]) == 3
+        assert tracer.profiles == {}
+
+        tracer.profile = True
+        assert tracer.run_profiled('light', sum, [1, 2]) == 3
+        assert 'function calls' in tracer.profiles['light']
+
+    def test_noop_tracer(self):
+        """Test nothing is recorded if startup is not traced."""
+        tracer = startup_trace.get_tracer(self.hass)
+
+        with tracer.span('setup', 'light'):
+            pass
+
+        assert tracer is startup_trace.NOOP_TRACER
+        assert tracer.events == []
+
+    def test_trace_not_written_without_profile(self):
+        """Test the trace is only finished if startup is not profiled."""
+        tracer = run_callback_threadsafe(
+            self.hass.loop, startup_trace.async_setup_tracer,
+            self.hass).result()
+
+        self.hass.bus.fire(EVENT_HOMEASSISTANT_START)
+        self.hass.block_till_done()
+
+        assert tracer.finished
+        assert not os.path.isfile(self.trace_path)
+
+    def test_trace_written_on_start(self):
+        """Test the trace is finished and written once started."""
+        tracer = run_callback_threadsafe(
+            self.hass.loop, startup_trace.async_setup_tracer,
+            self.hass, True).result()
+
+        with tracer.span('setup', 'light'):
+            pass
+
+        self.hass.bus.fire(EVENT_HOMEASSISTANT_START)
+        self.hass.block_till_done()
+
+        assert tracer.finished
+        with tracer.span('setup', 'switch'):
+            pass
+
+        with open(self.trace_path) as fil:
+            trace = json.load(fil)
+
+        assert [event['name'] for event in trace['traceEvents']] == \
+            ['light', 'startup']
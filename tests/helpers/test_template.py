@@ -688,3 +688,116 @@ is_state_attr('device_tracker.phone_2', 'battery', 40)
     states.sensor.pick_humidity.state ~ „ %“
 }}
             """)))
+
+    def test_render_info_entities(self):
+        """Test the entities read while rendering are recorded."""
+        tpl = template.Template("""
+{% if is_state('sensor.switch', 'on') %}
+  {{ states.sensor.temperature.state }}
+{% else %}
+  {{ states('sensor.humidity') }}
+{% endif %}
+        """, self.hass)
+        self.assertIsNone(tpl.render_info)
+
+        self.hass.states.set('sensor.switch', 'on')
+        tpl.render()
+        self.assertEqual({'sensor.switch', 'sensor.temperature'},
+                         tpl.render_info.entities)
+        self.assertFalse(tpl.render_info.filter('sensor.humidity'))
+
+        self.hass.states.set('sensor.switch', 'off')
+        tpl.render()
+        self.assertEqual({'sensor.switch', 'sensor.humidity'},
+                         tpl.render_info.entities)
+
+    def test_render_info_domains(self):
+        """Test iterating states records the domain or all states."""
+        tpl = template.Template(
+            '{{ states.sensor | map(attribute="state") | join(",") }}',
+            self.hass)
+        tpl.render()
+        self.assertEqual({'sensor'}, tpl.render_info.domains)
+        self.assertTrue(tpl.render_info.filter('sensor.new'))
+        self.assertFalse(tpl.render_info.filter('light.new'))
+
+        tpl = template.Template('{{ states | list | count }}', self.hass)
+        tpl.render()
+        self.assertTrue(tpl.render_info.all_states)
+        self.assertTrue(tpl.render_info.filter('light.new'))
+
+    def test_compile_cache(self):
+        """Test templates with the same source share the compiled code."""
+        template.clear_compile_cache()
+
+        with patch.object(template.ENV, 'compile',
+                          wraps=template.ENV.compile) as mock_compile:
+            tpl1 = template.Template('{{ 1 + 1 }}', self.hass)
+            tpl2 = template.Template('{{ 1 + 1 }}', self.hass)
+            self.assertEqual('2', tpl1.render())
+            self.assertEqual('2', tpl2.render())
+
+        self.assertEqual(1, mock_compile.call_count)
+        self.assertEqual({'hits': 1, 'misses': 1, 'size': 1},
+                         template.compile_cache_info())
+
+    def test_compile_cache_size(self):
+        """Test the least recently used sources are dropped."""
+        template.clear_compile_cache()
+
+        with patch.object(template, 'COMPILE_CACHE_SIZE', 2):
+            template.compile_template('{{ 1 }}')
+            template.compile_template('{{ 2 }}')
+            template.compile_template('{{ 1 }}')
+            template.compile_template('{{ 3 }}')
+
+        self.assertEqual(['{{ 1 }}', '{{ 3 }}'],
+                         list(template._COMPILE_CACHE))
+
+    def test_render_static_without_jinja(self):
+        """Test templates without template syntax skip Jinja."""
+        tpl = template.Template(' Hello world ', self.hass)
+
+        with patch.object(template.Template, '_ensure_compiled') as mock_comp:
+            self.assertEqual('Hello world', tpl.render())
+            self.assertEqual('Hello world',
+                             tpl.render_with_possible_json_value('value'))
+
+        self.assertFalse(mock_comp.called)
+
+    def test_render_simple_without_jinja(self):
+        """Test simple value templates are rendered without Jinja."""
+        value = '{"sensor": {"temperature": 21.456}, "list": [1, "two"]}'
+
+        with patch.object(template.Template, '_ensure_compiled') as mock_comp:
+            for tpl, result in (
+                    ('{{ value_json.sensor.temperature }}', '21.456'),
+                    ('{{ value_json.list[1] }}', 'two'),
+                    ('{{ value_json.sensor.temperature | round(1) }}',
+                     '21.5'),
+                    ('{{ value | length }}', str(len(value)))):
+                self.assertEqual(
+                    result, template.Template(tpl, self.hass)
+                    .render_with_possible_json_value(value), tpl)
+
+        self.assertFalse(mock_comp.called)
+
+    def test_render_simple_falls_back_to_jinja(self):
+        """Test simple templates the evaluator can not handle use Jinja."""
+        for tpl, value, result in (
+                ('{{ value_json.missing }}', '{"hello": "world"}', ''),
+                ('{{ value_json.keys }}', '{"keys": 1}', None),
+                ('{{ value_json }}', 'not json', ''),
+                ('{{ value | float }}', 'abc', '0.0')):
+            rendered = template.Template(tpl, self.hass) \
+                .render_with_possible_json_value(value)
+
+            with patch.object(template, 'parse_simple_template',
+                              return_value=None):
+                expected = template.Template(tpl, self.hass) \
+                    .render_with_possible_json_value(value)
+
+            self.assertEqual(expected, rendered, tpl)
+
+            if result is not None:
+                self.assertEqual(result, rendered, tpl)
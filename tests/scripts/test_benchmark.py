@@ -0,0 +1,24 @@
+"""Test the benchmark script."""
+import unittest
+from unittest.mock import patch
+
+from homeassistant.scripts import benchmark
+
+
+class TestBenchmark(unittest.TestCase):
+    """Tests homeassistant.scripts.benchmark module."""
+
+    @patch('builtins.print')
+    def test_yaml_load(self, mock_print):
+        """Test the YAML benchmark loads a generated config tree."""
+        benchmark.yaml_load(sensor_files=2, sensors_per_file=2,
+                            automations=2)
+
+        output = [call[0][0] for call in mock_print.call_args_list]
+        assert output[0].startswith('Loading a config tree of')
+        assert any(line.startswith('SafeLineLoader') for line in output)
+
+    def test_run_unknown_benchmark(self):
+        """Test an unknown benchmark is rejected."""
+        with self.assertRaises(SystemExit):
+            benchmark.run(['unknown'])
@@ -3,7 +3,9 @@ import asyncio
 import logging
 import os
 import unittest
+from unittest.mock import patch
 
+import homeassistant.loader as loader
 import homeassistant.scripts.check_config as check_config
 from tests.common import patch_yaml_files, get_test_config_dir
 
@@ -39,9 +41,11 @@ def change_yaml_files(check_dict):
 def tearDownModule(self):  # pylint: disable=invalid-name
     """Clean files."""
     # .HA_VERSION created during bootstrap's config update
-    path = get_test_config_dir('.HA_VERSION')
-    if os.path.isfile(path):
-        os.remove(path)
+    for fname in ('.HA_VERSION', check_config.VALIDATION_CACHE,
+                  loader.MANIFEST_FILENAME):
+        path = get_test_config_dir(fname)
+        if os.path.isfile(path):
+            os.remove(path)
 
 
 class TestCheckConfig(unittest.TestCase):
@@ -172,3 +176,44 @@ class TestCheckConfig(unittest.TestCase):
                 'secrets': {'http_pw': 'abc123'},
                 'yaml_files': ['.../secret.yaml', '.../secrets.yaml']
             }, res)
+
+    def test_fast_check(self):
+        """Test a fast check validates schemas and finds missing parts."""
+        files = {
+            'fast.yaml': (BASE_CONFIG +
+                          'http:\n  password: err123\n'
+                          'beer:\n'
+                          'light:\n  - platform: demo\n'
+                          '  - platform: beer'),
+        }
+        with patch_yaml_files(files):
+            res = check_config.check(get_test_config_dir('fast.yaml'), True)
+            change_yaml_files(res)
+
+            self.assertDictEqual(
+                {'light': [{'platform': 'demo'}]}, res['components'])
+            self.assertDictEqual({
+                'http': {'password': 'err123'},
+                check_config.ERROR_STR: ['Component not found: beer',
+                                         'Platform not found: light.beer'],
+            }, res['except'])
+            self.assertListEqual(['.../fast.yaml'], res['yaml_files'])
+
+    def test_fast_check_cache(self):
+        """Test unchanged components are not validated again."""
+        files = {
+            'cached.yaml': BASE_CONFIG + 'light:\n  platform: demo',
+        }
+        with patch_yaml_files(files):
+            config_path = get_test_config_dir('cached.yaml')
+            uncached = check_config.check(config_path, True)
+            self.assertDictEqual({}, uncached['except'])
+
+            with patch('homeassistant.loader.get_platform') as mock_platform:
+                res = check_config.check(config_path, True)
+
+            self.assertFalse(mock_platform.called)
+            self.assertEqual(uncached['components'], res['components'])
+            self.assertListEqual(
+                [{'platform': 'demo'}], res['components']['light'])
+            self.assertDictEqual({}, res['except'])
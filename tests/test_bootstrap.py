@@ -1,5 +1,6 @@
 """Test the bootstrapping."""
 # pylint: disable=protected-access
+import asyncio
 from unittest import mock
 import threading
 import logging
@@ -8,6 +9,7 @@ import voluptuous as vol
 
 from homeassistant import bootstrap, loader
 import homeassistant.util.dt as dt_util
+from homeassistant.util.async import run_coroutine_threadsafe
 from homeassistant.helpers.config_validation import PLATFORM_SCHEMA
 
 from tests.common import \
@@ -228,6 +230,28 @@ class TestBootstrap:
         assert not bootstrap.setup_component(self.hass, 'comp')
         assert 'comp' not in self.hass.config.components
 
+    @mock.patch('homeassistant.util.package.install_packages',
+                return_value=True)
+    @mock.patch('homeassistant.util.package.RequirementsManifest.is_met',
+                side_effect=lambda req: req == 'met==1.0')
+    def test_install_requirements_batched(self, mock_met, mock_install):
+        """Test missing requirements are installed with one pip run."""
+        loader.set_component(
+            'comp_a', MockModule('comp_a', requirements=['a==1.0',
+                                                         'met==1.0']))
+        loader.set_component(
+            'comp_b', MockModule('comp_b', requirements=['b==1.0']))
+        loader.set_component(
+            'comp_b.plat', MockPlatform(requirements=['plat==1.0']))
+
+        bootstrap._install_requirements(self.hass, ['comp_a', 'comp_b'], {
+            'comp_b': {'platform': 'plat'},
+        })
+
+        assert mock_install.call_count == 1
+        assert mock_install.call_args[0][0] == [
+            'a==1.0', 'b==1.0', 'plat==1.0']
+
     def test_component_not_setup_twice_if_loaded_during_other_setup(self):
         """Test component setup while waiting for lock is not setup twice."""
         loader.set_component('comp', MockModule('comp'))
@@ -381,3 +405,127 @@ class TestBootstrap:
         assert bootstrap.setup_component(self.hass, 'disabled_component')
         assert loader.get_component('disabled_component') is not None
         assert 'disabled_component' in self.hass.config.components
+
+    def test_parallel_setup_follows_dependencies(self):
+        """Test components are set up after the components they depend on."""
+        order = []
+
+        def mock_setup(domain):
+            """Return a setup function that records the setup order."""
+            def setup(hass, config):
+                """Record the setup."""
+                order.append(domain)
+                return True
+            return setup
+
+        loader.set_component(
+            'comp_a', MockModule('comp_a', setup=mock_setup('comp_a')))
+        loader.set_component(
+            'comp_b', MockModule('comp_b', ['comp_a'],
+                                 setup=mock_setup('comp_b')))
+        loader.set_component(
+            'comp_c', MockModule('comp_c', ['comp_b'],
+                                 setup=mock_setup('comp_c')))
+
+        run_coroutine_threadsafe(
+            bootstrap._async_setup_components(
+                self.hass, ['comp_c', 'comp_b', 'comp_a'], {}),
+            self.hass.loop).result()
+
+        assert order == ['comp_a', 'comp_b', 'comp_c']
+        assert 'setup_tasks' not in self.hass.data
+        assert not self.hass.data['setup_lock'].locked()
+
+    def test_parallel_setup_concurrency(self):
+        """Test no more components than configured are set up at once."""
+        self.hass.config.setup_concurrency = 2
+        running = []
+        peak = []
+
+        @asyncio.coroutine
+        def async_setup(hass, config):
+            """Track the number of setups running."""
+            running.append(True)
+            peak.append(len(running))
+            yield from asyncio.sleep(0.01, loop=hass.loop)
+            running.pop()
+            return True
+
+        domains = ['comp_{}'.format(idx) for idx in range(5)]
+        for domain in domains:
+            loader.set_component(
+                domain, MockModule(domain, async_setup=async_setup))
+
+        run_coroutine_threadsafe(
+            bootstrap._async_setup_components(self.hass, domains, {}),
+            self.hass.loop).result()
+
+        assert max(peak) == 2
+        assert sorted(self.hass.config.components) == domains
+
+    def test_parallel_setup_waits_for_running_setup(self):
+        """Test a component set up by another component's setup is awaited."""
+        @asyncio.coroutine
+        def async_setup_a(hass, config):
+            """Setup comp_a slowly."""
+            yield from asyncio.sleep(0.01, loop=hass.loop)
+            return True
+
+        @asyncio.coroutine
+        def async_setup_b(hass, config):
+            """Setup comp_a as an undeclared dependency."""
+            return (yield from bootstrap.async_setup_component(
+                hass, 'comp_a'))
+
+        loader.set_component(
+            'comp_a', MockModule('comp_a', async_setup=async_setup_a))
+        loader.set_component(
+            'comp_b', MockModule('comp_b', async_setup=async_setup_b))
+
+        run_coroutine_threadsafe(
+            bootstrap._async_setup_components(
+                self.hass, ['comp_a', 'comp_b'], {}),
+            self.hass.loop).result()
+
+        assert sorted(self.hass.config.components) == ['comp_a', 'comp_b']
+
+    def test_parallel_setup_waits_from_executor(self):
+        """Test a sync component setting up a running component waits."""
+        @asyncio.coroutine
+        def async_setup_a(hass, config):
+            """Setup comp_a slowly."""
+            yield from asyncio.sleep(0.01, loop=hass.loop)
+            return True
+
+        def setup_b(hass, config):
+            """Setup comp_a from the executor."""
+            return bootstrap.setup_component(hass, 'comp_a')
+
+        loader.set_component(
+            'comp_a', MockModule('comp_a', async_setup=async_setup_a))
+        loader.set_component(
+            'comp_b', MockModule('comp_b', setup=setup_b))
+
+        with mock.patch.object(bootstrap, '_async_persistent_notification') \
+                as mock_notification:
+            run_coroutine_threadsafe(
+                bootstrap._async_setup_components(
+                    self.hass, ['comp_a', 'comp_b'], {}),
+                self.hass.loop).result()
+
+        assert sorted(self.hass.config.components) == ['comp_a', 'comp_b']
+        assert not mock_notification.called
+
+    def test_setup_recursion_from_executor(self):
+        """Test a sync component setting up itself is reported."""
+        result = []
+
+        def setup(hass, config):
+            """Setup the component being set up."""
+            result.append(bootstrap.setup_component(hass, 'comp_a'))
+            return True
+
+        loader.set_component('comp_a', MockModule('comp_a', setup=setup))
+
+        assert bootstrap.setup_component(self.hass, 'comp_a')
+        assert result == [False]
@@ -541,6 +541,16 @@ class TestStateMachine(unittest.TestCase):
         assert state2 is not None
         assert state.last_changed == state2.last_changed
 
+    def test_write_stats(self):
+        """Test writes that do not change a state are counted."""
+        changed = self.states.write_stats['changed']
+
+        self.states.set('light.Bowl', 'on')
+        self.states.set('light.Bowl', 'off')
+
+        assert self.states.write_stats['unchanged'] == 1
+        assert self.states.write_stats['changed'] == changed + 1
+
     def test_force_update(self):
         """Test force update option."""
         events = []
@@ -1,6 +1,7 @@
 """Test to verify that we can load components."""
 # pylint: disable=protected-access
 import unittest
+from unittest.mock import patch
 
 import homeassistant.loader as loader
 import homeassistant.components.http as http
@@ -84,3 +85,39 @@ class TestLoader(unittest.TestCase):
         self.assertEqual(
             ['group', 'mod2'],
             loader.load_order_components(['mod2', 'mod1']))
+
+    @patch('homeassistant.loader.importlib.import_module')
+    def test_get_component_metadata_without_import(self, mock_import):
+        """Test metadata is read from the source without importing it."""
+        self.assertEqual({
+            'dependencies': [],
+            'requirements': ['phue==0.8'],
+            'async_setup': False,
+        }, self._metadata('light.hue'))
+
+        self.assertTrue(self._metadata('group')['async_setup'])
+        self.assertFalse(mock_import.called)
+
+    def test_get_component_metadata_not_literal(self):
+        """Test metadata that is not a literal is read from the module."""
+        self.assertEqual(
+            ['apcupsd'],
+            loader.get_component_metadata('sensor.apcupsd')['dependencies'])
+
+    def test_get_component_metadata_loaded_component(self):
+        """Test metadata of a loaded component comes from the module."""
+        loader.set_component('mod1', MockModule('mod1', ['group'],
+                                                requirements=['req==1.0']))
+
+        self.assertEqual({
+            'dependencies': ['group'],
+            'requirements': ['req==1.0'],
+            'async_setup': False,
+        }, loader.get_component_metadata('mod1'))
+
+    def _metadata(self, comp_name):
+        """Return the metadata without the source file details."""
+        metadata = dict(loader.get_component_metadata(comp_name))
+        metadata.pop('path')
+        metadata.pop('mtime')
+        return metadata
@@ -3,13 +3,16 @@
 import asyncio
 import threading
 import unittest
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import homeassistant.core as ha
 import homeassistant.bootstrap as bootstrap
 import homeassistant.remote as remote
 import homeassistant.components.http as http
-from homeassistant.const import HTTP_HEADER_HA_AUTH, EVENT_STATE_CHANGED
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.const import (
+    HTTP_HEADER_HA_AUTH, EVENT_STATE_CHANGED, URL_API)
+from homeassistant.util.async import run_coroutine_threadsafe
 import homeassistant.util.dt as dt_util
 
 from tests.common import (
@@ -99,6 +102,36 @@ class TestRemoteMethods(unittest.TestCase):
         self.assertEqual(
             remote.APIStatus.CANNOT_CONNECT, remote.validate_api(broken_api))
 
+    def test_api_reuses_session(self):
+        """Test that calls share the pooled session of the API."""
+        api = remote.API('127.0.0.1', API_PASSWORD, MASTER_PORT)
+
+        with patch.object(api._session, 'request',
+                          wraps=api._session.request) as mock_request:
+            self.assertEqual(remote.APIStatus.OK, remote.validate_api(api))
+            remote.fire_event(api, 'test.event_no_data')
+
+        self.assertEqual(2, mock_request.call_count)
+        api.close()
+
+    def test_async_call(self):
+        """Test calling the API from inside the event loop."""
+        api = remote.API('127.0.0.1', API_PASSWORD, MASTER_PORT)
+
+        resp = run_coroutine_threadsafe(
+            api.async_call(remote.METHOD_GET, URL_API, loop=hass.loop),
+            hass.loop).result()
+        self.assertEqual(200, resp.status)
+
+        bad_api = remote.API('127.0.0.1', API_PASSWORD + 'A', MASTER_PORT)
+        resp = run_coroutine_threadsafe(
+            bad_api.async_call(remote.METHOD_GET, URL_API, loop=hass.loop),
+            hass.loop).result()
+        self.assertEqual(401, resp.status)
+
+        run_coroutine_threadsafe(api.async_close(), hass.loop).result()
+        run_coroutine_threadsafe(bad_api.async_close(), hass.loop).result()
+
     def test_get_event_listeners(self):
         """Test Python API get_event_listeners."""
         local_data = hass.bus.listeners
@@ -312,6 +345,89 @@ class TestRemoteClasses(unittest.TestCase):
         self.assertEqual(1, len(hass_call))
         self.assertEqual(1, len(slave_call))
 
+    def test_event_forward_target_batch_retry(self):
+        """Test that undelivered batches are kept and retried."""
+        mock_hass = Mock()
+        target = remote.EventForwardTarget(mock_hass, master_api, batch=True)
+        events = [ha.Event('test.batch', {'order': idx}) for idx in range(3)]
+
+        for event in events:
+            target.async_queue_event(event)
+
+        self.assertEqual(1, mock_hass.loop.call_later.call_count)
+
+        with patch('homeassistant.remote.fire_events',
+                   return_value=False) as mock_fire:
+            target._send_queued()
+
+        self.assertEqual(events, mock_fire.call_args[0][1])
+        self.assertEqual(events, list(target._queue))
+        self.assertEqual(1, mock_hass.loop.call_soon_threadsafe.call_count)
+
+        with patch('homeassistant.remote.fire_events',
+                   return_value=True) as mock_fire:
+            target._send_queued()
+
+        self.assertEqual(events, mock_fire.call_args[0][1])
+        self.assertEqual(0, len(target._queue))
+
+    def test_fire_events_retry_only_server_errors(self):
+        """Test only invalid events are dropped instead of retried."""
+        events = [ha.Event('test.batch')]
+        api = Mock(return_value=Mock(status_code=200))
+        self.assertTrue(remote.fire_events(api, events))
+
+        for status in (401, 403, 503):
+            api.return_value.status_code = status
+            self.assertFalse(remote.fire_events(api, events))
+
+        for status in (400, 422):
+            api.return_value.status_code = status
+            self.assertTrue(remote.fire_events(api, events))
+
+        # Without the batch endpoint the events are fired one by one
+        api.return_value.status_code = 404
+        with patch('homeassistant.remote.fire_event') as mock_fire:
+            self.assertTrue(remote.fire_events(api, events))
+        self.assertEqual(1, mock_fire.call_count)
+        self.assertEqual('test.batch', mock_fire.call_args[0][1])
+
+        api.side_effect = HomeAssistantError
+        self.assertFalse(remote.fire_events(api, events))
+
+    def test_event_forward_target_stop(self):
+        """Test a stopped target cancels its retry and stops sending."""
+        mock_hass = Mock()
+        target = remote.EventForwardTarget(mock_hass, master_api, batch=True)
+        target.async_queue_event(ha.Event('test.batch'))
+
+        with patch('homeassistant.remote.fire_events',
+                   return_value=False):
+            target._send_queued()
+
+        retry_delay = mock_hass.loop.call_soon_threadsafe.call_args[0][1]
+        target._async_schedule_retry(retry_delay)
+        handle = mock_hass.loop.call_later.return_value
+
+        target.async_stop()
+        self.assertTrue(handle.cancel.called)
+
+        target._async_schedule_send()
+        self.assertFalse(mock_hass.async_add_job.called)
+        self.assertEqual(0, len(target._queue))
+
+    @patch('homeassistant.remote.FORWARD_BUFFER_SIZE', 2)
+    def test_event_forward_target_bounded_buffer(self):
+        """Test that the oldest events are dropped when the buffer is full."""
+        target = remote.EventForwardTarget(Mock(), master_api, batch=True)
+        events = [ha.Event('test.batch', {'order': idx}) for idx in range(3)]
+
+        for event in events:
+            target.async_queue_event(event)
+
+        self.assertEqual(events[1:], list(target._queue))
+        self.assertEqual(1, target.dropped)
+
     def test_get_config(self):
         """Test the return of the configuration."""
         self.assertEqual(hass.config.as_dict(), remote.get_config(master_api))
@@ -1,10 +1,12 @@
 """Test Home Assistant util methods."""
+import asyncio
+import threading
+from time import monotonic
 import unittest
 from unittest.mock import patch
 from datetime import datetime, timedelta
 
 from homeassistant import util
-import homeassistant.util.dt as dt_util
 
 
 class TestUtil(unittest.TestCase):
@@ -172,9 +174,9 @@ class TestUtil(unittest.TestCase):
         def test_throttle2():
             calls2.append(1)
 
-        now = dt_util.utcnow()
-        plus3 = now + timedelta(seconds=3)
-        plus5 = plus3 + timedelta(seconds=2)
+        now = monotonic()
+        plus3 = now + 3
+        plus5 = plus3 + 2
 
         # Call first time and ensure methods got called
         test_throttle1()
@@ -197,14 +199,14 @@ class TestUtil(unittest.TestCase):
         self.assertEqual(2, len(calls1))
         self.assertEqual(1, len(calls2))
 
-        with patch('homeassistant.util.utcnow', return_value=plus3):
+        with patch('homeassistant.util.monotonic', return_value=plus3):
             test_throttle1()
             test_throttle2()
 
         self.assertEqual(2, len(calls1))
         self.assertEqual(1, len(calls2))
 
-        with patch('homeassistant.util.utcnow', return_value=plus5):
+        with patch('homeassistant.util.monotonic', return_value=plus5):
             test_throttle1()
             test_throttle2()
 
@@ -258,3 +260,62 @@ class TestUtil(unittest.TestCase):
 
         self.assertTrue(tester.hello())
         self.assertTrue(tester.goodbye())
+
+    def test_throttle_shares_running_call(self):
+        """Test calls while the method runs share its result."""
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        @util.Throttle(timedelta(seconds=5))
+        def update():
+            calls.append(1)
+            started.set()
+            release.wait()
+            return len(calls)
+
+        results = []
+        first = threading.Thread(target=lambda: results.append(update()))
+        first.start()
+        started.wait()
+
+        second = threading.Thread(target=lambda: results.append(update()))
+        second.start()
+        release.set()
+        first.join()
+        second.join()
+
+        self.assertEqual([1, 1], results)
+        self.assertEqual(1, len(calls))
+
+        # Throttled once the call returned
+        self.assertIsNone(update())
+        self.assertEqual({'misses': 1, 'hits': 1, 'throttled': 1},
+                         update.throttle_stats)
+
+    def test_throttle_coroutine(self):
+        """Test throttling a coroutine function."""
+        loop = asyncio.new_event_loop()
+        calls = []
+
+        @util.Throttle(timedelta(seconds=5))
+        @asyncio.coroutine
+        def update():
+            calls.append(1)
+            yield from asyncio.sleep(0, loop=loop)
+            return len(calls)
+
+        @asyncio.coroutine
+        def run():
+            results = yield from asyncio.gather(update(), update(), loop=loop)
+            results.append((yield from update()))
+            return results
+
+        try:
+            self.assertEqual([1, 1, None], loop.run_until_complete(run()))
+        finally:
+            loop.close()
+
+        self.assertEqual(1, len(calls))
+        self.assertEqual({'misses': 1, 'hits': 1, 'throttled': 1},
+                         update.throttle_stats)
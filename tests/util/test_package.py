@@ -1,7 +1,9 @@
 """Test Home Assistant package util methods."""
 import os
 import pkg_resources
+import shutil
 import subprocess
+import tempfile
 import unittest
 
 from distutils.sysconfig import get_python_lib
@@ -128,3 +130,75 @@ class TestPackageUtilCheckPackageExists(unittest.TestCase):
     def test_check_package_zip(self):
         """Test for an installed zip package."""
         self.assertFalse(package.check_package_exists(TEST_ZIP_REQ, None))
+
+
+@patch('homeassistant.util.package.subprocess.call')
+class TestPackageUtilInstallPackages(unittest.TestCase):
+    """Test for homeassistant.util.package.install_packages."""
+
+    @patch('homeassistant.util.package.sys')
+    def test_install_packages(self, mock_sys, mock_subprocess):
+        """Test all packages are installed with a single pip run."""
+        mock_subprocess.return_value = 0
+
+        self.assertTrue(package.install_packages(
+            [TEST_NEW_REQ, TEST_EXIST_REQ], False))
+
+        self.assertEqual(mock_subprocess.call_count, 1)
+        self.assertEqual(
+            mock_subprocess.call_args,
+            call([
+                mock_sys.executable, '-m', 'pip', 'install', '--quiet',
+                TEST_NEW_REQ, TEST_EXIST_REQ
+            ])
+        )
+
+
+class TestPackageUtilRequirementsManifest(unittest.TestCase):
+    """Test for homeassistant.util.package.RequirementsManifest."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Setup things to be run when tests are started."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, 'manifest.json')
+
+    def tearDown(self):  # pylint: disable=invalid-name
+        """Stop everything that was started."""
+        shutil.rmtree(self.tmp_dir)
+
+    def test_met_requirement_is_recorded(self):
+        """Test a met requirement is not looked up again after a restart."""
+        manifest = package.RequirementsManifest(self.path)
+        self.assertTrue(manifest.is_met(TEST_EXIST_REQ))
+        manifest.save()
+
+        manifest = package.RequirementsManifest(self.path)
+        with patch('homeassistant.util.package.find_package') as mock_find:
+            self.assertTrue(manifest.is_met(TEST_EXIST_REQ))
+
+        self.assertEqual(mock_find.call_count, 0)
+
+    def test_changed_distribution_is_checked_again(self):
+        """Test a recorded requirement is checked if its dist changed."""
+        manifest = package.RequirementsManifest(self.path)
+        self.assertTrue(manifest.is_met(TEST_EXIST_REQ))
+        manifest.save()
+
+        manifest = package.RequirementsManifest(self.path)
+        with patch('homeassistant.util.package.os.path.getmtime',
+                   return_value=0), \
+                patch('homeassistant.util.package.find_package',
+                      return_value=None) as mock_find:
+            self.assertEqual([TEST_EXIST_REQ],
+                             manifest.missing([TEST_EXIST_REQ]))
+
+        self.assertEqual(mock_find.call_count, 1)
+
+    def test_missing_requirement(self):
+        """Test a requirement that is not met is not recorded."""
+        manifest = package.RequirementsManifest(self.path)
+
+        self.assertEqual([TEST_NEW_REQ], manifest.missing([TEST_NEW_REQ]))
+
+        manifest.save()
+        self.assertFalse(os.path.isfile(self.path))
@@ -1,6 +1,8 @@
 """Test Home Assistant yaml loader."""
 import io
 import os
+import shutil
+import tempfile
 import unittest
 from unittest.mock import patch
 
@@ -250,6 +252,23 @@ class TestYaml(unittest.TestCase):
         """The that the dump method returns empty None values."""
         assert yaml.dump({'a': None, 'b': 'b'}) == 'a:\nb: b\n'
 
+    @unittest.skipIf(yaml.CSafeLineLoader is None, 'libyaml not available')
+    def test_c_loader_matches_python_loader(self):
+        """Test the libyaml loader keeps values, files and line numbers."""
+        conf = 'key: value\nlist:\n  - item\nnested:\n  key: 1\n'
+        results = []
+
+        for loader in (yaml.SafeLineLoader, yaml.CSafeLineLoader):
+            with patch('homeassistant.util.yaml.DEFAULT_LOADER', loader), \
+                    patch_yaml_files({YAML_CONFIG_FILE: conf}):
+                results.append(load_yaml_config_file(YAML_CONFIG_FILE))
+
+        python_conf, c_conf = results
+        assert python_conf == c_conf
+        assert c_conf.__config_file__ == YAML_CONFIG_FILE
+        assert c_conf['list'].__line__ == python_conf['list'].__line__ == 2
+        assert c_conf['nested'].__line__ == python_conf['nested'].__line__
+
 
 FILES = {}
 
@@ -379,3 +398,83 @@ class TestSecrets(unittest.TestCase):
         load_yaml(self._yaml_path, 'api_password: !secret pw')
         assert mock_error.call_count == 1, \
             "Expected an error about logger: value"
+
+
+class TestCachedYaml(unittest.TestCase):
+    """Test util.yaml.load_yaml_cached."""
+
+    # pylint: disable=invalid-name
+    def setUp(self):
+        """Create a config dir with an included file."""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.tmp_dir, '.cache')
+        self.config_path = self._write(
+            'configuration.yaml', 'sensor: !include sensor.yaml\n')
+        self._write('sensor.yaml', '- platform: test\n')
+
+    def tearDown(self):
+        """Remove the config dir."""
+        shutil.rmtree(self.tmp_dir)
+
+    def _write(self, name, content):
+        """Write a file in the config dir."""
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, 'w') as fil:
+            fil.write(content)
+        return path
+
+    def _load(self):
+        """Load the config, returning it and if the cache was used."""
+        with patch('homeassistant.util.yaml.load_yaml',
+                   wraps=yaml.load_yaml) as mock_load:
+            conf = yaml.load_yaml_cached(self.config_path, self.cache_path)
+        return conf, not mock_load.called
+
+    def test_cache_is_used(self):
+        """Test unchanged files are loaded from the cache."""
+        conf, cached = self._load()
+        assert not cached
+
+        conf, cached = self._load()
+        assert cached
+        assert conf == {'sensor': [{'platform': 'test'}]}
+        assert conf.__config_file__ == self.config_path
+        assert conf['sensor'].__line__ == 0
+
+    def test_changed_include_invalidates_cache(self):
+        """Test the cache is not used after an included file changed."""
+        self._load()
+        self._write('sensor.yaml', '- platform: test\n- platform: other\n')
+
+        conf, cached = self._load()
+        assert not cached
+        assert len(conf['sensor']) == 2
+
+    def test_changed_content_invalidates_cache(self):
+        """Test the cache is not used if only the content of a file changed."""
+        self._load()
+        path = self._write('sensor.yaml', '- platform: tset\n')
+        stat = os.stat(path)
+        os.utime(path, (stat.st_atime, stat.st_mtime - 10))
+        self._load()
+
+        # Same size and modification time, other content
+        self._write('sensor.yaml', '- platform: test\n')
+        os.utime(path, (stat.st_atime, stat.st_mtime - 10))
+
+        conf, cached = self._load()
+        assert not cached
+        assert conf == {'sensor': [{'platform': 'test'}]}
+
+    def test_changed_environment_invalidates_cache(self):
+        """Test the cache is not used after an used env variable changed."""
+        self._write('configuration.yaml', 'password: !env_var PASSWORD\n')
+
+        with patch.dict(os.environ, {'PASSWORD': 'secret1'}):
+            self._load()
+
+        with patch.dict(os.environ, {'PASSWORD': 'secret2'}):
+            conf, cached = self._load()
+
+        assert not cached
+        assert conf == {'password': 'secret2'}